@@ -0,0 +1,58 @@
+"""Benchmark the pipelined (walker thread) changelog against the sequential one.
+
+Builds a throwaway repository with a linear history of gitmoji commits and
+renders its notes with ``change_log`` both ways. Every run opens a fresh
+Repository, so libgit2's object cache is cold; the OS page cache is not.
+
+Run from the repository root with ``python -m benchmarks.bench_pipeline``.
+"""
+
+from __future__ import annotations
+
+import random
+import tempfile
+import timeit
+from pathlib import Path
+
+from pygit2 import Signature, init_repository
+
+from girokmoji.changelog import change_log
+
+GITMOJI = [":sparkles:", ":bug:", ":zap:", ":memo:", ":recycle:", ":boom:"]
+
+
+def make_history(repo_dir: Path, size: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    repo = init_repository(repo_dir)
+    person = Signature("bench", "bench@example.com")
+    parents: list = []
+    for i in range(size):
+        builder = repo.TreeBuilder()
+        builder.insert("f.txt", repo.create_blob(f"{i}\n".encode()), 0o100644)
+        body = "\n".join(f"line {j} of the body" for j in range(rng.randrange(20)))
+        msg = f"{rng.choice(GITMOJI)} change {i}\n\n{body}\n"
+        parents = [
+            repo.create_commit("HEAD", person, person, msg, builder.write(), parents)
+        ]
+
+
+def best_ms(fn, runs: int = 5) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=runs)) * 1000
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        print("commits, best of 5 runs, milliseconds")
+        print(f"{'commits':>8} {'sequential':>11} {'pipelined':>10}")
+        for size in (2_000, 20_000):
+            repo_dir = Path(tmp) / str(size)
+            make_history(repo_dir, size)
+            args = ("bench", "2025-01-01", repo_dir, "none", "HEAD")
+            assert change_log(*args) == change_log(*args, pipelined=True)
+            sequential = best_ms(lambda: change_log(*args))
+            pipelined = best_ms(lambda: change_log(*args, pipelined=True))
+            print(f"{size:>8} {sequential:11.1f} {pipelined:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
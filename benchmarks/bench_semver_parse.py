@@ -0,0 +1,81 @@
+"""Benchmark SemVer tag-name parsing on a mixed corpus of tag names.
+
+Compares the previous regex-only parser (raising ValueError on rejects) with
+the regex-free fast path, and with ``SemVer.try_parse`` which adds the
+interning cache (measured warm, as on repeated index builds).
+
+Run from the repository root with ``python -m benchmarks.bench_semver_parse``.
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+
+from girokmoji.semver import _SEMVER_RE, SemVer, _parse_uncached
+
+
+def regex_only(text: str) -> SemVer | None:
+    """The previous parser, including the ValueError callers had to catch."""
+    try:
+        match = _SEMVER_RE.fullmatch(text)
+        if not match:
+            raise ValueError(f"Invalid semver string: {text}")
+    except ValueError:
+        return None
+    major, minor, patch, pre, build = match.groups()
+    return SemVer(
+        int(major),
+        int(minor),
+        int(patch),
+        tuple(pre.split(".")) if pre else (),
+        tuple(build.split(".")) if build else (),
+    )
+
+
+def corpus(size: int = 20_000, seed: int = 7) -> dict[str, list[str]]:
+    """Return tag names by kind plus the shuffled ``mixed`` corpus."""
+    rng = random.Random(seed)
+    kinds: dict[str, list[str]] = {
+        "non-semver": [],
+        "X.Y.Z": [],
+        "prerelease": [],
+    }
+    for i in range(size):
+        kind = rng.random()
+        if kind < 0.4:
+            kinds["non-semver"].append(f"build-{i}")
+        elif kind < 0.6:
+            kinds["non-semver"].append(f"deploy/prod/{rng.randrange(500)}")
+        elif kind < 0.9:
+            kinds["X.Y.Z"].append(
+                f"{rng.randrange(5)}.{rng.randrange(30)}.{rng.randrange(50)}"
+            )
+        else:
+            kinds["prerelease"].append(
+                f"{rng.randrange(5)}.{rng.randrange(30)}.0-rc.{rng.randrange(5)}"
+            )
+    mixed = [name for names in kinds.values() for name in names]
+    rng.shuffle(mixed)
+    return {**kinds, "mixed": mixed}
+
+
+def best_ms(fn, runs: int = 10) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=runs)) * 1000
+
+
+def main() -> None:
+    corpora = corpus()
+    mixed = corpora["mixed"]
+    assert [regex_only(n) for n in mixed] == [SemVer.try_parse(n) for n in mixed]
+    print(f"{len(mixed)} tag names, best of 10 runs, milliseconds")
+    print(f"{'corpus':>12} {'names':>6} {'regex':>8} {'fast':>8} {'interned':>9}")
+    for label, names in corpora.items():
+        regex = best_ms(lambda: [regex_only(n) for n in names])
+        fast = best_ms(lambda: [_parse_uncached(SemVer, n) for n in names])
+        interned = best_ms(lambda: [SemVer.try_parse(n) for n in names])
+        print(f"{label:>12} {len(names):>6} {regex:8.2f} {fast:8.2f} {interned:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
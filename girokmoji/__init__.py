@@ -1,14 +1,57 @@
 """girokmoji package."""
 
-from importlib import metadata
+from importlib import import_module, metadata
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - imported lazily at runtime
+    from .aio import async_auto_release as async_auto_release
+    from .aio import async_change_log as async_change_log
+    from .aio import async_github_release_payload as async_github_release_payload
+    from .changelog import change_log as change_log
+    from .changelog import github_release_payload as github_release_payload
+    from .contains import first_containing_tags as first_containing_tags
+    from .release import auto_release as auto_release
+    from .release import plan_release as plan_release
+    from .release import release_many as release_many
+
+# The public API is imported on first use, so that the pygit2-free modules
+# (girokmoji.model, girokmoji.render) can be used without pygit2 installed.
+_LAZY = {
+    "async_auto_release": "aio",
+    "async_change_log": "aio",
+    "async_github_release_payload": "aio",
+    "change_log": "changelog",
+    "github_release_payload": "changelog",
+    "first_containing_tags": "contains",
+    "auto_release": "release",
+    "plan_release": "release",
+    "release_many": "release",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
 
-from .changelog import change_log as change_log
-from .changelog import github_release_payload as github_release_payload
-from .release import auto_release as auto_release
 
 try:  # pragma: no cover - package might not be installed in tests
     __version__ = metadata.version(__package__ or "girokmoji")
 except metadata.PackageNotFoundError:  # pragma: no cover - fallback version
     __version__ = "0.5.15"
 
-__all__ = ["change_log", "github_release_payload", "auto_release", "__version__"]
+__all__ = [
+    "change_log",
+    "github_release_payload",
+    "auto_release",
+    "async_change_log",
+    "async_github_release_payload",
+    "async_auto_release",
+    "first_containing_tags",
+    "plan_release",
+    "release_many",
+    "__version__",
+]
@@ -1,26 +1,86 @@
 import argparse
 import sys
+from datetime import timedelta
 from pathlib import Path
+from typing import Any
 
-from girokmoji.changelog import change_log, github_release_payload
-from girokmoji.release import auto_release
+from girokmoji.changelog import (
+    change_log,
+    change_model,
+    fitted_github_release_payload,
+    release_payload,
+    write_github_release_payload,
+)
+from girokmoji.contains import first_containing_tags
+from girokmoji.formats import FORMATS, change_log_formats, parse_formats, render_formats
+from girokmoji.git import parse_time_bound
+from girokmoji.model import read_model, write_model
+from girokmoji.payload import OVERFLOW_MODES
+from girokmoji.release import auto_release, release_many
+from girokmoji.summary import parse_sections
+from girokmoji.templatedir import load_template_dir
 from girokmoji import __version__
 
 
+def _add_format_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--format",
+        dest="formats",
+        type=parse_formats,
+        default=["markdown"],
+        metavar="FORMATS",
+        help="Comma separated output formats: markdown (default), json, html",
+    )
+    for fmt in FORMATS:
+        parser.add_argument(
+            f"--output-{fmt}",
+            type=Path,
+            default=None,
+            metavar="PATH",
+            help=f"Write the {fmt} rendering to PATH instead of stdout",
+        )
+    parser.add_argument(
+        "--template-dir",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Markdown templates (head.md, category.md, group.md, entry.md, "
+        "separator.md) overriding the defaults",
+    )
+
+
+def _clock_skew_hours(text: str) -> float:
+    hours = float(text)
+    if hours < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {text}")
+    return hours
+
+
+def _write_rendered(args: argparse.Namespace, rendered: dict[str, str]) -> None:
+    for fmt, text in rendered.items():
+        target = getattr(args, f"output_{fmt}")
+        if target is None:
+            print(text, file=sys.stdout)
+        else:
+            target.write_text(text + "\n", encoding="utf-8")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Generate release notes from gitmoji commits"
     )
     subparsers = parser.add_subparsers(dest="command")
 
-    generate = subparsers.add_parser(
-        "generate", help="Generate notes between two tags"
-    )
+    generate = subparsers.add_parser("generate", help="Generate notes between two tags")
     generate.add_argument("project_name", help="Name of the project")
     generate.add_argument("release_date", help="Release date (YYYY-MM-DD)")
     generate.add_argument("repo_dir", type=Path, help="Path to the git repository")
-    generate.add_argument("tail_tag", help="Older git tag (tail tag)")
-    generate.add_argument("head_tag", help="Newer git tag (head tag)")
+    generate.add_argument(
+        "tail_tag",
+        help='Older git tag (tail tag), "auto" for the SemVer predecessor of head, '
+        'or "none" for everything reachable from head',
+    )
+    generate.add_argument("head_tag", help="Newer git tag (head tag) or revision")
     generate.add_argument(
         "--release-version",
         dest="version",
@@ -55,6 +115,113 @@ def main() -> None:
         action="store_true",
         help="Output GitHub Release payload JSON instead of markdown",
     )
+    generate.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print commit counts and the bump decision to stderr",
+    )
+    generate.add_argument(
+        "--path",
+        dest="paths",
+        action="append",
+        default=None,
+        metavar="PREFIX",
+        help="Only include commits touching this path prefix (repeatable)",
+    )
+    generate.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Directory for persistent girokmoji indexes (e.g. changed paths)",
+    )
+    _add_format_options(generate)
+    generate.add_argument(
+        "--output-model",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Also write the grouped changelog model to PATH, for 'render'",
+    )
+    generate.add_argument(
+        "--model-format",
+        choices=["json", "binary"],
+        default="json",
+        help="Encoding of --output-model (default json)",
+    )
+    generate.add_argument(
+        "--overflow",
+        choices=OVERFLOW_MODES,
+        default=None,
+        help="With --github-payload, keep the body within GitHub's size limit: "
+        "split it into continuation documents or truncate it with a summary",
+    )
+    generate.add_argument(
+        "--continuation-dir",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Where --overflow split writes the continuation documents "
+        "(part-2.md, ...)",
+    )
+    generate.add_argument(
+        "--spill-threshold",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Bounded memory: spill classified commits to temporary files once "
+        "more than N are buffered",
+    )
+    generate.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Collapse duplicate commits (same patch-id, or same gitmoji, title "
+        "and author), e.g. hotfixes cherry-picked to two branches",
+    )
+    generate.add_argument(
+        "--cancel-reverts",
+        action="store_true",
+        help="Leave out commits reverted within the range, and their reverts",
+    )
+    generate.add_argument(
+        "--sections",
+        type=parse_sections,
+        default=None,
+        metavar="SECTIONS",
+        help="Comma separated extra markdown sections: contributors, statistics, "
+        "diffstat (statistics with files changed, insertions and deletions)",
+    )
+    generate.add_argument(
+        "--diffstat-merges",
+        action="store_true",
+        help="Count merge commits (diffed against their first parent) in the "
+        "diffstat section",
+    )
+    generate.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="Walk history on a worker thread while classifying commits",
+    )
+    generate.add_argument(
+        "--since",
+        type=parse_time_bound,
+        default=None,
+        metavar="DATE",
+        help="Only include commits committed on or after DATE (ISO 8601, UTC)",
+    )
+    generate.add_argument(
+        "--until",
+        type=lambda text: parse_time_bound(text, end_of_day=True),
+        default=None,
+        metavar="DATE",
+        help="Only include commits committed on or before DATE (ISO 8601, UTC)",
+    )
+    generate.add_argument(
+        "--clock-skew",
+        type=_clock_skew_hours,
+        default=24.0,
+        metavar="HOURS",
+        help="Keep walking this far past --since to tolerate clock skew (default 24)",
+    )
 
     release = subparsers.add_parser(
         "release", help="Run semantic-release and output new release notes"
@@ -65,9 +232,9 @@ def main() -> None:
     )
     release.add_argument(
         "--bump",
-        choices=["patch", "minor", "major"],
+        choices=["patch", "minor", "major", "auto"],
         default="patch",
-        help="Version part to bump",
+        help="Version part to bump; auto infers it from the commits' gitmoji",
     )
     release.add_argument(
         "--release-date",
@@ -102,6 +269,122 @@ def main() -> None:
         action="store_true",
         help="Print verbose notices to stderr",
     )
+    release.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print commit counts and the bump decision to stderr",
+    )
+    release.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Render notes for the next version without creating the tag",
+    )
+    release.add_argument(
+        "--tag-message",
+        choices=["version", "notes"],
+        default="version",
+        help="Annotated tag message: the version (default) or the full notes",
+    )
+    release.add_argument(
+        "--path",
+        dest="paths",
+        action="append",
+        default=None,
+        metavar="PREFIX",
+        help="Only include commits touching this path prefix (repeatable)",
+    )
+    release.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Directory for persistent girokmoji indexes (e.g. changed paths)",
+    )
+    many = subparsers.add_parser(
+        "release-many",
+        help="Release several monorepo packages from a single history walk",
+    )
+    many.add_argument(
+        "--package",
+        dest="packages",
+        action="append",
+        required=True,
+        metavar="PATH=TAG_PREFIX",
+        help="Path prefix to tag prefix mapping, e.g. packages/a=pkg-a/v* (repeatable)",
+    )
+    many.add_argument(
+        "--repo-dir", type=Path, default=Path("."), help="Path to the git repository"
+    )
+    many.add_argument(
+        "--bump",
+        choices=["patch", "minor", "major", "auto"],
+        default="patch",
+        help="Version part to bump; auto infers it from the commits' gitmoji",
+    )
+    many.add_argument(
+        "--release-date",
+        help="Release date (YYYY-MM-DD). Defaults to today",
+        default=None,
+    )
+    many.add_argument(
+        "--github-payload",
+        action="store_true",
+        help="Output one GitHub Release payload JSON per line instead of markdown",
+    )
+    many.add_argument(
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="Write one file per released package instead of printing",
+    )
+    many.add_argument(
+        "--tag-message",
+        choices=["version", "notes"],
+        default="version",
+        help="Annotated tag message: the version (default) or the full notes",
+    )
+    many.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print commit counts and the bump decision to stderr",
+    )
+    many.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Directory for persistent girokmoji indexes (e.g. changed paths)",
+    )
+    contains = subparsers.add_parser(
+        "contains", help="Show the first release tag containing each commit"
+    )
+    contains.add_argument("commits", nargs="+", help="Commit SHAs or revisions")
+    contains.add_argument(
+        "--repo-dir", type=Path, default=Path("."), help="Path to the git repository"
+    )
+    contains.add_argument(
+        "--include-prereleases",
+        action="store_true",
+        help="Also consider prerelease tags (e.g. v1.2.0-rc.1) as releases",
+    )
+    contains.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Directory for persistent girokmoji indexes (tags, contains map)",
+    )
+    render = subparsers.add_parser(
+        "render", help="Render notes from a model written by generate --output-model"
+    )
+    render.add_argument("model", type=Path, help="Changelog model file")
+    render.add_argument("project_name", help="Name of the project")
+    render.add_argument("release_date", help="Release date (YYYY-MM-DD)")
+    render.add_argument("version", help="Release version string")
+    _add_format_options(render)
+    render.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Directory for persistent girokmoji caches (compiled templates)",
+    )
     parser.add_argument(
         "--version",
         action="version",
@@ -112,7 +395,83 @@ def main() -> None:
     parser.set_defaults(command="generate")
     args = parser.parse_args()
 
-    if args.command == "release":
+    multi_format = args.command in ("generate", "render") and (
+        args.formats != ["markdown"]
+        or any(getattr(args, f"output_{fmt}") is not None for fmt in FORMATS)
+    )
+    if multi_format:
+        to_stdout = [f for f in args.formats if getattr(args, f"output_{f}") is None]
+        if getattr(args, "github_payload", False):
+            parser.error("--github-payload cannot be combined with --format/--output-*")
+        if len(to_stdout) > 1:
+            parser.error(
+                "several formats go to stdout; pass --output-<format> for all but one"
+            )
+
+    templates = None
+    if getattr(args, "template_dir", None) is not None:
+        templates = load_template_dir(args.template_dir, cache_dir=args.cache_dir)
+
+    if args.command == "generate" and args.overflow is not None:
+        if not args.github_payload or args.output_model is not None:
+            parser.error("--overflow requires --github-payload without --output-model")
+        if args.overflow == "split" and args.continuation_dir is None:
+            parser.error("--overflow split requires --continuation-dir")
+    if (
+        args.command == "generate"
+        and args.sections is not None
+        and args.output_model is not None
+    ):
+        parser.error("--sections cannot be combined with --output-model")
+    if args.command == "generate" and args.diffstat_merges:
+        if "diffstat" not in (args.sections or ()):
+            parser.error("--diffstat-merges requires --sections diffstat")
+
+    if args.command == "render":
+        model = read_model(args.model)
+        _write_rendered(
+            args,
+            render_formats(
+                args.formats,
+                args.project_name,
+                args.version,
+                args.release_date,
+                model,
+                templates=templates,
+            ),
+        )
+    elif args.command == "contains":
+        found = first_containing_tags(
+            args.repo_dir,
+            args.commits,
+            include_prereleases=args.include_prereleases,
+            cache_dir=args.cache_dir,
+        )
+        for name, tag in found.items():
+            print(f"{name}\t{tag or '-'}", file=sys.stdout)
+    elif args.command == "release-many":
+        notes = release_many(
+            args.packages,
+            repo_dir=args.repo_dir,
+            bump=args.bump,
+            release_date=args.release_date,
+            github_payload=args.github_payload,
+            cache_dir=args.cache_dir,
+            stats=args.stats,
+            tag_message=args.tag_message,
+        )
+        if args.output_dir is not None:
+            args.output_dir.mkdir(parents=True, exist_ok=True)
+            suffix = ".json" if args.github_payload else ".md"
+            for name, note in notes.items():
+                target = args.output_dir / (name.replace("/", "_") + suffix)
+                target.write_text(note + "\n", encoding="utf-8")
+        elif args.github_payload:
+            for note in notes.values():
+                print(note, file=sys.stdout)
+        else:
+            print("\n\n".join(notes.values()), file=sys.stdout)
+    elif args.command == "release":
         # Preserve backward-compatibility for tests monkeypatching auto_release
         release_kwargs = dict(
             repo_dir=args.repo_dir,
@@ -132,26 +491,142 @@ def main() -> None:
                 quiet=args.quiet,
                 verbose=args.verbose,
             )
+        if args.paths:
+            release_kwargs["paths"] = args.paths
+        if args.cache_dir is not None:
+            release_kwargs["cache_dir"] = args.cache_dir
+        if args.stats:
+            release_kwargs["stats"] = True
+        if args.dry_run:
+            release_kwargs["dry_run"] = True
+        if args.tag_message != "version":
+            release_kwargs["tag_message"] = args.tag_message
         note = auto_release(
             args.project_name,
             **release_kwargs,
         )
         print(note, file=sys.stdout)
     else:
-        if args.github_payload:
-            payload = github_release_payload(
+        # Only pass these when set, like the release kwargs above
+        generate_kwargs = {}
+        if args.since is not None or args.until is not None:
+            generate_kwargs.update(
+                since=args.since,
+                until=args.until,
+                clock_skew=timedelta(hours=args.clock_skew),
+            )
+        if args.spill_threshold is not None:
+            generate_kwargs["spill_threshold"] = args.spill_threshold
+        if args.pipelined:
+            generate_kwargs["pipelined"] = True
+        if args.dedup:
+            generate_kwargs["dedup"] = True
+        if args.cancel_reverts:
+            generate_kwargs["cancel_reverts"] = True
+        render_kwargs: dict[str, Any] = {}
+        if templates is not None:
+            render_kwargs["templates"] = templates
+        if args.sections is not None:
+            render_kwargs["sections"] = args.sections
+        if args.diffstat_merges:
+            render_kwargs["diffstat_merges"] = True
+        if args.output_model is not None:
+            model = change_model(
+                repo_dir=args.repo_dir,
+                tail_tag=args.tail_tag,
+                head_tag=args.head_tag,
+                range_mode=args.range_mode,
+                strict_ancestor=args.strict_ancestor,
+                quiet=args.quiet,
+                verbose=args.verbose,
+                paths=args.paths,
+                cache_dir=args.cache_dir,
+                stats=args.stats,
+                **generate_kwargs,
+            )
+            write_model(args.output_model, model, binary=args.model_format == "binary")
+            version = args.version or args.head_tag
+            rendered = render_formats(
+                args.formats,
+                args.project_name,
+                version,
+                args.release_date,
+                model,
+                templates=templates,
+            )
+            if args.github_payload:
+                print(
+                    release_payload(args.head_tag, version, rendered["markdown"]),
+                    file=sys.stdout,
+                )
+            else:
+                _write_rendered(args, rendered)
+        elif multi_format:
+            rendered = change_log_formats(
+                project_name=args.project_name,
+                release_date=args.release_date,
+                repo_dir=args.repo_dir,
+                tail_tag=args.tail_tag,
+                head_tag=args.head_tag,
+                version=args.version,
+                formats=args.formats,
+                range_mode=args.range_mode,
+                strict_ancestor=args.strict_ancestor,
+                quiet=args.quiet,
+                verbose=args.verbose,
+                paths=args.paths,
+                cache_dir=args.cache_dir,
+                stats=args.stats,
+                **generate_kwargs,
+                **render_kwargs,
+            )
+            _write_rendered(args, rendered)
+        elif args.overflow is not None:
+            payload, continuations = fitted_github_release_payload(
                 project_name=args.project_name,
                 release_date=args.release_date,
                 repo_dir=args.repo_dir,
                 tail_tag=args.tail_tag,
                 head_tag=args.head_tag,
                 version=args.version,
+                overflow=args.overflow,
                 range_mode=args.range_mode,
                 strict_ancestor=args.strict_ancestor,
                 quiet=args.quiet,
                 verbose=args.verbose,
+                paths=args.paths,
+                cache_dir=args.cache_dir,
+                stats=args.stats,
+                **generate_kwargs,
+                **render_kwargs,
             )
+            if continuations:
+                args.continuation_dir.mkdir(parents=True, exist_ok=True)
+            for number, text in enumerate(continuations, start=2):
+                target = args.continuation_dir / f"part-{number}.md"
+                target.write_text(text + "\n", encoding="utf-8")
             print(payload, file=sys.stdout)
+        elif args.github_payload:
+            # Stream the payload instead of building the body in memory
+            write_github_release_payload(
+                sys.stdout,
+                project_name=args.project_name,
+                release_date=args.release_date,
+                repo_dir=args.repo_dir,
+                tail_tag=args.tail_tag,
+                head_tag=args.head_tag,
+                version=args.version,
+                range_mode=args.range_mode,
+                strict_ancestor=args.strict_ancestor,
+                quiet=args.quiet,
+                verbose=args.verbose,
+                paths=args.paths,
+                cache_dir=args.cache_dir,
+                stats=args.stats,
+                **generate_kwargs,
+                **render_kwargs,
+            )
+            sys.stdout.write("\n")
         else:
             changelog = change_log(
                 project_name=args.project_name,
@@ -164,6 +639,11 @@ def main() -> None:
                 strict_ancestor=args.strict_ancestor,
                 quiet=args.quiet,
                 verbose=args.verbose,
+                paths=args.paths,
+                cache_dir=args.cache_dir,
+                stats=args.stats,
+                **generate_kwargs,
+                **render_kwargs,
             )
             print(changelog, file=sys.stdout)
 
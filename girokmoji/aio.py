@@ -0,0 +1,134 @@
+"""asyncio counterparts of the changelog and release APIs.
+
+The blocking work runs on a bounded thread pool so the event loop stays
+responsive. Calls for the same repository are serialized (pygit2 objects
+must not be shared between threads, and releases create tags), while
+different repositories are processed concurrently.
+
+Cancelling a call that is still queued means its work never starts.
+Cancelling a running call returns control to the caller at once; the worker
+thread finishes in the background and the repository stays locked until it
+does.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+from weakref import WeakKeyDictionary
+
+from pygit2 import discover_repository
+
+from girokmoji import changelog, release
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+_executor: ThreadPoolExecutor | None = None
+_LOCKS: "WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Lock]]" = (
+    WeakKeyDictionary()
+)
+
+
+def _default_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="girokmoji"
+        )
+    return _executor
+
+
+def _repo_key(repo_dir: Path | str) -> str:
+    """Identify a repository by its git directory, so that different paths
+    inside one working tree share a lock."""
+    return discover_repository(str(repo_dir)) or os.path.realpath(repo_dir)
+
+
+def _repo_lock(loop: asyncio.AbstractEventLoop, repo_dir: Path | str) -> asyncio.Lock:
+    locks = _LOCKS.setdefault(loop, {})
+    key = _repo_key(repo_dir)
+    lock = locks.get(key)
+    if lock is None:
+        lock = locks[key] = asyncio.Lock()
+    return lock
+
+
+async def run_serialized(
+    repo_dir: Path | str,
+    fn: Callable[..., T],
+    /,
+    *args: Any,
+    executor: Executor | None = None,
+    **kwargs: Any,
+) -> T:
+    """Run ``fn(*args, **kwargs)`` on ``executor`` (a shared bounded pool by
+    default), one call at a time per repository."""
+    loop = asyncio.get_running_loop()
+    lock = _repo_lock(loop, repo_dir)
+    await lock.acquire()
+    try:
+        job: Future = (executor or _default_executor()).submit(
+            partial(fn, *args, **kwargs)
+        )
+    except BaseException:
+        lock.release()
+        raise
+
+    def release_lock(_: Future) -> None:
+        # Runs on the worker thread (or here, if the job was cancelled)
+        try:
+            loop.call_soon_threadsafe(lock.release)
+        except RuntimeError:
+            # The loop is already closed; nobody can wait on the lock anymore
+            pass
+
+    # Release when the job really ends, not when the awaiting task is
+    # cancelled, so a running job keeps its repository to itself.
+    job.add_done_callback(release_lock)
+    return await asyncio.wrap_future(job)
+
+
+def _repo_dir(args: tuple, kwargs: dict, position: int, default: Any = None) -> Any:
+    if "repo_dir" in kwargs:
+        return kwargs["repo_dir"]
+    if len(args) > position:
+        return args[position]
+    if default is None:
+        raise TypeError("missing required argument: 'repo_dir'")
+    return default
+
+
+async def async_change_log(
+    *args: Any, executor: Executor | None = None, **kwargs: Any
+) -> str:
+    """Async counterpart of change_log; takes the same arguments."""
+    repo_dir = _repo_dir(args, kwargs, 2)
+    return await run_serialized(
+        repo_dir, changelog.change_log, *args, executor=executor, **kwargs
+    )
+
+
+async def async_github_release_payload(
+    *args: Any, executor: Executor | None = None, **kwargs: Any
+) -> str:
+    """Async counterpart of github_release_payload; takes the same arguments."""
+    repo_dir = _repo_dir(args, kwargs, 2)
+    return await run_serialized(
+        repo_dir, changelog.github_release_payload, *args, executor=executor, **kwargs
+    )
+
+
+async def async_auto_release(
+    *args: Any, executor: Executor | None = None, **kwargs: Any
+) -> str:
+    """Async counterpart of auto_release; takes the same arguments."""
+    repo_dir = _repo_dir(args, kwargs, 1, Path("."))
+    return await run_serialized(
+        repo_dir, release.auto_release, *args, executor=executor, **kwargs
+    )
@@ -0,0 +1,155 @@
+"""On-disk cache helpers shared by the girokmoji indexes.
+
+Every cache file is a small JSON document carrying a ``version`` field. A file
+with an unknown version, or one that cannot be read, is treated as missing so
+that indexes are rebuilt instead of failing the run.
+
+CommitIndex is the base of the per-commit indexes (patch-ids, diffstats)
+whose values need a diff each and are computed on a thread pool.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Generic, Iterable, TypeVar
+
+if TYPE_CHECKING:  # pragma: no cover - pygit2 is imported when computing
+    from pygit2 import Commit
+
+CACHE_VERSION = 1
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+V = TypeVar("V")
+_Index = TypeVar("_Index", bound="CommitIndex")
+
+
+def load_cache(cache_dir: Path | None, name: str) -> dict[str, Any] | None:
+    """Return the cached document ``name`` from ``cache_dir`` or None."""
+    if cache_dir is None:
+        return None
+    try:
+        with open(Path(cache_dir) / name, encoding="utf-8") as fp:
+            doc = json.load(fp)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(doc, dict) or doc.get("version") != CACHE_VERSION:
+        return None
+    return doc
+
+
+def save_cache(cache_dir: Path | None, name: str, doc: dict[str, Any]) -> bool:
+    """Atomically write ``doc`` as ``name`` into ``cache_dir``.
+
+    Returns False when the directory is not writable (e.g. a read-only
+    checkout); caching is best-effort and never fails the caller.
+    """
+    if cache_dir is None:
+        return False
+    target = Path(cache_dir) / name
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as fp:
+            json.dump({**doc, "version": CACHE_VERSION}, fp, separators=(",", ":"))
+        os.replace(tmp, target)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return False
+    return True
+
+
+class CommitIndex(Generic[V]):
+    """Memoized commit id -> value table, filled on a thread pool and
+    persisted as ``CACHE_NAME`` under ``cache_dir``.
+
+    Subclasses name the cache file and its table (``KEY``), check the values
+    read back in ``_decode``, and call ``_compute`` with the commits they miss.
+    """
+
+    CACHE_NAME: ClassVar[str]
+    KEY: ClassVar[str]
+    THREAD_NAME: ClassVar[str] = "girokmoji"
+
+    def __init__(self, values: dict[str, V] | None = None):
+        self._values: dict[str, V] = values or {}
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @classmethod
+    def _decode(cls, value: Any) -> V | None:
+        """Return a value read from the cache file, or None to drop it."""
+        raise NotImplementedError
+
+    @classmethod
+    def load(cls: type[_Index], cache_dir: Path | None) -> _Index:
+        """Load the index from ``cache_dir``; return an empty one on miss."""
+        doc = load_cache(cache_dir, cls.CACHE_NAME)
+        table = doc.get(cls.KEY) if doc is not None else None
+        if not isinstance(table, dict):
+            return cls()
+        values = {}
+        for key, value in table.items():
+            decoded = cls._decode(value)
+            if decoded is not None:
+                values[str(key)] = decoded
+        return cls(values)
+
+    def save(self, cache_dir: Path | None) -> bool:
+        """Persist the index if it changed since it was loaded."""
+        if not self._dirty:
+            return False
+        saved = save_cache(cache_dir, self.CACHE_NAME, {self.KEY: self._values})
+        if saved:
+            self._dirty = False
+        return saved
+
+    def _compute(
+        self,
+        repo_dir: Path | str,
+        commit_ids: Iterable[str],
+        fn: Callable[[Commit], V],
+        workers: int,
+    ) -> None:
+        """Store ``fn(commit)`` for each of ``commit_ids``; ids that are not
+        commits are skipped.
+
+        Each worker thread opens its own Repository, as pygit2 objects must
+        not be shared between threads.
+        """
+        missing = list(dict.fromkeys(commit_ids))
+        if not missing:
+            return
+        # Imported here so that reading caches (e.g. templates) needs no pygit2
+        from pygit2 import Commit, Repository, discover_repository
+
+        path = discover_repository(str(repo_dir))
+        local = threading.local()
+
+        def value(commit_id: str) -> V | None:
+            repo = getattr(local, "repo", None)
+            if repo is None:
+                repo = local.repo = Repository(path)
+            commit = repo.get(commit_id)
+            return fn(commit) if isinstance(commit, Commit) else None
+
+        if workers <= 1 or len(missing) == 1:
+            results = list(map(value, missing))
+        else:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix=self.THREAD_NAME
+            ) as pool:
+                results = list(pool.map(value, missing, chunksize=64))
+        for commit_id, result in zip(missing, results):
+            if result is not None:
+                self._values[commit_id] = result
+                self._dirty = True
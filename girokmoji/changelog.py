@@ -1,71 +1,174 @@
 import json
+import sys
+from dataclasses import replace
+from functools import partial
+from itertools import chain
+from datetime import datetime, timedelta
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable, Protocol, runtime_checkable, Any
+from typing import Iterable, Iterator, Sequence, Any, TextIO
 
-from girokmoji.catgitmoji import by_gitmoji, any_to_catmoji
-from girokmoji.const import CATEGORY, category_order, CATEGORY_SUBTEXTS
+from girokmoji.catgitmoji import CatGitmoji, by_gitmoji
+from girokmoji.const import CATEGORY, SEMVER, category_order
+from girokmoji.diffstat import diffstats
 from girokmoji.exception import (
     NoGitmojiInMessageError,
-    MessageDoesNotStartWithGitmojiError,
-    NoSuchGitmojiSupportedError,
+    MessageDoesNotStartWithGitmojiError as MessageDoesNotStartWithGitmojiError,
+    NoSuchGitmojiSupportedError as NoSuchGitmojiSupportedError,
+)
+from girokmoji.git import DEFAULT_CLOCK_SKEW, get_tag_to_tag_commits, mailmap_resolver
+from girokmoji.model import ChangelogModel, to_model
+from girokmoji.patchid import Deduplicator, deduplicator
+from girokmoji.payload import (
+    GITHUB_BODY_LIMIT,
+    fit_bodies,
+    strip_chunks,
+    write_release_payload,
+)
+from girokmoji.pipeline import prefetch
+from girokmoji.reverts import cancel_revert_pairs
+from girokmoji.spill import CommitRecord, SpillBucket, SpillStore
+from girokmoji.summary import ReleaseSummary, SummaryCollector
+from girokmoji.templatedir import TemplateSet
+from girokmoji.template import (
+    CATEGORY_SECTION as CATEGORY_SECTION,
+    ENTRY_GROUP_HEADER as ENTRY_GROUP_HEADER,
+    ENTRY_SUBITEM as ENTRY_SUBITEM,
+    HEAD as HEAD,
+    SEPARATOR as SEPARATOR,
+)
+from girokmoji.render import (
+    CommitLike as CommitLike,
+    GroupedEntries as GroupedEntries,
+    _category_groups as _category_groups,
+    _entry_group as _entry_group,
+    commit_message as commit_message,
+    first_line as first_line,
+    gen_markdown as gen_markdown,
+    iter_markdown as iter_markdown,
+    iter_markdown_parts as iter_markdown_parts,
+    group_change as group_change,
+    sep_gitmoji_msg_title as sep_gitmoji_msg_title,
 )
-from girokmoji.git import get_tag_to_tag_commits
-from girokmoji.template import ENTRY_GROUP_HEADER, ENTRY_SUBITEM
-from girokmoji.template import SEPARATOR, HEAD, CATEGORY_SECTION
 
 
-@runtime_checkable
-class CommitLike(Protocol):
-    @property
-    def message(self) -> str | None: ...
+def get_gitmoji_info(msg: str, *, fallback_to_includes: bool = True) -> CatGitmoji:
+    """Return the CatGitmoji that classifies ``msg``."""
+    mapping = by_gitmoji()
+    for gitmoji, info in mapping.items():
+        if msg.startswith(gitmoji):
+            return info
+    if fallback_to_includes:
+        for gitmoji, info in mapping.items():
+            if gitmoji in msg:
+                return info
+    raise NoGitmojiInMessageError("No Gitmoji found in the message")
 
-    @property
-    def raw_message(self) -> bytes: ...
 
-    @property
-    def message_encoding(self) -> str: ...
+BREAKING_TRAILERS = ("BREAKING CHANGE:", "BREAKING-CHANGE:")
+_BREAKING_TITLE_MARKS = ("💥", ":boom:")
+_BREAKING: dict[str, CatGitmoji] = {}
+
+
+def is_breaking(msg: str) -> bool:
+    """Return True if ``msg`` announces a breaking change.
+
+    That is a 💥 gitmoji in the title, or a ``BREAKING CHANGE:`` trailer. The
+    body is only looked at when there is one, and then only its last
+    paragraph (the trailer block), found by scanning back from the end.
+    """
+    end = msg.find("\n")
+    title = msg if end < 0 else msg[:end]
+    if any(mark in title for mark in _BREAKING_TITLE_MARKS):
+        return True
+    if end < 0:
+        return False
+    stop = len(msg)
+    while stop > end and msg[stop - 1].isspace():
+        stop -= 1
+    start = msg.rfind("\n\n", end, stop)
+    if start < 0:
+        # No body paragraph after the title
+        return False
+    block = msg[start + 2 : stop]
+    if "BREAKING" not in block:
+        return False
+    return any(
+        line.lstrip().startswith(BREAKING_TRAILERS) for line in block.split("\n")
+    )
 
-    @property
-    def id(self) -> Any: ...
 
+def breaking_info(info: CatGitmoji) -> CatGitmoji:
+    """Return ``info`` promoted to Critical Changes with a major bump."""
+    promoted = _BREAKING.get(info.code)
+    if promoted is None:
+        promoted = _BREAKING[info.code] = replace(
+            info, category="Critical Changes", semver="major"
+        )
+    return promoted
 
-def commit_message(commit: CommitLike) -> str:
-    if isinstance(commit.message, str):
-        return commit.message
 
-    return commit.raw_message.decode(commit.message_encoding)
+def classify(msg: str) -> CatGitmoji:
+    """get_gitmoji_info, with breaking changes promoted (see is_breaking)."""
+    info = get_gitmoji_info(msg)
+    promoted = info.category == "Critical Changes" and info.semver == "major"
+    if not promoted and is_breaking(msg):
+        return breaking_info(info)
+    return info
 
 
 def get_category(msg: str, *, fallback_to_includes: bool = True) -> CATEGORY:
-    mapping = by_gitmoji()
-    for gitmoji, info in mapping.items():
-        cat: CATEGORY = info.category
-        if msg.startswith(gitmoji):
-            return cat
-    if fallback_to_includes:
-        for gitmoji, info in mapping.items():
-            cat: CATEGORY = info.category
-            if gitmoji in msg:
-                return cat
-    raise NoGitmojiInMessageError("No Gitmoji found in the message")
+    return get_gitmoji_info(msg, fallback_to_includes=fallback_to_includes).category
 
 
-def sep_gitmoji_msg_title(msg: str, *, strict: bool = False) -> tuple[str, str]:
-    """Return gitmoji and message from commit message. Strict mode raises exception MessageDoesNotStartWithGitmojiError"""
-    msg = msg.split("\n")[0]
-    for gitmoji in by_gitmoji():
-        if msg.startswith(gitmoji):
-            return gitmoji, msg.removeprefix(gitmoji).strip(" ")
+_BUMP_RANK = {"patch": 1, "minor": 2, "major": 3}
 
-    if not strict:
-        return "", msg.split("\n")[0]
 
-    raise MessageDoesNotStartWithGitmojiError
+class BumpInference:
+    """Strongest SemVer bump implied by the gitmoji of classified commits.
+
+    ``deciding`` keeps ``(commit_id, gitmoji, title)`` for the commits that
+    imply the current ``part``; weaker commits are dropped as soon as a
+    stronger one is observed.
+    """
+
+    def __init__(self) -> None:
+        self.part: SEMVER = None
+        self.deciding: list[tuple[str, str, str]] = []
+
+    def observe(self, commit: CommitLike, msg: str, info: CatGitmoji) -> None:
+        part = info.semver
+        if part is None:
+            return
+        rank = _BUMP_RANK[part]
+        current = _BUMP_RANK[self.part] if self.part is not None else 0
+        if rank < current:
+            return
+        if rank > current:
+            self.part = part
+            self.deciding = []
+        gitmoji, title = sep_gitmoji_msg_title(msg)
+        self.deciding.append((str(commit.id), gitmoji or info.emoji, title))
+
+    def resolve(self, default: str = "patch") -> str:
+        """Return the inferred bump, or ``default`` if nothing implies one."""
+        return self.part or default
 
 
 def structured_changelog(
     commits: Iterable[CommitLike],
+    *,
+    bump: BumpInference | None = None,
+    dedup: Deduplicator | None = None,
+    collector: SummaryCollector | None = None,
 ) -> dict[CATEGORY, list[CommitLike]]:
+    """Group commits by category in ``category_order``.
+
+    When ``bump`` is given, the SemVer bump implied by each commit's gitmoji
+    is folded into it during the same pass. When ``dedup`` is given, commits
+    it reports as duplicates of earlier ones are left out. ``collector``
+    observes every commit that is kept.
+    """
     # prepare structured changelog with importance order
     structured_changelog: dict[CATEGORY, list[CommitLike]] = {}
     for cat in category_order:
@@ -73,120 +176,342 @@ def structured_changelog(
 
     for commit in commits:
         msg = commit_message(commit)
+        if dedup is not None and dedup.is_duplicate(
+            commit, *sep_gitmoji_msg_title(msg)
+        ):
+            continue
         try:
-            cat: CATEGORY = get_category(msg)
+            info = classify(msg)
         except NoGitmojiInMessageError:
-            cat = "Hmm..."
-        structured_changelog[cat].append(commit)
+            structured_changelog["Hmm..."].append(commit)
+            if collector is not None:
+                collector.observe(commit, "Hmm...")
+            continue
+        structured_changelog[info.category].append(commit)
+        if collector is not None:
+            collector.observe(commit, info.category)
+        if bump is not None:
+            bump.observe(commit, msg, info)
 
     return structured_changelog
 
 
-def gen_markdown(
-    project_name: str,
-    version: str,
-    release_date: str,
-    change: dict[CATEGORY, list[CommitLike]],
-):
-    parts: list[str] = []
+def _commit_record(commit: CommitLike) -> CommitRecord:
+    return CommitRecord(str(commit.id), commit_message(commit))
 
-    separator = SEPARATOR().markdown
-    head_md = HEAD(
-        project_name=project_name,
-        version=version,
-        subtext="""
-_"Change is always thrilling!"_  
-_(And sometimes a little confusing.)_
-    """,
-        release_date=release_date,
-    ).markdown
 
-    parts.append(head_md)
-    parts.append(separator)
+def spilling_changelog(
+    commits: Iterable[CommitLike],
+    store: SpillStore,
+    *,
+    bump: BumpInference | None = None,
+    dedup: Deduplicator | None = None,
+    collector: SummaryCollector | None = None,
+) -> dict[CATEGORY, SpillBucket]:
+    """Bounded-memory variant of structured_changelog.
+
+    Only ``(id, first line)`` records are kept, and ``store`` spills them to
+    disk past its threshold. Each category is pre-grouped by gitmoji in
+    first-seen order, so gen_markdown streams the groups back as they are.
+    """
+    structured: dict[CATEGORY, SpillBucket] = {}
+    for cat in category_order:
+        structured[cat] = store.bucket()
 
-    # Iterate categories in a deterministic, user-facing priority order
+    for commit in commits:
+        msg = commit_message(commit)
+        if dedup is not None and dedup.is_duplicate(
+            commit, *sep_gitmoji_msg_title(msg)
+        ):
+            continue
+        record = CommitRecord(str(commit.id), first_line(msg))
+        try:
+            info = classify(msg)
+        except NoGitmojiInMessageError:
+            structured["Hmm..."].add(None, record)
+            if collector is not None:
+                collector.observe(commit, "Hmm...")
+            continue
+        structured[info.category].add(_entry_group(msg)[0], record)
+        if collector is not None:
+            collector.observe(commit, info.category)
+        if bump is not None:
+            bump.observe(commit, msg, info)
+
+    return structured
+
+
+def write_stats(
+    change: dict[CATEGORY, list[CommitLike]] | dict[CATEGORY, SpillBucket],
+    bump: BumpInference | None = None,
+    *,
+    chosen_bump: str | None = None,
+) -> None:
+    """Write commit counts and the bump decision to stderr."""
+    total = sum(len(items) for items in change.values())
+    sys.stderr.write(f"[girokmoji] stats: {total} commits\n")
     for cat in category_order:
-        subcats: dict[tuple[str, str], list[tuple[str, str]]] = {}
-        for commit in change[cat]:
-            gitmoji, title = sep_gitmoji_msg_title(commit_message(commit))
-            if not gitmoji:
-                # Ignore commits without a recognizable gitmoji
-                continue
-            try:
-                catmoji = any_to_catmoji(gitmoji)
-            except NoSuchGitmojiSupportedError:
-                # Skip unsupported gitmoji rather than error out
-                continue
-            key = (catmoji.emoji, catmoji.description)
-            subcats.setdefault(key, []).append((title, str(commit.id)))
-
-        if subcats:
-            category_parts: list[str] = []
-            for (emoji, description), items in subcats.items():
-                header = ENTRY_GROUP_HEADER(
-                    emoji=emoji,
-                    gitmoji_description=description,
-                ).markdown
-                category_parts.append(header)
-                for title, commit_hash in items:
-                    item = ENTRY_SUBITEM(
-                        commit_description=title,
-                        commit_hash=commit_hash,
-                    ).markdown
-                    category_parts.append(item)
-
-            parts.append(CATEGORY_SECTION(cat, CATEGORY_SUBTEXTS[cat]).markdown)
-            parts.append("".join(category_parts))
-            parts.append(separator)
-
-    return "".join(parts)
+        if change[cat]:
+            sys.stderr.write(f"[girokmoji] stats: {cat}: {len(change[cat])}\n")
+    if bump is None:
+        return
+    implied = bump.part or "none"
+    line = f"[girokmoji] stats: implied bump: {implied}"
+    if chosen_bump is not None:
+        line += f" (bumping {chosen_bump})"
+    sys.stderr.write(line + "\n")
+    for commit_id, gitmoji, title in bump.deciding:
+        sys.stderr.write(f"[girokmoji] stats:   {commit_id[:12]} {gitmoji} {title}\n")
+
+
+def _write_dropped_stats(
+    dedup: Deduplicator | None, reverted: list[str] | None
+) -> None:
+    if reverted is not None:
+        sys.stderr.write(
+            f"[girokmoji] stats: dropped {len(reverted)} reverted or revert commits\n"
+        )
+    if dedup is not None:
+        sys.stderr.write(
+            f"[girokmoji] stats: dropped {len(dedup.dropped)} duplicate commits\n"
+        )
 
 
-def change_log(
-    project_name: str,
-    release_date: str,
+@contextmanager
+def classified_change(
     repo_dir: Path,
     tail_tag: str,
     head_tag: str,
-    version: str | None = None,
     *,
     range_mode: str = "auto",
     strict_ancestor: bool = False,
     quiet: bool = False,
     verbose: bool = False,
     sorting: int | None = None,
-) -> str:
-    if version is None:
-        version = head_tag
-
+    paths: Sequence[str] | None = None,
+    cache_dir: Path | None = None,
+    stats: bool = False,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    clock_skew: timedelta = DEFAULT_CLOCK_SKEW,
+    spill_threshold: int | None = None,
+    pipelined: bool = False,
+    dedup: bool = False,
+    cancel_reverts: bool = False,
+    collector: SummaryCollector | None = None,
+) -> Iterator[dict[CATEGORY, list[CommitLike]] | dict[CATEGORY, SpillBucket]]:
+    """Walk and classify ``tail..head`` once and yield the categorized commits.
+
+    Everything rendered from the yielded mapping must be rendered inside the
+    ``with`` block: with ``spill_threshold`` its buckets live in temporary
+    files that are removed on exit. Options are those of change_log.
+
+    ``dedup`` collapses commits with the same patch-id, or the same gitmoji,
+    title and author (see girokmoji.patchid). ``cancel_reverts`` drops
+    commits reverted within the range together with their reverts (see
+    girokmoji.reverts). Both read the whole range before classifying, so
+    ``pipelined`` does not apply to them. Neither does it with ``collector``,
+    which needs the commit authors that prefetched records do not carry.
+    """
     # Preserve backward-compat: only pass extra kwargs when they differ
     # from defaults, so monkeypatched tests with simpler signatures work.
+    range_kwargs: dict[str, Any] = {}
     if (
-        range_mode == "auto"
-        and not strict_ancestor
-        and not quiet
-        and not verbose
-        and sorting is None
+        range_mode != "auto"
+        or strict_ancestor
+        or quiet
+        or verbose
+        or sorting is not None
     ):
-        commits = get_tag_to_tag_commits(repo_dir, tail_tag, head_tag)
-    else:
-        commits = get_tag_to_tag_commits(
-            repo_dir,
-            tail_tag,
-            head_tag,
+        range_kwargs.update(
             range_mode=range_mode,
             strict_ancestor=strict_ancestor,
             quiet=quiet,
             verbose=verbose,
             sorting=sorting,
         )
+    if paths:
+        range_kwargs["paths"] = paths
+    if cache_dir is not None:
+        range_kwargs["cache_dir"] = cache_dir
+    if since is not None or until is not None:
+        range_kwargs.update(since=since, until=until, clock_skew=clock_skew)
+    commits = get_tag_to_tag_commits(repo_dir, tail_tag, head_tag, **range_kwargs)
+    duplicates = None
+    reverted: list[str] | None = None
+    if cancel_reverts:
+        commits, reverted = cancel_revert_pairs(list(commits))
+    if dedup:
+        commits = list(commits)
+        duplicates = deduplicator(repo_dir, commits, cache_dir=cache_dir)
+    elif pipelined and not cancel_reverts and collector is None:
+        # Walk and read messages on a worker thread while classifying here
+        commits = prefetch(commits, _commit_record)
+
+    inference = BumpInference() if stats else None
+    if spill_threshold is not None:
+        # Bounded memory: keep at most spill_threshold records buffered
+        with SpillStore(spill_threshold) as store:
+            spilled = spilling_changelog(
+                commits, store, bump=inference, dedup=duplicates, collector=collector
+            )
+            _collect_diffstats(repo_dir, collector, cache_dir)
+            if stats:
+                write_stats(spilled, inference)
+                _write_dropped_stats(duplicates, reverted)
+                sys.stderr.write(f"[girokmoji] stats: spilled {store.spills} times\n")
+            yield spilled
+        return
+
+    change = structured_changelog(
+        commits, bump=inference, dedup=duplicates, collector=collector
+    )
+    _collect_diffstats(repo_dir, collector, cache_dir)
+    if stats:
+        write_stats(change, inference)
+        _write_dropped_stats(duplicates, reverted)
+    yield change
+
+
+def _collect_diffstats(
+    repo_dir: Path, collector: SummaryCollector | None, cache_dir: Path | None
+) -> None:
+    # After the walk, diff the kept commits in parallel (see girokmoji.diffstat)
+    if collector is None or not collector.diffstat:
+        return
+    index = diffstats(
+        repo_dir,
+        chain.from_iterable(collector.commit_ids.values()),
+        merges=collector.diffstat_merges,
+        cache_dir=cache_dir,
+    )
+    collector.diffstats = partial(index.get, merges=collector.diffstat_merges)
+
+
+def _summary_collector(
+    repo_dir: Path, sections: Sequence[str], diffstat_merges: bool = False
+) -> SummaryCollector | None:
+    if not sections:
+        return None
+    return SummaryCollector(
+        mailmap_resolver(repo_dir),
+        diffstat="diffstat" in sections,
+        diffstat_merges=diffstat_merges,
+    )
+
 
-    return gen_markdown(
-        project_name,
-        version,
-        release_date,
-        structured_changelog(commits),
-    ).strip()
+def _release_summary(
+    collector: SummaryCollector | None, change: Any, sections: Sequence[str]
+) -> ReleaseSummary | None:
+    return None if collector is None else collector.summary(change, sections)
+
+
+def change_model(
+    repo_dir: Path,
+    tail_tag: str,
+    head_tag: str,
+    *,
+    range_mode: str = "auto",
+    strict_ancestor: bool = False,
+    quiet: bool = False,
+    verbose: bool = False,
+    sorting: int | None = None,
+    paths: Sequence[str] | None = None,
+    cache_dir: Path | None = None,
+    stats: bool = False,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    clock_skew: timedelta = DEFAULT_CLOCK_SKEW,
+    spill_threshold: int | None = None,
+    pipelined: bool = False,
+    dedup: bool = False,
+    cancel_reverts: bool = False,
+) -> ChangelogModel:
+    """Return the grouped changelog of ``tail..head`` as a serializable model
+    (see girokmoji.model). Options are those of change_log."""
+    with classified_change(
+        repo_dir,
+        tail_tag,
+        head_tag,
+        range_mode=range_mode,
+        strict_ancestor=strict_ancestor,
+        quiet=quiet,
+        verbose=verbose,
+        sorting=sorting,
+        paths=paths,
+        cache_dir=cache_dir,
+        stats=stats,
+        since=since,
+        until=until,
+        clock_skew=clock_skew,
+        spill_threshold=spill_threshold,
+        pipelined=pipelined,
+        dedup=dedup,
+        cancel_reverts=cancel_reverts,
+    ) as change:
+        return to_model(change)
+
+
+def change_log(
+    project_name: str,
+    release_date: str,
+    repo_dir: Path,
+    tail_tag: str,
+    head_tag: str,
+    version: str | None = None,
+    *,
+    range_mode: str = "auto",
+    strict_ancestor: bool = False,
+    quiet: bool = False,
+    verbose: bool = False,
+    sorting: int | None = None,
+    paths: Sequence[str] | None = None,
+    cache_dir: Path | None = None,
+    stats: bool = False,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    clock_skew: timedelta = DEFAULT_CLOCK_SKEW,
+    spill_threshold: int | None = None,
+    pipelined: bool = False,
+    dedup: bool = False,
+    cancel_reverts: bool = False,
+    templates: TemplateSet | None = None,
+    sections: Sequence[str] = (),
+    diffstat_merges: bool = False,
+) -> str:
+    if version is None:
+        version = head_tag
+
+    collector = _summary_collector(repo_dir, sections, diffstat_merges)
+    with classified_change(
+        repo_dir,
+        tail_tag,
+        head_tag,
+        range_mode=range_mode,
+        strict_ancestor=strict_ancestor,
+        quiet=quiet,
+        verbose=verbose,
+        sorting=sorting,
+        paths=paths,
+        cache_dir=cache_dir,
+        stats=stats,
+        since=since,
+        until=until,
+        clock_skew=clock_skew,
+        spill_threshold=spill_threshold,
+        pipelined=pipelined,
+        dedup=dedup,
+        cancel_reverts=cancel_reverts,
+        collector=collector,
+    ) as change:
+        return gen_markdown(
+            project_name,
+            version,
+            release_date,
+            change,
+            templates=templates,
+            summary=_release_summary(collector, change, sections),
+        ).strip()
 
 
 def github_release_payload(
@@ -204,6 +529,19 @@ def github_release_payload(
     quiet: bool = False,
     verbose: bool = False,
     sorting: int | None = None,
+    paths: Sequence[str] | None = None,
+    cache_dir: Path | None = None,
+    stats: bool = False,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    clock_skew: timedelta = DEFAULT_CLOCK_SKEW,
+    spill_threshold: int | None = None,
+    pipelined: bool = False,
+    dedup: bool = False,
+    cancel_reverts: bool = False,
+    templates: TemplateSet | None = None,
+    sections: Sequence[str] = (),
+    diffstat_merges: bool = False,
 ) -> str:
     """Return GitHub release payload as JSON string."""
     changelog = change_log(
@@ -218,11 +556,208 @@ def github_release_payload(
         quiet=quiet,
         verbose=verbose,
         sorting=sorting,
+        paths=paths,
+        cache_dir=cache_dir,
+        stats=stats,
+        since=since,
+        until=until,
+        clock_skew=clock_skew,
+        spill_threshold=spill_threshold,
+        pipelined=pipelined,
+        dedup=dedup,
+        cancel_reverts=cancel_reverts,
+        templates=templates,
+        sections=sections,
+        diffstat_merges=diffstat_merges,
+    )
+    return release_payload(
+        head_tag, version or head_tag, changelog, draft=draft, prerelease=prerelease
     )
+
+
+def write_github_release_payload(
+    fp: TextIO,
+    project_name: str,
+    release_date: str,
+    repo_dir: Path,
+    tail_tag: str,
+    head_tag: str,
+    version: str | None = None,
+    *,
+    draft: bool = False,
+    prerelease: bool = False,
+    range_mode: str = "auto",
+    strict_ancestor: bool = False,
+    quiet: bool = False,
+    verbose: bool = False,
+    sorting: int | None = None,
+    paths: Sequence[str] | None = None,
+    cache_dir: Path | None = None,
+    stats: bool = False,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    clock_skew: timedelta = DEFAULT_CLOCK_SKEW,
+    spill_threshold: int | None = None,
+    pipelined: bool = False,
+    dedup: bool = False,
+    cancel_reverts: bool = False,
+    templates: TemplateSet | None = None,
+    sections: Sequence[str] = (),
+    diffstat_merges: bool = False,
+) -> None:
+    """Write the github_release_payload JSON to ``fp`` while rendering.
+
+    The body is escaped and written a chunk at a time instead of being built
+    as a string first; the bytes written equal github_release_payload's.
+    """
+    if version is None:
+        version = head_tag
+    collector = _summary_collector(repo_dir, sections, diffstat_merges)
+    with classified_change(
+        repo_dir,
+        tail_tag,
+        head_tag,
+        range_mode=range_mode,
+        strict_ancestor=strict_ancestor,
+        quiet=quiet,
+        verbose=verbose,
+        sorting=sorting,
+        paths=paths,
+        cache_dir=cache_dir,
+        stats=stats,
+        since=since,
+        until=until,
+        clock_skew=clock_skew,
+        spill_threshold=spill_threshold,
+        pipelined=pipelined,
+        dedup=dedup,
+        cancel_reverts=cancel_reverts,
+        collector=collector,
+    ) as change:
+        chunks = iter_markdown(
+            project_name,
+            version,
+            release_date,
+            change,
+            templates=templates,
+            summary=_release_summary(collector, change, sections),
+        )
+        body_size = write_release_payload(
+            fp,
+            head_tag,
+            version,
+            strip_chunks(chunks),
+            draft=draft,
+            prerelease=prerelease,
+        )
+    if body_size > GITHUB_BODY_LIMIT and not quiet:
+        sys.stderr.write(
+            f"[girokmoji] warning: the release body has {body_size} characters, "
+            f"over GitHub's limit of {GITHUB_BODY_LIMIT}; use --overflow "
+            "split or truncate\n"
+        )
+
+
+def fitted_github_release_payload(
+    project_name: str,
+    release_date: str,
+    repo_dir: Path,
+    tail_tag: str,
+    head_tag: str,
+    version: str | None = None,
+    *,
+    overflow: str = "split",
+    body_limit: int = GITHUB_BODY_LIMIT,
+    draft: bool = False,
+    prerelease: bool = False,
+    range_mode: str = "auto",
+    strict_ancestor: bool = False,
+    quiet: bool = False,
+    verbose: bool = False,
+    sorting: int | None = None,
+    paths: Sequence[str] | None = None,
+    cache_dir: Path | None = None,
+    stats: bool = False,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    clock_skew: timedelta = DEFAULT_CLOCK_SKEW,
+    spill_threshold: int | None = None,
+    pipelined: bool = False,
+    dedup: bool = False,
+    cancel_reverts: bool = False,
+    templates: TemplateSet | None = None,
+    sections: Sequence[str] = (),
+    diffstat_merges: bool = False,
+) -> tuple[str, list[str]]:
+    """Return the GitHub release payload with a body of at most
+    ``body_limit`` characters, and the markdown continuation documents.
+
+    Notes that fit are returned as github_release_payload would. Otherwise
+    ``overflow`` "split" moves whole groups (or categories) past the limit
+    into continuation documents, and "truncate" ends the body with a summary
+    of the omitted entries and returns no continuations.
+    """
+    if version is None:
+        version = head_tag
+    collector = _summary_collector(repo_dir, sections, diffstat_merges)
+    with classified_change(
+        repo_dir,
+        tail_tag,
+        head_tag,
+        range_mode=range_mode,
+        strict_ancestor=strict_ancestor,
+        quiet=quiet,
+        verbose=verbose,
+        sorting=sorting,
+        paths=paths,
+        cache_dir=cache_dir,
+        stats=stats,
+        since=since,
+        until=until,
+        clock_skew=clock_skew,
+        spill_threshold=spill_threshold,
+        pipelined=pipelined,
+        dedup=dedup,
+        cancel_reverts=cancel_reverts,
+        collector=collector,
+    ) as change:
+        parts = iter_markdown_parts(
+            project_name,
+            version,
+            release_date,
+            change,
+            templates=templates,
+            summary=_release_summary(collector, change, sections),
+        )
+        body, *continuations = fit_bodies(
+            parts,
+            mode=overflow,
+            title=f"🚀 **{project_name}** Release Changelog {version}",
+            limit=body_limit,
+        )
+    if continuations and not quiet:
+        sys.stderr.write(
+            f"[girokmoji] release body split into {len(continuations) + 1} parts\n"
+        )
+    payload = release_payload(
+        head_tag, version, body, draft=draft, prerelease=prerelease
+    )
+    return payload, continuations
+
+
+def release_payload(
+    tag_name: str,
+    name: str,
+    body: str,
+    *,
+    draft: bool = False,
+    prerelease: bool = False,
+) -> str:
+    """Return GitHub release payload JSON for an already rendered body."""
     payload = {
-        "tag_name": head_tag,
-        "name": version or head_tag,
-        "body": changelog,
+        "tag_name": tag_name,
+        "name": name,
+        "body": body,
         "draft": draft,
         "prerelease": prerelease,
     }
@@ -0,0 +1,142 @@
+"""Find the first release tag that contains a commit."""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Iterable
+
+from pygit2 import Oid, Repository, discover_repository
+from pygit2.enums import SortMode
+
+from girokmoji.cache import load_cache, save_cache
+from girokmoji.git import SemVerTagIndex, _resolve_to_commit, semver_tag_index
+
+CACHE_NAME = "contains.json"
+
+
+def _fingerprint(entries: list[tuple[str, Oid]]) -> str:
+    digest = hashlib.sha1()
+    for name, commit_id in entries:
+        digest.update(f"{name} {commit_id}\n".encode())
+    return digest.hexdigest()
+
+
+class ContainsIndex:
+    """Commit -> first containing release tag map.
+
+    "First" is the lowest SemVer precedence among the tags whose commit is
+    the commit itself or one of its descendants.
+    """
+
+    def __init__(self, fingerprint: str, tags: list[str], first: dict[str, int]):
+        self.fingerprint = fingerprint
+        self.tags = tags
+        self._first = first
+
+    def __len__(self) -> int:
+        return len(self._first)
+
+    def lookup(self, commit_id: Oid | str) -> str | None:
+        """Return the first tag containing ``commit_id``, or None."""
+        pos = self._first.get(str(commit_id))
+        return None if pos is None else self.tags[pos]
+
+    @classmethod
+    def build(
+        cls, repo: Repository, tag_index: SemVerTagIndex, *, stable_only: bool = True
+    ) -> "ContainsIndex":
+        """Build the map with one topological walk from every tag.
+
+        Tags are numbered in ascending version order. Walking children before
+        parents, each commit's label is final when it is visited and is pushed
+        down to its parents as a running minimum, so every commit ends up with
+        the lowest-numbered tag that reaches it.
+        """
+        entries = [
+            (name, commit_id)
+            for name, ver, commit_id in tag_index.entries
+            if not (stable_only and ver.prerelease)
+        ]
+        tags = [name for name, _ in entries]
+        first: dict[str, int] = {}
+        if not entries:
+            return cls(_fingerprint(entries), tags, first)
+
+        pending: dict[Oid, int] = {}
+        for pos, (_, commit_id) in enumerate(entries):
+            pending.setdefault(commit_id, pos)
+        walk = repo.walk(entries[0][1], SortMode.TOPOLOGICAL)
+        for commit_id in pending:
+            walk.push(commit_id)
+        for commit in walk:
+            label = pending.pop(commit.id)
+            first[str(commit.id)] = label
+            for parent_id in commit.parent_ids:
+                current = pending.get(parent_id)
+                if current is None or label < current:
+                    pending[parent_id] = label
+        return cls(_fingerprint(entries), tags, first)
+
+    @classmethod
+    def load(cls, cache_dir: Path | None, fingerprint: str) -> "ContainsIndex | None":
+        """Load a cached map built for the same tag set, if any."""
+        doc = load_cache(cache_dir, CACHE_NAME)
+        if doc is None or doc.get("fingerprint") != fingerprint:
+            return None
+        try:
+            tags = [str(name) for name in doc["tags"]]
+            first = {
+                commit_hex: pos
+                for pos, commits in enumerate(doc["commits"])
+                for commit_hex in commits
+            }
+        except (KeyError, TypeError):
+            return None
+        return cls(fingerprint, tags, first)
+
+    def save(self, cache_dir: Path | None) -> bool:
+        """Persist the map grouped by tag."""
+        grouped: list[list[str]] = [[] for _ in self.tags]
+        for commit_hex, pos in self._first.items():
+            grouped[pos].append(commit_hex)
+        doc = {"fingerprint": self.fingerprint, "tags": self.tags, "commits": grouped}
+        return save_cache(cache_dir, CACHE_NAME, doc)
+
+
+def contains_index(
+    repo: Repository, *, stable_only: bool = True, cache_dir: Path | None = None
+) -> ContainsIndex:
+    """Return the ContainsIndex for the current tags, reusing the disk cache."""
+    tag_index = semver_tag_index(repo, cache_dir)
+    fingerprint = _fingerprint(
+        [
+            (name, commit_id)
+            for name, ver, commit_id in tag_index.entries
+            if not (stable_only and ver.prerelease)
+        ]
+    )
+    index = ContainsIndex.load(cache_dir, fingerprint)
+    if index is None:
+        index = ContainsIndex.build(repo, tag_index, stable_only=stable_only)
+        index.save(cache_dir)
+    return index
+
+
+def first_containing_tags(
+    repo_dir: Path,
+    commits: Iterable[str],
+    *,
+    include_prereleases: bool = False,
+    cache_dir: Path | None = None,
+) -> dict[str, str | None]:
+    """Return, for each commit (SHA, short SHA or ref), the first release tag
+    that contains it, or None when no release contains it yet.
+
+    Raises NoSuchTagFoundError for names that cannot be resolved.
+    """
+    repo = Repository(discover_repository(str(repo_dir)))
+    index = contains_index(
+        repo, stable_only=not include_prereleases, cache_dir=cache_dir
+    )
+    return {name: index.lookup(_resolve_to_commit(repo, name).id) for name in commits}
@@ -0,0 +1,105 @@
+"""Files changed, insertions and deletions of commits, for release statistics.
+
+Each commit is diffed against its first parent (or the empty tree for a
+root commit). Merge commits are skipped unless ``merges`` is set, since
+their first-parent diff repeats the changes of the merged commits.
+
+Diffstats are kept in a cache.CommitIndex, so they are computed in parallel
+and stored per commit id in ``diffstats.json`` under ``cache_dir``.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterable, Union
+
+from pygit2 import Commit
+
+from girokmoji.cache import DEFAULT_WORKERS, CommitIndex
+from girokmoji.summary import DiffStat
+
+CACHE_NAME = "diffstats.json"
+
+# Merge commits whose diff was not computed are cached as this marker;
+# computed entries are [files, insertions, deletions, is_merge]
+_MERGE = "merge"
+
+Cached = Union[list[int], str]
+
+
+def compute_diffstat(commit: Commit, *, merges: bool = False) -> DiffStat | None:
+    """Return the diffstat of ``commit`` against its first parent, or None
+    for a merge commit unless ``merges`` is set."""
+    parents = commit.parents
+    if len(parents) > 1 and not merges:
+        return None
+    if parents:
+        diff = parents[0].tree.diff_to_tree(commit.tree)
+    else:
+        diff = commit.tree.diff_to_tree(swap=True)
+    stats = diff.stats
+    return DiffStat(stats.files_changed, stats.insertions, stats.deletions)
+
+
+class DiffStatIndex(CommitIndex[Cached]):
+    """Memoized commit id -> diffstat table."""
+
+    CACHE_NAME = CACHE_NAME
+    KEY = "diffstats"
+    THREAD_NAME = "girokmoji-diffstat"
+
+    @classmethod
+    def _decode(cls, value: Any) -> Cached | None:
+        if value == _MERGE:
+            return _MERGE
+        if isinstance(value, list) and len(value) == 4:
+            return [int(v) for v in value]
+        return None
+
+    def get(self, commit_id: str, *, merges: bool = False) -> DiffStat | None:
+        """Return the cached diffstat of ``commit_id``; None for unknown
+        commits and, unless ``merges`` is set, for merge commits."""
+        value = self._values.get(commit_id)
+        if not isinstance(value, list) or (value[3] and not merges):
+            return None
+        return DiffStat(*value[:3])
+
+    def _missing(self, commit_id: str, merges: bool) -> bool:
+        value = self._values.get(commit_id)
+        return value is None or (merges and value == _MERGE)
+
+    def compute(
+        self,
+        repo_dir: Path | str,
+        commit_ids: Iterable[str],
+        *,
+        merges: bool = False,
+        workers: int = DEFAULT_WORKERS,
+    ) -> None:
+        """Compute the diffstats of ``commit_ids`` missing from the index."""
+
+        def diffstat(commit: Commit) -> Cached:
+            stat = compute_diffstat(commit, merges=merges)
+            if stat is None:
+                return _MERGE
+            is_merge = int(len(commit.parent_ids) > 1)
+            return [stat.files, stat.insertions, stat.deletions, is_merge]
+
+        missing = (c for c in commit_ids if self._missing(c, merges))
+        self._compute(repo_dir, missing, diffstat, workers)
+
+
+def diffstats(
+    repo_dir: Path | str,
+    commit_ids: Iterable[str],
+    *,
+    merges: bool = False,
+    cache_dir: Path | None = None,
+    workers: int = DEFAULT_WORKERS,
+) -> DiffStatIndex:
+    """Return a DiffStatIndex with the diffstats of ``commit_ids`` computed
+    (in parallel) and cached."""
+    index = DiffStatIndex.load(cache_dir)
+    index.compute(repo_dir, commit_ids, merges=merges, workers=workers)
+    index.save(cache_dir)
+    return index
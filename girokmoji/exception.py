@@ -16,3 +16,11 @@ class NoSuchTagFoundError(IndexError):
 
 class NotAncestorError(ValueError):
     """Tail is not an ancestor of head while strict-ancestor is set."""
+
+
+class ModelFormatError(ValueError):
+    """Changelog model file is malformed or of an unsupported version."""
+
+
+class TemplateError(ValueError):
+    """User supplied template is missing or malformed."""
@@ -0,0 +1,201 @@
+"""Render one classified changelog as markdown, JSON and HTML.
+
+The commits are walked and classified once; every requested format is
+rendered from the same grouped entries (see render.group_change).
+"""
+
+from __future__ import annotations
+
+import html
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from girokmoji.changelog import (
+    _release_summary,
+    _summary_collector,
+    classified_change,
+)
+from girokmoji.const import CATEGORY, CATEGORY_SUBTEXTS, category_order
+from girokmoji.git import DEFAULT_CLOCK_SKEW
+from girokmoji.render import _category_groups, gen_markdown, group_change
+from girokmoji.summary import ReleaseSummary
+from girokmoji.templatedir import TemplateSet
+
+FORMATS = ("markdown", "json", "html")
+
+
+def parse_formats(text: str) -> list[str]:
+    """Parse a comma separated format list such as ``markdown,json``."""
+    formats = [f.strip().lower() for f in text.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown or not formats:
+        raise ValueError(
+            f"Unsupported format(s): {', '.join(unknown) or text!r}; "
+            f"choose from {', '.join(FORMATS)}"
+        )
+    return list(dict.fromkeys(formats))
+
+
+def _sections(change) -> Iterable[tuple[CATEGORY, list]]:
+    for cat in category_order:
+        groups = [
+            (key, list(entries)) for key, entries in _category_groups(change[cat])
+        ]
+        if groups:
+            yield cat, groups
+
+
+def render_json(project_name: str, version: str, release_date: str, change) -> str:
+    """Return the notes as a JSON document of categories, gitmoji groups and
+    entries."""
+    doc: dict[str, Any] = {
+        "project_name": project_name,
+        "version": version,
+        "release_date": release_date,
+        "categories": [
+            {
+                "category": cat,
+                "subtext": CATEGORY_SUBTEXTS[cat],
+                "groups": [
+                    {
+                        "emoji": emoji,
+                        "description": description,
+                        "entries": [
+                            {"title": title, "commit": commit_hash}
+                            for title, commit_hash in entries
+                        ],
+                    }
+                    for (emoji, description), entries in groups
+                ],
+            }
+            for cat, groups in _sections(change)
+        ],
+    }
+    return json.dumps(doc, ensure_ascii=False)
+
+
+def render_html(project_name: str, version: str, release_date: str, change) -> str:
+    """Return the notes as an HTML fragment (e.g. for an email digest)."""
+    esc = html.escape
+    parts = [
+        f"<h1>🚀 <strong>{esc(project_name)}</strong> Release Changelog "
+        f"{esc(version)}</h1>\n",
+        f"<p><strong>Release Date:</strong> {esc(release_date)}</p>\n",
+    ]
+    for cat, groups in _sections(change):
+        parts.append(f"<h2>{esc(cat)}</h2>\n")
+        parts.append(f"<p><em>{esc(CATEGORY_SUBTEXTS[cat])}</em></p>\n<ul>\n")
+        for (emoji, description), entries in groups:
+            parts.append(
+                f"<li><strong>{esc(emoji)} {esc(description)}</strong>\n<ul>\n"
+            )
+            for title, commit_hash in entries:
+                parts.append(
+                    f'<li><a href="../../commit/{esc(commit_hash)}">'
+                    f"<em>{esc(title)}</em></a></li>\n"
+                )
+            parts.append("</ul>\n</li>\n")
+        parts.append("</ul>\n")
+    return "".join(parts)
+
+
+def render_formats(
+    formats: Sequence[str],
+    project_name: str,
+    version: str,
+    release_date: str,
+    change,
+    *,
+    templates: TemplateSet | None = None,
+    summary: ReleaseSummary | None = None,
+) -> dict[str, str]:
+    """Render ``change`` in every requested format from one grouping.
+    ``templates`` and ``summary`` only apply to the markdown rendering."""
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format: {fmt}")
+    grouped = group_change(change)
+    rendered: dict[str, str] = {}
+    for fmt in formats:
+        if fmt == "markdown":
+            text = gen_markdown(
+                project_name,
+                version,
+                release_date,
+                grouped,
+                templates=templates,
+                summary=summary,
+            ).strip()
+        elif fmt == "json":
+            text = render_json(project_name, version, release_date, grouped)
+        else:
+            text = render_html(project_name, version, release_date, grouped)
+        rendered[fmt] = text
+    return rendered
+
+
+def change_log_formats(
+    project_name: str,
+    release_date: str,
+    repo_dir: Path,
+    tail_tag: str,
+    head_tag: str,
+    version: str | None = None,
+    *,
+    formats: Sequence[str] = FORMATS,
+    range_mode: str = "auto",
+    strict_ancestor: bool = False,
+    quiet: bool = False,
+    verbose: bool = False,
+    sorting: int | None = None,
+    paths: Sequence[str] | None = None,
+    cache_dir: Path | None = None,
+    stats: bool = False,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    clock_skew: timedelta = DEFAULT_CLOCK_SKEW,
+    spill_threshold: int | None = None,
+    pipelined: bool = False,
+    dedup: bool = False,
+    cancel_reverts: bool = False,
+    templates: TemplateSet | None = None,
+    sections: Sequence[str] = (),
+    diffstat_merges: bool = False,
+) -> dict[str, str]:
+    """Like change_log, but return ``{format: text}`` for every format in
+    ``formats`` from a single walk and classification pass."""
+    if version is None:
+        version = head_tag
+    collector = _summary_collector(repo_dir, sections, diffstat_merges)
+    with classified_change(
+        repo_dir,
+        tail_tag,
+        head_tag,
+        range_mode=range_mode,
+        strict_ancestor=strict_ancestor,
+        quiet=quiet,
+        verbose=verbose,
+        sorting=sorting,
+        paths=paths,
+        cache_dir=cache_dir,
+        stats=stats,
+        since=since,
+        until=until,
+        clock_skew=clock_skew,
+        spill_threshold=spill_threshold,
+        pipelined=pipelined,
+        dedup=dedup,
+        cancel_reverts=cancel_reverts,
+        collector=collector,
+    ) as change:
+        return render_formats(
+            formats,
+            project_name,
+            version,
+            release_date,
+            change,
+            templates=templates,
+            summary=_release_summary(collector, change, sections),
+        )
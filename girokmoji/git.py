@@ -1,12 +1,28 @@
+import re
+from bisect import bisect_left, bisect_right
+from datetime import datetime, time, timedelta, timezone
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, Sequence
 import sys
-from pygit2 import Commit, Repository, discover_repository
-from pygit2.enums import ObjectType, SortMode
+from functools import lru_cache
 
+from pygit2 import Commit, GitError, Mailmap, Oid, Repository, discover_repository
+from pygit2.enums import ObjectType, ReferenceFilter, SortMode
+
+from girokmoji.cache import load_cache, save_cache
 from girokmoji.exception import NoSuchTagFoundError, NotAncestorError
+from girokmoji.mergebase import MergeBaseCache, merge_base_cache
+from girokmoji.pathindex import ChangedPathsIndex, normalize_prefix
 from girokmoji.semver import SemVer
 
+# Tail tag placeholder: use the SemVer predecessor of the head tag
+AUTO_TAIL = "auto"
+# Tail tag placeholder: no tail, walk everything reachable from head
+NO_TAIL = "none"
+# How far a commit date may run ahead of its parents' (clock skew)
+DEFAULT_CLOCK_SKEW = timedelta(days=1)
+TAGS_CACHE_NAME = "tags.json"
+
 
 def _resolve_to_commit(repo: Repository, name: str) -> Commit:
     """Resolve a reference, tag name, or hex OID to a Commit.
@@ -14,24 +30,171 @@ def _resolve_to_commit(repo: Repository, name: str) -> Commit:
     Tries in order:
     - Exact ref name (when name starts with 'refs/'), e.g., 'refs/tags/v1'
     - Tag under refs/tags/<name>
-    - Revision parse via `revparse_single` (accepts tag names, shas, etc.)
+    - Revision parse via `revparse_single` (accepts shas, HEAD~1, etc.)
+
+    Lookups go through the TagResolver of ``repo``, so tags are loaded once
+    and each tag is resolved once per Repository object.
     """
-    obj = None
-    ref = None
-    if name.startswith("refs/"):
-        ref = repo.references.get(name)
-    else:
-        ref = repo.references.get(f"refs/tags/{name}")
-    if ref is not None:
-        obj = repo[ref.target]
-    else:
-        try:
-            obj = repo.revparse_single(name)
-        except Exception:
-            obj = None
-    if obj is None:
-        raise NoSuchTagFoundError(f"{name} can't be found")
-    return obj.peel(ObjectType.COMMIT)
+    return tag_resolver(repo).resolve(name)
+
+
+def _packed_peeled(repo: Repository) -> dict[str, tuple[str, str]]:
+    """Return ``refname -> (target, peeled)`` for peeled tags in packed-refs.
+
+    git writes a ``^<oid>`` line under each annotated tag when packing refs
+    with the ``peeled`` trait; that is the object the tag finally points to,
+    so it can be used without reading the tag object.
+    """
+    git_dir = Path(repo.path)
+    commondir = git_dir / "commondir"
+    if commondir.is_file():
+        git_dir = (git_dir / commondir.read_text().strip()).resolve()
+    try:
+        lines = (git_dir / "packed-refs").read_text().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return {}
+    res: dict[str, tuple[str, str]] = {}
+    last: tuple[str, str] | None = None
+    for line in lines:
+        if line.startswith("^"):
+            if last is not None:
+                res[last[0]] = (last[1], line[1:].strip())
+            last = None
+        elif line and not line.startswith("#"):
+            target, _, refname = line.partition(" ")
+            last = (
+                (refname.strip(), target) if refname.startswith("refs/tags/") else None
+            )
+    return res
+
+
+_FULL_OID = re.compile(r"[0-9a-fA-F]{40}")
+
+
+class TagResolver:
+    """Bulk resolver for tag names, refs and revisions of one repository.
+
+    The whole ``refs/tags/`` namespace is read once. Annotated tags whose
+    peeled value is recorded in packed-refs are peeled without loading the
+    tag object. Names that are not tags fall back to ``revparse_single``.
+    Results are memoized for the lifetime of the resolver.
+    """
+
+    def __init__(self, repo: Repository):
+        self.repo = repo
+        packed = _packed_peeled(repo)
+        # tag name below refs/tags/ -> (target, peeled commit-ish or None)
+        self.tags: dict[str, tuple[Oid, Oid | None]] = {}
+        for ref in repo.references.iterator(ReferenceFilter.TAGS):
+            target = ref.target
+            if not isinstance(target, Oid):
+                # Symbolic ref under refs/tags/; rare, resolve it directly
+                target = ref.resolve().target
+                if not isinstance(target, Oid):
+                    continue
+            peeled = packed.get(ref.name)
+            self.tags[ref.name[len("refs/tags/") :]] = (
+                target,
+                Oid(hex=peeled[1]) if peeled and peeled[0] == str(target) else None,
+            )
+        self._memo: dict[str, Commit] = {}
+
+    def has_tag(self, name: str) -> bool:
+        """Return True if ``refs/tags/<name>`` exists."""
+        return name in self.tags
+
+    def peeled_id(self, name: str) -> Oid:
+        """Return the commit id tag ``name`` points to (KeyError if missing)."""
+        target, peeled = self.tags[name]
+        if peeled is not None:
+            return peeled
+        return self.repo[target].peel(ObjectType.COMMIT).id
+
+    def resolve(self, name: str) -> Commit:
+        """Resolve one name; raise NoSuchTagFoundError if it can't be found.
+
+        Tags and full commit ids are memoized; other names (HEAD, branches,
+        ``HEAD~1``) move with history and are resolved on every call.
+        """
+        commit = self._memo.get(name)
+        if commit is None:
+            commit = self._resolve_uncached(name)
+            if self._is_stable(name):
+                self._memo[name] = commit
+        return commit
+
+    def _is_stable(self, name: str) -> bool:
+        tag = name[len("refs/tags/") :] if name.startswith("refs/tags/") else name
+        return tag in self.tags or bool(_FULL_OID.fullmatch(name))
+
+    def resolve_many(self, names: Iterable[str]) -> dict[str, Commit]:
+        """Resolve several names; raise on the first one that can't be found."""
+        return {name: self.resolve(name) for name in names}
+
+    def _resolve_uncached(self, name: str) -> Commit:
+        tag = name[len("refs/tags/") :] if name.startswith("refs/tags/") else name
+        entry = self.tags.get(tag)
+        if entry is not None:
+            return self.repo[entry[1] or entry[0]].peel(ObjectType.COMMIT)
+        obj = None
+        if name.startswith("refs/") and not name.startswith("refs/tags/"):
+            try:
+                ref = self.repo.references.get(name)
+            except ValueError:
+                ref = None
+            if ref is not None:
+                obj = self.repo[ref.resolve().target]
+        if obj is None and not name.startswith("refs/tags/"):
+            try:
+                obj = self.repo.revparse_single(name)
+            except (KeyError, ValueError, GitError):
+                obj = None
+        if obj is None:
+            raise NoSuchTagFoundError(f"{name} can't be found")
+        return obj.peel(ObjectType.COMMIT)
+
+
+# Attribute of a Repository holding its TagResolver
+_RESOLVER_ATTR = "_girokmoji_tag_resolver"
+
+
+def tag_resolver(repo: Repository) -> TagResolver:
+    """Return the TagResolver of ``repo``, created on first use.
+
+    The resolver lives as long as ``repo``. Every call that opens its own
+    Repository therefore reads the tags afresh, and sees tags created, moved
+    or deleted by other processes since the last call.
+    """
+    resolver = getattr(repo, _RESOLVER_ATTR, None)
+    if resolver is None:
+        resolver = TagResolver(repo)
+        setattr(repo, _RESOLVER_ATTR, resolver)
+    return resolver
+
+
+def forget_tag_resolver(repo: Repository) -> None:
+    """Drop the resolver of ``repo``, e.g. after creating a tag."""
+    if hasattr(repo, _RESOLVER_ATTR):
+        delattr(repo, _RESOLVER_ATTR)
+
+
+# Identities remembered by one mailmap_resolver
+MAILMAP_CACHE_SIZE = 4096
+
+
+def mailmap_resolver(repo_dir: Path | str) -> Callable[[str, str], tuple[str, str]]:
+    """Return a ``(name, email) -> (name, email)`` function applying the
+    repository's mailmap (``.mailmap``, ``mailmap.file`` and
+    ``mailmap.blob``).
+
+    The mailmap is read when the resolver is created, and the resolver
+    caches up to MAILMAP_CACHE_SIZE identities, so authors of many commits
+    cost one lookup. Use one resolver per session (e.g. per changelog), so
+    that edits to the mailmap are seen by the next one.
+    """
+    repo = Repository(discover_repository(str(repo_dir)))
+    mailmap = Mailmap.from_repository(repo)
+    return lru_cache(maxsize=MAILMAP_CACHE_SIZE)(mailmap.resolve)
 
 
 def get_tag_to_tag_commits(
@@ -44,6 +207,11 @@ def get_tag_to_tag_commits(
     quiet: bool = False,
     verbose: bool = False,
     sorting: int | None = None,
+    paths: Sequence[str] | None = None,
+    cache_dir: Path | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    clock_skew: timedelta = DEFAULT_CLOCK_SKEW,
 ) -> Iterable[Commit]:
     """Yield commits from tail->head based on range mode.
 
@@ -55,23 +223,158 @@ def get_tag_to_tag_commits(
 
     When strict_ancestor is True and head is not descendant of tail, raise
     NotAncestorError.
+
+    tail_tag may be 'auto' to use the SemVer predecessor of head_tag (see
+    _auto_tail), or 'none' to walk everything reachable from head_tag.
+
+    When paths is given, only commits changing a file at or below one of the
+    path prefixes are yielded. Changed paths come from a ChangedPathsIndex,
+    persisted in cache_dir when one is given.
+
+    since/until restrict the result to commits whose committer date lies in
+    the (inclusive) window; see walk_range for how the walk stops early.
     """
     repo = Repository(discover_repository(str(repo_dir)))
     head_commit = _resolve_to_commit(repo, head_tag)
-    tail_commit = _resolve_to_commit(repo, tail_tag)
+    tail_commit: Commit | None
+    if tail_tag == AUTO_TAIL and not tag_resolver(repo).has_tag(tail_tag):
+        tail_commit, tail_tag = _auto_tail(repo, head_tag, cache_dir)
+    elif tail_tag == NO_TAIL and not tag_resolver(repo).has_tag(tail_tag):
+        tail_commit = None
+    else:
+        tail_commit = _resolve_to_commit(repo, tail_tag)
+    yield from walk_range(
+        repo,
+        head_commit,
+        tail_commit,
+        range_mode=range_mode,
+        strict_ancestor=strict_ancestor,
+        quiet=quiet,
+        verbose=verbose,
+        sorting=sorting,
+        paths=paths,
+        cache_dir=cache_dir,
+        tail_name=tail_tag,
+        head_name=head_tag,
+        since=since,
+        until=until,
+        clock_skew=clock_skew,
+    )
+
+
+def parse_time_bound(text: str, *, end_of_day: bool = False) -> datetime:
+    """Parse an ISO 8601 date or datetime used as a --since/--until bound.
+
+    Values without a timezone are taken as UTC. A bare date means the start
+    of that day, or its last second when ``end_of_day`` is set, so that
+    ``--until 2025-08-07`` includes the whole day.
+    """
+    text = text.strip()
+    # datetime.fromisoformat() only accepts a "Z" suffix from Python 3.11
+    if text[-1:] in ("Z", "z"):
+        text = text[:-1] + "+00:00"
+    value = datetime.fromisoformat(text)
+    if len(text) == 10 and end_of_day:
+        value = datetime.combine(value.date(), time(23, 59, 59))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _newest_first(sorting: int) -> bool:
+    """Whether a walk sorted by ``sorting`` is in committer-time order,
+    newest first, as _within_window's ``stop_early`` requires."""
+    other = int(SortMode.TOPOLOGICAL) | int(SortMode.REVERSE)
+    return bool(sorting & int(SortMode.TIME)) and not sorting & other
+
+
+def _within_window(
+    commits: Iterable[Commit],
+    since: datetime | None,
+    until: datetime | None,
+    clock_skew: timedelta,
+    *,
+    stop_early: bool,
+) -> Iterable[Commit]:
+    """Yield the commits committed between ``since`` and ``until``.
+
+    With ``stop_early`` the input must be in committer-time order (newest
+    first). Iteration then ends at the first commit older than ``since``
+    minus ``clock_skew``, since only a parent dated ahead of its child by
+    more than that could still fall into the window.
+    """
+    low = int(since.timestamp()) if since is not None else None
+    high = int(until.timestamp()) if until is not None else None
+    stop = low - int(clock_skew.total_seconds()) if low is not None else None
+    for commit in commits:
+        when = commit.commit_time
+        if stop_early and stop is not None and when < stop:
+            return
+        if (low is not None and when < low) or (high is not None and when > high):
+            continue
+        yield commit
+
+
+def _auto_tail(
+    repo: Repository, head_tag: str, cache_dir: Path | None = None
+) -> tuple[Commit | None, str]:
+    """Return the tail commit and name preceding the SemVer tag ``head_tag``.
 
-    # Decide effective mode
+    The predecessor is found by bisecting the repository's SemVer tag index.
+    Only tags with the same prefix as head are candidates: ``pkg-a/v`` for
+    ``pkg-a/v1.2.0``, and ``v`` for ``v1.2.0``, which leaves out the tags of
+    other packages. Prereleases are skipped unless head itself is a
+    prerelease. Without a predecessor the tail is None, so everything
+    reachable from head is used.
+    """
+    name = head_tag.removeprefix("refs/tags/")
+    # Parse the last name component, as semver_tag_index does
+    last = name.rsplit("/", 1)[-1]
+    text = last[1:] if last[:1].lower() == "v" else last
+    version = SemVer.try_parse(text)
+    if version is None:
+        raise NoSuchTagFoundError(f"cannot infer tail: {head_tag} is not a SemVer tag")
+    prefix = name[: len(name) - len(text)]
+    index = semver_tag_index(repo, cache_dir).with_prefix(prefix)
+    entry = index.predecessor(version, stable_only=not version.prerelease)
+    if entry is None:
+        return None, AUTO_TAIL
+    tail_name, _, commit_id = entry
+    return repo[commit_id].peel(ObjectType.COMMIT), tail_name
+
+
+def _effective_range_mode(
+    repo: Repository,
+    head_commit: Commit,
+    tail_commit: Commit,
+    *,
+    range_mode: str,
+    strict_ancestor: bool,
+    quiet: bool,
+    verbose: bool,
+    tail_name: str,
+    head_name: str,
+    bases: MergeBaseCache,
+) -> str:
+    """Resolve ``range_mode`` to the mode used for the walk.
+
+    Ancestry is answered from the memoized merge-base of the pair, so the
+    common-base walk that may follow does not compute it again.
+
+    Raises NotAncestorError when strict_ancestor is set and tail is not an
+    ancestor of head.
+    """
     effective_mode = range_mode
     if range_mode == "auto":
-        is_desc = repo.descendant_of(head_commit.id, tail_commit.id)
+        is_desc = bases.is_ancestor(repo, tail_commit.id, head_commit.id)
         if strict_ancestor and not is_desc:
-            raise NotAncestorError(f"{tail_tag} is not an ancestor of {head_tag}")
+            raise NotAncestorError(f"{tail_name} is not an ancestor of {head_name}")
         if is_desc:
             effective_mode = "direct"
             if verbose and not quiet:
                 sys.stderr.write("[girokmoji] auto: using direct (linear history)\n")
         else:
-            mb = repo.merge_base(head_commit.id, tail_commit.id)
+            mb = bases.merge_base(repo, head_commit.id, tail_commit.id)
             if mb is not None:
                 effective_mode = "common-base"
                 if not quiet:
@@ -94,23 +397,80 @@ def get_tag_to_tag_commits(
                         )
     elif strict_ancestor:
         # Respect strict check even for explicit mode selections
-        if not repo.descendant_of(head_commit.id, tail_commit.id):
-            raise NotAncestorError(f"{tail_tag} is not an ancestor of {head_tag}")
+        if not bases.is_ancestor(repo, tail_commit.id, head_commit.id):
+            raise NotAncestorError(f"{tail_name} is not an ancestor of {head_name}")
+    return effective_mode
+
+
+def walk_range(
+    repo: Repository,
+    head_commit: Commit,
+    tail_commit: Commit | None,
+    *,
+    range_mode: str = "auto",
+    strict_ancestor: bool = False,
+    quiet: bool = False,
+    verbose: bool = False,
+    sorting: int | None = None,
+    paths: Sequence[str] | None = None,
+    cache_dir: Path | None = None,
+    tail_name: str = "tail",
+    head_name: str = "head",
+    since: datetime | None = None,
+    until: datetime | None = None,
+    clock_skew: timedelta = DEFAULT_CLOCK_SKEW,
+) -> Iterable[Commit]:
+    """Yield commits between already resolved commits of an open repository.
+
+    Options behave as in get_tag_to_tag_commits; ``tail_name`` and
+    ``head_name`` are only used in messages. A missing tail (no previous
+    release) walks everything reachable from head.
+
+    Commits come in the walker's default order unless ``sorting`` is given.
+    With a since/until window the default sorting is committer time only,
+    so the walk stops once commits are older than ``since`` minus
+    ``clock_skew`` instead of visiting all of history. Other sortings are
+    honored, but the walk only stops early when they are newest-first by
+    committer time (TIME without TOPOLOGICAL or REVERSE); otherwise the
+    window only filters.
+
+    Merge-bases come from the repository's shared MergeBaseCache, which is
+    persisted in cache_dir when one is given.
+    """
+    if clock_skew < timedelta(0):
+        raise ValueError(f"clock_skew must not be negative: {clock_skew}")
+    bases = merge_base_cache(repo, cache_dir)
+    if tail_commit is None:
+        effective_mode = "head-only"
+    else:
+        effective_mode = _effective_range_mode(
+            repo,
+            head_commit,
+            tail_commit,
+            range_mode=range_mode,
+            strict_ancestor=strict_ancestor,
+            quiet=quiet,
+            verbose=verbose,
+            tail_name=tail_name,
+            head_name=head_name,
+            bases=bases,
+        )
 
     # Prepare walker
     rev_walk = repo.walk(head_commit.id)
-    # Default sorting if unspecified
-    if sorting is None:
-        sorting = int(SortMode.TOPOLOGICAL) | int(SortMode.TIME)
-    sort_fn = getattr(rev_walk, "sorting", None)
-    if callable(sort_fn):
-        sort_fn(sorting)
+    windowed = since is not None or until is not None
+    # Without a window or an explicit sorting, keep the walker's own order
+    if sorting is None and windowed:
+        sorting = int(SortMode.TIME)
+    if sorting is not None:
+        rev_walk.sort(SortMode(sorting))
 
     # Apply hiding logic by mode
-    if effective_mode == "direct":
-        rev_walk.hide(tail_commit.id)
+    if tail_commit is None or effective_mode == "head-only":
+        # Do not hide anything; enumerate from head
+        pass
     elif effective_mode == "common-base":
-        mb = repo.merge_base(head_commit.id, tail_commit.id)
+        mb = bases.merge_base(repo, head_commit.id, tail_commit.id)
         if mb is not None:
             rev_walk.hide(mb)
         else:
@@ -119,16 +479,33 @@ def get_tag_to_tag_commits(
                 sys.stderr.write(
                     "[girokmoji] common-base requested but no merge-base; head-only\n"
                 )
-    elif effective_mode == "head-only":
-        # Do not hide anything; enumerate from head
-        pass
     else:
-        # For safety, treat unknown as direct
+        # "direct"; for safety, unknown modes are treated as direct too
         rev_walk.hide(tail_commit.id)
+    bases.save(cache_dir)
 
-    for rev in rev_walk:
-        if isinstance(rev, Commit):
-            yield rev
+    commits: Iterable[Commit] = (rev for rev in rev_walk if isinstance(rev, Commit))
+    if windowed:
+        commits = _within_window(
+            commits,
+            since,
+            until,
+            clock_skew,
+            stop_early=sorting is not None and _newest_first(sorting),
+        )
+
+    if not paths:
+        yield from commits
+        return
+
+    prefixes = [normalize_prefix(p) for p in paths]
+    index = ChangedPathsIndex.load(cache_dir)
+    try:
+        for rev in commits:
+            if index.touches_any(rev, prefixes):
+                yield rev
+    finally:
+        index.save(cache_dir)
 
 
 def iter_semver_tags(repo: Repository) -> Iterable[tuple[str, SemVer, Commit]]:
@@ -143,9 +520,8 @@ def iter_semver_tags(repo: Repository) -> Iterable[tuple[str, SemVer, Commit]]:
             continue
         tag_name = refname.rsplit("/", 1)[-1]
         text = tag_name[1:] if tag_name[:1].lower() == "v" else tag_name
-        try:
-            ver = SemVer.parse(text)
-        except ValueError:
+        ver = SemVer.try_parse(text)
+        if ver is None:
             continue
         ref = repo.references.get(refname)
         if ref is None:
@@ -179,3 +555,187 @@ def global_max_semver_tag(repo: Repository) -> tuple[str, SemVer] | None:
         if best is None or ver > best[1]:
             best = (name, ver)
     return best
+
+
+class SemVerTagIndex:
+    """SemVer tags sharing a name prefix, sorted by ascending version.
+
+    Tag names are matched on their full name below ``refs/tags/``; the prefix
+    (e.g. ``pkg-a/v``) is stripped before the remainder is parsed as SemVer.
+    Entries are ``(tag_name, version, commit_id)`` tuples.
+    """
+
+    def __init__(
+        self, prefix: str = "", entries: Iterable[tuple[str, SemVer, Oid]] = ()
+    ):
+        self.prefix = prefix
+        self.entries: list[tuple[str, SemVer, Oid]] = sorted(
+            entries, key=lambda entry: entry[1].sort_key
+        )
+        # Parallel precedence keys for bisect-based range queries
+        self._keys = [entry[1].sort_key for entry in self.entries]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _slice(self, low: tuple, high: tuple) -> list[tuple[str, SemVer, Oid]]:
+        return self.entries[
+            bisect_left(self._keys, low) : bisect_left(self._keys, high)
+        ]
+
+    def with_prefix(self, prefix: str) -> "SemVerTagIndex":
+        """Return the entries named ``<prefix><version>`` as an index."""
+        return SemVerTagIndex(
+            prefix,
+            (
+                entry
+                for entry in self.entries
+                if entry[0].startswith(prefix)
+                and SemVer.try_parse(entry[0][len(prefix) :]) == entry[1]
+            ),
+        )
+
+    def between(
+        self,
+        low: SemVer | None = None,
+        high: SemVer | None = None,
+        *,
+        include_high: bool = False,
+    ) -> list[tuple[str, SemVer, Oid]]:
+        """Return entries with ``low <= version < high`` in ascending order.
+
+        Either bound may be None (unbounded); ``include_high`` makes the upper
+        bound inclusive.
+        """
+        lo = 0 if low is None else bisect_left(self._keys, low.sort_key)
+        if high is None:
+            hi = len(self._keys)
+        elif include_high:
+            hi = bisect_right(self._keys, high.sort_key)
+        else:
+            hi = bisect_left(self._keys, high.sort_key)
+        return self.entries[lo:hi]
+
+    def in_major(self, major: int) -> list[tuple[str, SemVer, Oid]]:
+        """Return every entry of ``major`` (e.g. all 3.x), prereleases included."""
+        return self._slice((major,), (major + 1,))
+
+    def predecessor(
+        self, version: SemVer, *, stable_only: bool = False
+    ) -> tuple[str, SemVer, Oid] | None:
+        """Return the highest entry strictly below ``version``.
+
+        With ``stable_only``, prereleases are skipped, e.g. the previous
+        release before ``4.2.0`` is ``4.1.x`` rather than ``4.2.0-rc.1``.
+        """
+        i = bisect_left(self._keys, version.sort_key)
+        while i > 0:
+            i -= 1
+            entry = self.entries[i]
+            if not stable_only or not entry[1].prerelease:
+                return entry
+        return None
+
+    def latest_in_major(
+        self, major: int, *, include_prereleases: bool = False
+    ) -> tuple[str, SemVer, Oid] | None:
+        """Return the highest entry of ``major`` (stable unless asked)."""
+        for entry in reversed(self.in_major(major)):
+            if include_prereleases or not entry[1].prerelease:
+                return entry
+        return None
+
+    def prereleases_of(self, version: SemVer) -> list[tuple[str, SemVer, Oid]]:
+        """Return the prereleases of ``version``'s ``X.Y.Z`` in ascending order."""
+        core = (version.major, version.minor, version.patch)
+        return self._slice((*core, 0), (*core, 1))
+
+    def find(self, version: SemVer) -> tuple[str, SemVer, Oid] | None:
+        """Return an entry with the same precedence as ``version``, if any."""
+        i = bisect_left(self._keys, version.sort_key)
+        if i < len(self._keys) and self._keys[i] == version.sort_key:
+            return self.entries[i]
+        return None
+
+    def max(self) -> tuple[str, SemVer] | None:
+        """Return the (name, version) of the highest version, if any."""
+        if not self.entries:
+            return None
+        name, ver, _ = self.entries[-1]
+        return name, ver
+
+    def last_reachable(
+        self, repo: Repository, head_id: Oid
+    ) -> tuple[str, SemVer, Oid] | None:
+        """Return the highest-version entry reachable from ``head_id``.
+
+        Candidates are checked from the highest version down, so the search
+        stops at the first reachable tag instead of testing every tag.
+        """
+        for name, ver, commit_id in reversed(self.entries):
+            if commit_id == head_id or repo.descendant_of(head_id, commit_id):
+                return name, ver, commit_id
+        return None
+
+
+def semver_tag_index(repo: Repository, cache_dir: Path | None = None) -> SemVerTagIndex:
+    """Return a SemVerTagIndex of the repository's release tags.
+
+    Tags are recognized like iter_semver_tags does (optional leading 'v' on
+    the last name component), so one index can answer both the
+    reachable-tail and the global-floor questions that
+    last_reachable_semver_tag and global_max_semver_tag answer separately.
+    Entry names are the full tag names below ``refs/tags/``.
+
+    Refs are read in one pass through a fresh TagResolver. With
+    ``cache_dir``, the commit each tag target peels to is persisted, so later
+    builds only read refs and skip loading tag objects.
+    """
+    doc = load_cache(cache_dir, TAGS_CACHE_NAME)
+    peeled: dict[str, str] = {}
+    if doc is not None and isinstance(doc.get("peeled"), dict):
+        peeled = doc["peeled"]
+    dirty = False
+    entries: list[tuple[str, SemVer, Oid]] = []
+    used: dict[str, str] = {}
+    resolver = TagResolver(repo)
+    for tag_name, (target_id, _) in resolver.tags.items():
+        last = tag_name.rsplit("/", 1)[-1]
+        ver = SemVer.try_parse(last[1:] if last[:1].lower() == "v" else last)
+        if ver is None:
+            continue
+        target = str(target_id)
+        commit_hex = peeled.get(target)
+        if commit_hex is None:
+            commit_hex = str(resolver.peeled_id(tag_name))
+            dirty = True
+        used[target] = commit_hex
+        entries.append((tag_name, ver, Oid(hex=commit_hex)))
+    if cache_dir is not None and (dirty or len(used) != len(peeled)):
+        save_cache(cache_dir, TAGS_CACHE_NAME, {"peeled": used})
+    return SemVerTagIndex("", entries)
+
+
+def build_semver_tag_indexes(
+    repo: Repository, prefixes: Iterable[str]
+) -> dict[str, SemVerTagIndex]:
+    """Build one SemVerTagIndex per tag-name prefix in a single refs pass.
+
+    A tag is added to every index whose prefix it starts with and whose
+    remainder parses as SemVer, so overlapping prefixes are supported.
+    """
+    wanted = list(dict.fromkeys(prefixes))
+    found: dict[str, list[tuple[str, SemVer, Oid]]] = {p: [] for p in wanted}
+    resolver = TagResolver(repo)
+    for tag_name in resolver.tags:
+        commit_id: Oid | None = None
+        for prefix in wanted:
+            if not tag_name.startswith(prefix):
+                continue
+            ver = SemVer.try_parse(tag_name[len(prefix) :])
+            if ver is None:
+                continue
+            if commit_id is None:
+                commit_id = resolver.peeled_id(tag_name)
+            found[prefix].append((tag_name, ver, commit_id))
+    return {p: SemVerTagIndex(p, entries) for p, entries in found.items()}
@@ -0,0 +1,90 @@
+"""Memoized merge-bases shared by all range computations.
+
+The merge-base of two commits only depends on their (immutable) history, so
+results are cached per object database and keyed by the unordered OID pair.
+The cache can be persisted with :mod:`girokmoji.cache` next to the other
+indexes.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from pygit2 import Oid, Repository
+
+from girokmoji.cache import load_cache, save_cache
+
+CACHE_NAME = "merge-bases.json"
+
+
+def _key(a: Oid, b: Oid) -> str:
+    x, y = str(a), str(b)
+    return f"{x}:{y}" if x <= y else f"{y}:{x}"
+
+
+class MergeBaseCache:
+    """OID pair -> merge-base table (None when histories are unrelated)."""
+
+    def __init__(self, bases: dict[str, str | None] | None = None):
+        self._bases: dict[str, str | None] = bases or {}
+        self._dirty = False
+        self._loaded: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._bases)
+
+    def merge_base(self, repo: Repository, a: Oid, b: Oid) -> Oid | None:
+        """Return the merge-base of ``a`` and ``b``, computing it on miss."""
+        key = _key(a, b)
+        try:
+            found = self._bases[key]
+        except KeyError:
+            mb = repo.merge_base(a, b)
+            found = self._bases[key] = None if mb is None else str(mb)
+            self._dirty = True
+        return None if found is None else Oid(hex=found)
+
+    def is_ancestor(self, repo: Repository, ancestor: Oid, commit: Oid) -> bool:
+        """Return True if ``ancestor`` is a proper ancestor of ``commit``.
+
+        Same answer as ``repo.descendant_of(commit, ancestor)``, but served
+        from the memoized merge-base of the pair.
+        """
+        return (
+            ancestor != commit and self.merge_base(repo, commit, ancestor) == ancestor
+        )
+
+    def load(self, cache_dir: Path | None) -> None:
+        """Merge the entries persisted in ``cache_dir`` (once per directory)."""
+        if cache_dir is None or str(cache_dir) in self._loaded:
+            return
+        self._loaded.add(str(cache_dir))
+        doc = load_cache(cache_dir, CACHE_NAME)
+        if doc is None or not isinstance(doc.get("bases"), dict):
+            return
+        for key, value in doc["bases"].items():
+            if isinstance(value, str) or value is None:
+                self._bases.setdefault(str(key), value)
+
+    def save(self, cache_dir: Path | None) -> bool:
+        """Persist the table if it gained entries since the last save."""
+        if not self._dirty:
+            return False
+        saved = save_cache(cache_dir, CACHE_NAME, {"bases": self._bases})
+        if saved:
+            self._dirty = False
+        return saved
+
+
+_CACHES: dict[str, MergeBaseCache] = {}
+
+
+def merge_base_cache(repo: Repository, cache_dir: Path | None = None) -> MergeBaseCache:
+    """Return the MergeBaseCache shared by every Repository opened on the same
+    git directory, with the entries from ``cache_dir`` merged in.
+    """
+    cache = _CACHES.get(repo.path)
+    if cache is None:
+        cache = _CACHES[repo.path] = MergeBaseCache()
+    cache.load(cache_dir)
+    return cache
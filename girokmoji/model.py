@@ -0,0 +1,241 @@
+"""Serializable intermediate model of a classified changelog.
+
+The model is what the renderers consume: for every category, the gitmoji
+groups in first-seen order with their ``(title, commit_hash)`` entries. It can
+be computed once where the repository is available, shipped as an artifact,
+and rendered later with gen_markdown (or girokmoji.formats) on a machine
+without a checkout. Neither this module nor girokmoji.render imports pygit2.
+
+Two encodings carry the same data:
+
+* JSON: ``{"format": "girokmoji-changelog", "version": 1, "categories": [...]}``
+* binary: ``GMCL`` magic, a version byte, then a zlib-compressed stream of
+  varint-length-prefixed strings. Full SHA-1 hex ids are stored as 20 bytes.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from pathlib import Path
+from typing import Iterator
+
+from girokmoji.const import CATEGORY, category_order
+from girokmoji.exception import ModelFormatError
+from girokmoji.render import GroupedEntries, _category_groups
+
+MODEL_FORMAT = "girokmoji-changelog"
+MODEL_VERSION = 1
+BINARY_MAGIC = b"GMCL"
+
+ChangelogModel = dict[CATEGORY, GroupedEntries]
+
+_OID_RAW = 0
+_OID_TEXT = 1
+
+
+def to_model(change) -> ChangelogModel:
+    """Return ``change`` (categorized commits, spilled buckets or a model)
+    as a model whose entries are plain in-memory lists."""
+    return {
+        cat: GroupedEntries(
+            (key, list(entries)) for key, entries in _category_groups(change[cat])
+        )
+        for cat in category_order
+    }
+
+
+def _empty_model() -> ChangelogModel:
+    return {cat: GroupedEntries() for cat in category_order}
+
+
+def _category(name: object) -> CATEGORY:
+    if name not in category_order:
+        raise ModelFormatError(f"Unknown category in changelog model: {name!r}")
+    return name  # type: ignore[return-value]
+
+
+def dump_json(change) -> str:
+    """Serialize ``change`` as a JSON model document."""
+    doc = {
+        "format": MODEL_FORMAT,
+        "version": MODEL_VERSION,
+        "categories": [
+            {
+                "category": cat,
+                "groups": [
+                    {
+                        "emoji": emoji,
+                        "description": description,
+                        "entries": [[title, oid] for title, oid in entries],
+                    }
+                    for (emoji, description), entries in groups
+                ],
+            }
+            for cat, groups in to_model(change).items()
+            if groups
+        ],
+    }
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_json(text: str | bytes) -> ChangelogModel:
+    """Load a model written by dump_json."""
+    try:
+        doc = json.loads(text)
+    except ValueError as exc:
+        raise ModelFormatError(f"Invalid changelog model: {exc}") from exc
+    if not isinstance(doc, dict) or doc.get("format") != MODEL_FORMAT:
+        raise ModelFormatError("Not a girokmoji changelog model")
+    if doc.get("version") != MODEL_VERSION:
+        raise ModelFormatError(
+            f"Unsupported changelog model version: {doc.get('version')!r}"
+        )
+    model = _empty_model()
+    try:
+        for section in doc["categories"]:
+            groups = model[_category(section["category"])]
+            for group in section["groups"]:
+                entries = [(str(title), str(oid)) for title, oid in group["entries"]]
+                groups.append(
+                    ((str(group["emoji"]), str(group["description"])), entries)
+                )
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ModelFormatError(f"Malformed changelog model: {exc!r}") from exc
+    return model
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _text(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return _varint(len(data)) + data
+
+
+def _oid(value: str) -> bytes:
+    if len(value) == 40:
+        try:
+            raw = bytes.fromhex(value)
+        except ValueError:
+            pass
+        else:
+            if raw.hex() == value:
+                return bytes((_OID_RAW,)) + raw
+    return bytes((_OID_TEXT,)) + _text(value)
+
+
+def dump_binary(change) -> bytes:
+    """Serialize ``change`` in the compact binary encoding."""
+    parts: list[bytes] = []
+    sections: list[tuple[CATEGORY, GroupedEntries]] = [
+        (cat, g) for cat, g in to_model(change).items() if g
+    ]
+    parts.append(_varint(len(sections)))
+    for cat, groups in sections:
+        parts.append(_varint(category_order.index(cat)))
+        parts.append(_varint(len(groups)))
+        for (emoji, description), entries in groups:
+            parts.append(_text(emoji))
+            parts.append(_text(description))
+            parts.append(_varint(len(entries)))
+            for title, oid in entries:
+                parts.append(_text(title))
+                parts.append(_oid(oid))
+    return BINARY_MAGIC + bytes((MODEL_VERSION,)) + zlib.compress(b"".join(parts), 9)
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def _take(self, size: int) -> bytes:
+        end = self.pos + size
+        if end > len(self.data):
+            raise ModelFormatError("Truncated changelog model")
+        chunk = self.data[self.pos : end]
+        self.pos = end
+        return chunk
+
+    def varint(self) -> int:
+        value = shift = 0
+        while True:
+            byte = self._take(1)[0]
+            value |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return value
+            shift += 7
+
+    def text(self) -> str:
+        try:
+            return self._take(self.varint()).decode("utf-8")
+        except UnicodeDecodeError as exc:
+            raise ModelFormatError(f"Malformed changelog model: {exc}") from exc
+
+    def oid(self) -> str:
+        kind = self._take(1)[0]
+        if kind == _OID_RAW:
+            return self._take(20).hex()
+        if kind == _OID_TEXT:
+            return self.text()
+        raise ModelFormatError(f"Unknown commit id encoding: {kind}")
+
+    def count(self) -> Iterator[int]:
+        return iter(range(self.varint()))
+
+
+def load_binary(data: bytes) -> ChangelogModel:
+    """Load a model written by dump_binary."""
+    if not data.startswith(BINARY_MAGIC) or len(data) <= len(BINARY_MAGIC):
+        raise ModelFormatError("Not a binary girokmoji changelog model")
+    version = data[len(BINARY_MAGIC)]
+    if version != MODEL_VERSION:
+        raise ModelFormatError(f"Unsupported changelog model version: {version}")
+    try:
+        payload = zlib.decompress(data[len(BINARY_MAGIC) + 1 :])
+    except zlib.error as exc:
+        raise ModelFormatError(f"Corrupt changelog model: {exc}") from exc
+    reader = _Reader(payload)
+    model = _empty_model()
+    for _ in reader.count():
+        index = reader.varint()
+        if index >= len(category_order):
+            raise ModelFormatError(f"Unknown category index in model: {index}")
+        groups = model[category_order[index]]
+        for _ in reader.count():
+            key = (reader.text(), reader.text())
+            entries = [(reader.text(), reader.oid()) for _ in reader.count()]
+            groups.append((key, entries))
+    if reader.pos != len(payload):
+        raise ModelFormatError("Trailing data after changelog model")
+    return model
+
+
+def loads(data: str | bytes) -> ChangelogModel:
+    """Load a model in either encoding, telling them apart by the magic."""
+    if isinstance(data, bytes) and data.startswith(BINARY_MAGIC):
+        return load_binary(data)
+    return load_json(data)
+
+
+def write_model(path: Path, change, *, binary: bool = False) -> None:
+    """Write ``change`` to ``path`` as a JSON (default) or binary model."""
+    if binary:
+        Path(path).write_bytes(dump_binary(change))
+    else:
+        Path(path).write_text(dump_json(change) + "\n", encoding="utf-8")
+
+
+def read_model(path: Path) -> ChangelogModel:
+    """Read a model file written by write_model, in either encoding."""
+    return loads(Path(path).read_bytes())
@@ -0,0 +1,88 @@
+"""Single-pass commit assignment for monorepo packages."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+from pygit2 import Commit, Oid, Repository
+from pygit2.enums import SortMode
+
+from girokmoji.pathindex import ChangedPathsIndex, normalize_prefix, touches
+
+
+@dataclass(frozen=True)
+class PackageSpec:
+    """A monorepo package: a path prefix released under a tag-name prefix."""
+
+    path: str
+    tag_prefix: str
+    name: str
+
+    @classmethod
+    def parse(cls, text: str) -> "PackageSpec":
+        """Parse ``PATH=TAG_PREFIX`` such as ``packages/pkg-a=pkg-a/v*``.
+
+        A trailing ``*`` on the tag prefix is optional. The package name is the
+        tag prefix without its version marker (``pkg-a/v`` -> ``pkg-a``), or
+        the last path component when that leaves nothing.
+        """
+        path, sep, tag_prefix = text.partition("=")
+        if not sep or not tag_prefix.rstrip("*"):
+            raise ValueError(f"Invalid package mapping (expected PATH=TAG): {text}")
+        path = normalize_prefix(path)
+        tag_prefix = tag_prefix.rstrip("*")
+        name = tag_prefix
+        if name.endswith(("v", "V")):
+            name = name[:-1]
+        name = name.rstrip("/-_@")
+        if not name:
+            name = path.rsplit("/", 1)[-1]
+        if not name:
+            raise ValueError(f"Cannot derive a package name from: {text}")
+        return cls(path=path, tag_prefix=tag_prefix, name=name)
+
+
+def assign_commits(
+    repo: Repository,
+    head_id: Oid,
+    packages: Sequence[PackageSpec],
+    tails: Sequence[Oid | None],
+    index: ChangedPathsIndex,
+) -> list[list[Commit]]:
+    """Return, per package, the commits in ``tail..head`` touching its path.
+
+    History is walked once in topological order. Every tail marks itself and,
+    through parent propagation, all of its ancestors as excluded for its
+    package, so each commit's exclusion mask is final by the time it is
+    visited. When every package has a tail, the walk is bounded by their
+    common merge-base. Changed paths are computed at most once per commit.
+    """
+    result: list[list[Commit]] = [[] for _ in packages]
+    if not packages:
+        return result
+    everyone = (1 << len(packages)) - 1
+    excluded: dict[Oid, int] = {}
+    for i, tail in enumerate(tails):
+        if tail is not None:
+            excluded[tail] = excluded.get(tail, 0) | (1 << i)
+
+    walk = repo.walk(head_id, SortMode.TOPOLOGICAL | SortMode.TIME)
+    if tails and all(t is not None for t in tails):
+        unique: list[Oid | str] = list(dict.fromkeys(t for t in tails if t is not None))
+        base = unique[0] if len(unique) == 1 else repo.merge_base_octopus(unique)
+        if base is not None:
+            walk.hide(base)
+
+    for commit in walk:
+        mask = excluded.pop(commit.id, 0)
+        if mask:
+            for parent_id in commit.parent_ids:
+                excluded[parent_id] = excluded.get(parent_id, 0) | mask
+            if mask == everyone:
+                continue
+        paths = index.changed_paths(commit)
+        for i, package in enumerate(packages):
+            if not mask >> i & 1 and touches(paths, package.path):
+                result[i].append(commit)
+    return result
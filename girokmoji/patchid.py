@@ -0,0 +1,110 @@
+"""Collapse duplicate commits, such as hotfixes cherry-picked to two branches.
+
+Two commits are duplicates when they have the same patch-id (the hash of
+their diff, ignoring line numbers and whitespace, as ``git patch-id``), or
+the same gitmoji, title and author. The first commit seen is kept.
+
+Patch-ids need a diff per commit. A cache.CommitIndex computes them in
+parallel and stores them per commit id in ``patch-ids.json`` under
+``cache_dir``.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from pygit2 import Commit
+
+from girokmoji.cache import DEFAULT_WORKERS, CommitIndex
+
+CACHE_NAME = "patch-ids.json"
+
+# Commits without a patch-id (merges, empty commits) are cached as ""
+_NONE = ""
+
+
+def compute_patch_id(commit: Commit) -> str | None:
+    """Return the patch-id of ``commit``, or None for merges and commits that
+    change nothing."""
+    parents = commit.parents
+    if len(parents) > 1:
+        return None
+    if parents:
+        diff = parents[0].tree.diff_to_tree(commit.tree)
+    else:
+        diff = commit.tree.diff_to_tree(swap=True)
+    if not len(diff):
+        return None
+    return str(diff.patchid)
+
+
+class PatchIdIndex(CommitIndex[str]):
+    """Memoized commit id -> patch-id table."""
+
+    CACHE_NAME = CACHE_NAME
+    KEY = "patch_ids"
+    THREAD_NAME = "girokmoji-patch-id"
+
+    @classmethod
+    def _decode(cls, value: Any) -> str | None:
+        return value if isinstance(value, str) else None
+
+    def get(self, commit_id: str) -> str | None:
+        patch_id = self._values.get(commit_id)
+        return patch_id or None
+
+    def compute(
+        self,
+        repo_dir: Path | str,
+        commit_ids: Iterable[str],
+        *,
+        workers: int = DEFAULT_WORKERS,
+    ) -> None:
+        """Compute the patch-ids of ``commit_ids`` missing from the index."""
+
+        def patch_id(commit: Commit) -> str:
+            return compute_patch_id(commit) or _NONE
+
+        missing = (c for c in commit_ids if c not in self._values)
+        self._compute(repo_dir, missing, patch_id, workers)
+
+
+class Deduplicator:
+    """Decide, commit by commit, whether an equivalent one was already seen."""
+
+    def __init__(self, patch_ids: PatchIdIndex | None = None):
+        self.patch_ids = patch_ids
+        self._seen_patches: set[str] = set()
+        self._seen_keys: set[tuple[str, str, Any]] = set()
+        self.dropped: list[str] = []
+
+    def is_duplicate(self, commit: Any, gitmoji: str, title: str) -> bool:
+        """Return True (and remember it in ``dropped``) when ``commit`` repeats
+        an earlier commit; otherwise record it and return False."""
+        commit_id = str(commit.id)
+        author = getattr(commit, "author", None)
+        key = (gitmoji, title, author.email if author is not None else None)
+        patch_id = self.patch_ids.get(commit_id) if self.patch_ids is not None else None
+        if key in self._seen_keys or patch_id in self._seen_patches:
+            self.dropped.append(commit_id)
+            return True
+        self._seen_keys.add(key)
+        if patch_id is not None:
+            self._seen_patches.add(patch_id)
+        return False
+
+
+def deduplicator(
+    repo_dir: Path | str,
+    commits: Sequence[Any],
+    *,
+    cache_dir: Path | None = None,
+    workers: int = DEFAULT_WORKERS,
+) -> Deduplicator:
+    """Return a Deduplicator with the patch-ids of ``commits`` computed
+    (in parallel) and cached."""
+    index = PatchIdIndex.load(cache_dir)
+    index.compute(repo_dir, (str(c.id) for c in commits), workers=workers)
+    index.save(cache_dir)
+    return Deduplicator(index)
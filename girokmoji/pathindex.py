@@ -0,0 +1,141 @@
+"""Changed-paths index used to filter commits by path prefix.
+
+Each commit maps to the sorted tuple of paths it changes. Matching a prefix is
+a bisect into that tuple, so many package filters can be answered for the same
+commit without diffing trees again. The index can be persisted with
+:mod:`girokmoji.cache`; on disk the paths are stored once in a shared path
+table and commits refer to them by position.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from pygit2 import Commit
+
+from girokmoji.cache import load_cache, save_cache
+
+CACHE_NAME = "changed-paths.json"
+
+
+def normalize_prefix(prefix: str) -> str:
+    """Normalize a user supplied path prefix (``./pkg/a/`` -> ``pkg/a``)."""
+    prefix = prefix.strip().replace("\\", "/")
+    while prefix.startswith("./"):
+        prefix = prefix[2:]
+    return prefix.strip("/")
+
+
+def touches(paths: Sequence[str], prefix: str) -> bool:
+    """Return True if any of the sorted ``paths`` is ``prefix`` or below it.
+
+    ``prefix`` must already be normalized. An empty prefix matches any commit
+    that changes at least one path.
+    """
+    if not prefix:
+        return bool(paths)
+    i = bisect_left(paths, prefix)
+    if i < len(paths) and paths[i] == prefix:
+        return True
+    below = prefix + "/"
+    i = bisect_left(paths, below, i)
+    return i < len(paths) and paths[i].startswith(below)
+
+
+def _tree_paths(diff) -> set[str]:
+    res: set[str] = set()
+    for delta in diff.deltas:
+        res.add(delta.old_file.path)
+        res.add(delta.new_file.path)
+    return res
+
+
+def compute_changed_paths(commit: Commit) -> tuple[str, ...]:
+    """Return the sorted paths changed by ``commit``.
+
+    - Root commits report every path of their tree.
+    - Regular commits are diffed against their parent.
+    - Merge commits only report paths that differ from *every* parent, which
+      mirrors git's history simplification for ``git log -- <path>``: changes
+      brought in by a merged branch are attributed to the branch commits.
+    """
+    parents = commit.parents
+    if not parents:
+        return tuple(sorted(_tree_paths(commit.tree.diff_to_tree(swap=True))))
+    changed = _tree_paths(parents[0].tree.diff_to_tree(commit.tree))
+    for parent in parents[1:]:
+        if not changed:
+            break
+        changed &= _tree_paths(parent.tree.diff_to_tree(commit.tree))
+    return tuple(sorted(changed))
+
+
+class ChangedPathsIndex:
+    """Memoized commit -> changed paths table."""
+
+    def __init__(self, commits: dict[str, tuple[str, ...]] | None = None):
+        self._commits: dict[str, tuple[str, ...]] = commits or {}
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._commits)
+
+    @classmethod
+    def load(cls, cache_dir: Path | None) -> "ChangedPathsIndex":
+        """Load the index from ``cache_dir``; return an empty one on miss."""
+        doc = load_cache(cache_dir, CACHE_NAME)
+        if doc is None:
+            return cls()
+        try:
+            table: list[str] = [str(p) for p in doc["paths"]]
+            commits = {
+                oid: tuple(table[i] for i in ids) for oid, ids in doc["commits"].items()
+            }
+        except (KeyError, IndexError, TypeError, AttributeError):
+            return cls()
+        return cls(commits)
+
+    def save(self, cache_dir: Path | None) -> bool:
+        """Persist the index if it changed since it was loaded."""
+        if not self._dirty:
+            return False
+        positions: dict[str, int] = {}
+        for paths in self._commits.values():
+            for path in paths:
+                positions.setdefault(path, 0)
+        table = sorted(positions)
+        for i, path in enumerate(table):
+            positions[path] = i
+        doc = {
+            "paths": table,
+            "commits": {
+                oid: [positions[p] for p in paths]
+                for oid, paths in self._commits.items()
+            },
+        }
+        saved = save_cache(cache_dir, CACHE_NAME, doc)
+        if saved:
+            self._dirty = False
+        return saved
+
+    def changed_paths(self, commit: Commit) -> tuple[str, ...]:
+        """Return the cached changed paths of ``commit``, computing on miss."""
+        key = str(commit.id)
+        paths = self._commits.get(key)
+        if paths is None:
+            paths = compute_changed_paths(commit)
+            self._commits[key] = paths
+            self._dirty = True
+        return paths
+
+    def matching_prefixes(self, commit: Commit, prefixes: Iterable[str]) -> list[str]:
+        """Return the (normalized) prefixes touched by ``commit``."""
+        paths = self.changed_paths(commit)
+        return [p for p in prefixes if touches(paths, p)]
+
+    def touches_any(self, commit: Commit, prefixes: Iterable[str]) -> bool:
+        """Return True if ``commit`` touches at least one of ``prefixes``."""
+        paths = self.changed_paths(commit)
+        return any(touches(paths, p) for p in prefixes)
@@ -0,0 +1,321 @@
+"""Stream GitHub release payloads without building the body in memory.
+
+The payload is the JSON document of changelog.release_payload; here the body
+is escaped and written chunk by chunk as the markdown renderer produces it.
+The output is byte-identical to ``json.dumps(payload, ensure_ascii=False)``.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Iterable, Iterator, TextIO
+
+
+def _json_string_body(text: str) -> str:
+    # The same escaping json.dumps applies, without the surrounding quotes
+    return json.dumps(text, ensure_ascii=False)[1:-1]
+
+
+def strip_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    """Yield ``chunks`` as if their concatenation were ``str.strip()``-ed.
+
+    Only a pending run of whitespace is held back, so the extra memory does
+    not grow with the text.
+    """
+    started = False
+    pending: list[str] = []
+    for chunk in chunks:
+        if not started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                continue
+            started = True
+        body = chunk.rstrip()
+        if body:
+            yield from pending
+            pending.clear()
+            yield body
+        pending.append(chunk[len(body) :])
+
+
+def iter_release_payload(
+    tag_name: str,
+    name: str,
+    body_chunks: Iterable[str],
+    *,
+    draft: bool = False,
+    prerelease: bool = False,
+) -> Iterator[str]:
+    """Yield the JSON payload of changelog.release_payload in chunks."""
+    yield '{"tag_name": '
+    yield json.dumps(tag_name, ensure_ascii=False)
+    yield ', "name": '
+    yield json.dumps(name, ensure_ascii=False)
+    yield ', "body": "'
+    for chunk in body_chunks:
+        yield _json_string_body(chunk)
+    yield '", "draft": '
+    yield json.dumps(draft)
+    yield ', "prerelease": '
+    yield json.dumps(prerelease)
+    yield "}"
+
+
+def write_release_payload(
+    fp: TextIO,
+    tag_name: str,
+    name: str,
+    body_chunks: Iterable[str],
+    *,
+    draft: bool = False,
+    prerelease: bool = False,
+) -> int:
+    """Write the payload to the text stream ``fp`` as the body is rendered,
+    and return the length of the body."""
+    body_size = 0
+
+    def counted() -> Iterator[str]:
+        nonlocal body_size
+        for chunk in body_chunks:
+            body_size += len(chunk)
+            yield chunk
+
+    for chunk in iter_release_payload(
+        tag_name, name, counted(), draft=draft, prerelease=prerelease
+    ):
+        fp.write(chunk)
+    return body_size
+
+
+GITHUB_BODY_LIMIT = 125_000
+OVERFLOW_MODES = ("split", "truncate")
+
+# Room kept free for the continuation note or the truncation summary
+_FOOTER_RESERVE = 200
+
+
+@dataclass(slots=True)
+class _Group:
+    """A buffered group: leading separator/category chunks, the group header
+    (``texts[head - 1]``) and its entries, with the header of the category
+    it belongs to."""
+
+    texts: list[str]
+    head: int
+    size: int
+    has_category: bool
+    category: str
+
+
+class _BodyFitter:
+    """Cut a stream of iter_markdown_parts chunks into bodies of at most
+    ``limit`` characters, preferring group and category boundaries.
+
+    Sizes are summed from the chunk lengths as they arrive; nothing is
+    rendered twice. A group is buffered until it is complete, so that it can
+    move to the next body as a whole. Groups are placed while the body stays
+    ``_FOOTER_RESERVE`` below the limit; past that they are held back until
+    it is clear whether the remaining notes still fit as they are.
+    """
+
+    def __init__(self, mode: str, limit: int, title: str):
+        if mode not in OVERFLOW_MODES:
+            raise ValueError(f"Unknown overflow mode: {mode}")
+        if limit <= 2 * _FOOTER_RESERVE:
+            raise ValueError(f"Body limit is too small: {limit}")
+        self.mode = mode
+        self.limit = limit
+        self.budget = limit - _FOOTER_RESERVE
+        self.title = title
+        self.number = 1
+        self.finished: list[str] = []
+        self.body: list[str] = []
+        self.size = 0
+        self.lead: list[str] = []
+        self.lead_has_category = False
+        self.category = ""
+        self.group: _Group | None = None
+        self.held: list[_Group] | None = None
+        self.held_size = 0
+        self.truncated = False
+        self.omitted = 0
+
+    def feed(self, kind: str, text: str) -> None:
+        if kind == "entry":
+            if self.group is not None:
+                self.group.texts.append(text)
+                self.group.size += len(text)
+        elif kind == "group":
+            self._end_group()
+            texts = [*self.lead, text]
+            self.group = _Group(
+                texts,
+                len(texts),
+                sum(map(len, texts)),
+                self.lead_has_category,
+                self.category,
+            )
+            self.lead = []
+            self.lead_has_category = False
+        elif kind in ("category", "separator"):
+            self._end_group()
+            self.lead.append(text)
+            if kind == "category":
+                self.category = text
+                self.lead_has_category = True
+        else:
+            self._emit(text)
+
+    def close(self) -> str:
+        """Place what is left and return the last body."""
+        self._end_group()
+        trailer = "".join(self.lead)
+        if self.held is not None:
+            rest = self.size + self.held_size + len(trailer)
+            if (
+                rest - self._whitespace(trailer or self.held[-1].texts[-1])
+                <= self.limit
+            ):
+                # Everything left fits after all
+                for group in self.held:
+                    for text in group.texts:
+                        self._emit(text)
+                self.held = None
+                self._emit(trailer)
+                return "".join(self.body).strip()
+            self._release()
+        size = self.size + len(trailer)
+        if self.number == 1 and not self.truncated:
+            # Nothing was cut, so the notes are whole if they fit the limit
+            fits = size - self._whitespace(trailer) <= self.limit
+        else:
+            fits = not self.truncated and size <= self.budget
+        if fits:
+            self._emit(trailer)
+        body = "".join(self.body).strip()
+        if self.truncated:
+            body += (
+                f"\n\n_… {self.omitted} more entries omitted: the notes exceed "
+                f"GitHub's {self.limit}-character release body limit._"
+            )
+        return body
+
+    def _whitespace(self, last: str) -> int:
+        """Characters that strip() would remove from the body so far if
+        ``last`` were its final chunk."""
+        first = self.body[0] if self.body else ""
+        return len(first) - len(first.lstrip()) + len(last) - len(last.rstrip())
+
+    def _emit(self, text: str) -> None:
+        self.body.append(text)
+        self.size += len(text)
+
+    def _end_group(self) -> None:
+        group, self.group = self.group, None
+        if group is None:
+            return
+        if self.held is not None:
+            self.held.append(group)
+            self.held_size += group.size
+            stripped = self.size + self.held_size - self._whitespace(group.texts[-1])
+            if stripped > self.limit:
+                self._release()
+            return
+        size = self.size + group.size
+        if self.truncated or size <= self.budget:
+            self._place(group)
+        elif size - self._whitespace(group.texts[-1]) <= self.limit:
+            # Past the budget but within the limit: it depends on what follows
+            self.held = [group]
+            self.held_size = group.size
+        else:
+            self._place(group)
+
+    def _release(self) -> None:
+        held, self.held = self.held or [], None
+        self.held_size = 0
+        for group in held:
+            self._place(group)
+
+    def _next_body(self, category: str | None) -> None:
+        # ``category`` is repeated at the top of the new body, when given
+        self.number += 1
+        self.finished.append(
+            "".join(self.body).strip() + f"\n\n_Continued in part {self.number}._"
+        )
+        self.body = []
+        self.size = 0
+        self._emit(f"# {self.title} (continued, part {self.number})\n\n")
+        if category is not None:
+            self._emit(category)
+
+    def _overhead(self, group: _Group) -> int:
+        # Size of a fresh continuation body before ``group``
+        header = len(f"# {self.title} (continued, part {self.number + 1})\n\n")
+        return header + (0 if group.has_category else len(group.category))
+
+    def _place(self, group: _Group) -> None:
+        texts, head = group.texts, group.head
+        if self.truncated:
+            self.omitted += len(texts) - head
+            return
+        if self.size + group.size <= self.budget:
+            for text in texts:
+                self._emit(text)
+            return
+        if self._overhead(group) + group.size <= self.budget:
+            # Cut at the group boundary
+            if self.mode == "truncate":
+                self.truncated = True
+                self.omitted += len(texts) - head
+                return
+            self._next_body(None if group.has_category else group.category)
+            for text in texts:
+                self._emit(text)
+            return
+        # The group is too large for any body: cut between its entries
+        lead = "".join(texts[:head])
+        for index, entry in enumerate(texts[head:]):
+            if self.size + len(lead) + len(entry) > self.budget:
+                if self.mode == "truncate":
+                    self.truncated = True
+                    self.omitted += len(texts) - head - index
+                    return
+                self._next_body(group.category)
+                lead = texts[head - 1]
+            if lead:
+                self._emit(lead)
+                lead = ""
+            if self.size + len(entry) > self.budget:
+                # A single entry larger than a body
+                entry = entry[: max(self.budget - self.size - 2, 0)] + "…\n"
+            self._emit(entry)
+
+
+def fit_bodies(
+    parts: Iterable[tuple[str, str]],
+    *,
+    mode: str,
+    title: str,
+    limit: int = GITHUB_BODY_LIMIT,
+) -> Iterator[str]:
+    """Yield the stripped release body, cut to at most ``limit`` characters.
+
+    ``parts`` are the ``(kind, text)`` chunks of render.iter_markdown_parts.
+    Notes that fit are yielded whole, exactly as change_log renders them.
+    Otherwise ``mode`` "split" yields the main body followed by continuation
+    bodies headed ``# <title> (continued, part N)``, cut between groups or
+    categories; "truncate" yields one body ending with a summary of what was
+    left out.
+    """
+    fitter = _BodyFitter(mode, limit, title)
+    for kind, text in parts:
+        fitter.feed(kind, text)
+        if fitter.finished:
+            yield from fitter.finished
+            fitter.finished.clear()
+    last = fitter.close()
+    # Held groups placed while closing may have finished more bodies
+    yield from fitter.finished
+    yield last
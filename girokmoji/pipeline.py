@@ -0,0 +1,92 @@
+"""Run a producer (the revwalk) on a thread, overlapped with its consumer.
+
+pygit2 releases the GIL while it reads objects from the object database, so
+walking history on a worker thread lets the main thread classify commits
+that were already read. Items cross a bounded queue in batches to keep the
+locking overhead and the memory in flight small.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_BATCH_SIZE = 256
+
+_DONE = object()
+
+
+class _Failure:
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def _put(q: queue.Queue, item: object, stop: threading.Event) -> bool:
+    """Put ``item`` unless the consumer went away; return False if it did."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def prefetch(
+    source: Iterable[T],
+    convert: Callable[[T], U],
+    *,
+    maxsize: int = DEFAULT_QUEUE_SIZE,
+    batch: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[U]:
+    """Yield ``convert(item)`` for every item of ``source``, in order.
+
+    ``source`` is iterated and converted on a worker thread that runs at
+    most ``maxsize`` batches of ``batch`` items ahead. The worker must be the
+    only user of the objects ``source`` touches (e.g. the Repository); only
+    the converted values are handed over. Exceptions raised by the worker
+    are re-raised here, and closing this iterator early stops the worker.
+    """
+    q: queue.Queue = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def produce() -> None:
+        iterator = iter(source)
+        try:
+            chunk: list[U] = []
+            for item in iterator:
+                chunk.append(convert(item))
+                if len(chunk) >= batch:
+                    if not _put(q, chunk, stop):
+                        return
+                    chunk = []
+            if chunk and not _put(q, chunk, stop):
+                return
+            _put(q, _DONE, stop)
+        except BaseException as exc:
+            _put(q, _Failure(exc), stop)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    worker = threading.Thread(target=produce, name="girokmoji-walk", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.exc
+            yield from item
+    finally:
+        stop.set()
+        worker.join()
@@ -1,17 +1,234 @@
 from __future__ import annotations
 
+import sys
+from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
+from typing import Sequence
 
-from pygit2 import Repository, discover_repository, Signature, GitError
+from pygit2 import Commit, Oid, Repository, discover_repository, Signature, GitError
 from pygit2.enums import ObjectType
 
-from .changelog import change_log, github_release_payload
+from .changelog import (
+    BumpInference,
+    CommitLike,
+    gen_markdown,
+    release_payload,
+    structured_changelog,
+    write_stats,
+)
 from .semver import SemVer
-from .git import last_reachable_semver_tag, global_max_semver_tag
+from .const import CATEGORY
+from .git import (
+    SemVerTagIndex,
+    build_semver_tag_indexes,
+    forget_tag_resolver,
+    semver_tag_index,
+    walk_range,
+)
+from .monorepo import PackageSpec, assign_commits
+from .pathindex import ChangedPathsIndex
 
 
 SUPPORTED_BUMPS = {"patch", "minor", "major"}
+# Infer the bump from the gitmoji of the released commits
+AUTO_BUMP = "auto"
+# Annotated tag message: the tag name, or the full rendered notes
+TAG_MESSAGES = {"version", "notes"}
+
+
+def _release_signature(repo: Repository) -> Signature:
+    try:
+        sig = repo.default_signature
+    except KeyError:
+        sig = None
+    return sig or Signature("girokmoji", "release@girokmoji")
+
+
+def _create_tag(
+    repo: Repository,
+    name: str,
+    target: Oid,
+    on_tag_exists: str,
+    message: str | None = None,
+) -> None:
+    """Create annotated tag ``name`` at ``target`` honoring ``on_tag_exists``.
+
+    The tag message defaults to the tag name.
+    """
+    sig = _release_signature(repo)
+    if message is None:
+        message = name
+    # The tag table read by this Repository is about to change
+    forget_tag_resolver(repo)
+    try:
+        repo.create_tag(name, target, ObjectType.COMMIT, sig, message)
+    except (GitError, ValueError) as e:
+        if on_tag_exists == "skip":
+            # Proceed without creating the tag again
+            pass
+        elif on_tag_exists == "overwrite":
+            # Delete and recreate the tag
+            try:
+                repo.references.delete(f"refs/tags/{name}")
+            except Exception:
+                # If deletion fails, re-raise original error
+                raise e
+            repo.create_tag(name, target, ObjectType.COMMIT, sig, message)
+        else:
+            # Default strict behavior
+            raise
+
+
+def _select_base(
+    repo: Repository,
+    tag_index: SemVerTagIndex,
+    head_id: Oid,
+    version_floor_scope: str,
+) -> tuple[tuple[str, SemVer, Oid] | None, SemVer]:
+    """Return the reachable tail tag entry and the version to bump from.
+
+    The bump baseline is the last reachable version, raised to the global
+    maximum of ``tag_index`` when ``version_floor_scope`` is ``global``.
+    """
+    if version_floor_scope not in {"global", "reachable"}:
+        raise ValueError(f"Unsupported version_floor_scope: {version_floor_scope}")
+    lr = tag_index.last_reachable(repo, head_id)
+    base = lr[1] if lr is not None else SemVer(0, 0, 0)
+    if version_floor_scope == "global":
+        gm = tag_index.max()
+        if gm is not None and gm[1] > base:
+            base = gm[1]
+    return lr, base
+
+
+@dataclass(frozen=True)
+class ReleasePlan:
+    """The next release, computed without writing any ref.
+
+    ``change`` holds the classified commits of ``tail..HEAD`` so the notes
+    for the (virtual) ``new_tag`` at HEAD can be rendered without walking
+    history again.
+    """
+
+    tail_tag: str | None
+    tail_id: Oid | None
+    head_id: Oid
+    base_version: SemVer
+    bump: str
+    new_version: SemVer
+    new_tag: str
+    change: dict[CATEGORY, list[CommitLike]]
+    inference: BumpInference
+
+    def markdown(self, project_name: str, release_date: str) -> str:
+        """Render the release notes."""
+        return gen_markdown(
+            project_name, self.new_tag, release_date, self.change
+        ).strip()
+
+    def github_payload(
+        self,
+        project_name: str,
+        release_date: str,
+        *,
+        draft: bool = False,
+        prerelease: bool = False,
+    ) -> str:
+        """Render the GitHub release payload JSON."""
+        return release_payload(
+            self.new_tag,
+            self.new_tag,
+            self.markdown(project_name, release_date),
+            draft=draft,
+            prerelease=prerelease,
+        )
+
+
+def _plan_release(
+    repo: Repository,
+    *,
+    bump: str,
+    range_mode: str,
+    strict_ancestor: bool,
+    quiet: bool,
+    verbose: bool,
+    sorting: int | None,
+    version_floor_scope: str,
+    paths: Sequence[str] | None,
+    cache_dir: Path | None,
+) -> ReleasePlan:
+    if bump not in SUPPORTED_BUMPS and bump != AUTO_BUMP:
+        raise ValueError(f"Unsupported bump value: {bump}")
+    head_commit = repo.head.peel(ObjectType.COMMIT)
+    lr, base = _select_base(
+        repo, semver_tag_index(repo, cache_dir), head_commit.id, version_floor_scope
+    )
+    tail_commit = repo[lr[2]].peel(ObjectType.COMMIT) if lr is not None else None
+
+    inference = BumpInference()
+    commits = walk_range(
+        repo,
+        head_commit,
+        tail_commit,
+        range_mode=range_mode,
+        strict_ancestor=strict_ancestor,
+        quiet=quiet,
+        verbose=verbose,
+        sorting=sorting,
+        paths=paths,
+        cache_dir=cache_dir,
+        tail_name=lr[0] if lr is not None else "tail",
+        head_name="HEAD",
+    )
+    change = structured_changelog(commits, bump=inference)
+    chosen = inference.resolve() if bump == AUTO_BUMP else bump
+    new_version = base.bump(chosen)
+    return ReleasePlan(
+        tail_tag=lr[0] if lr is not None else None,
+        tail_id=lr[2] if lr is not None else None,
+        head_id=head_commit.id,
+        base_version=base,
+        bump=chosen,
+        new_version=new_version,
+        new_tag=f"v{new_version}",
+        change=change,
+        inference=inference,
+    )
+
+
+def plan_release(
+    repo_dir: Path = Path("."),
+    *,
+    bump: str = "patch",
+    range_mode: str = "auto",
+    strict_ancestor: bool = False,
+    quiet: bool = False,
+    verbose: bool = False,
+    sorting: int | None = None,
+    version_floor_scope: str = "global",
+    paths: Sequence[str] | None = None,
+    cache_dir: Path | None = None,
+) -> ReleasePlan:
+    """Compute the next release without creating a tag.
+
+    The tail tag and the bump baseline come from one shared SemVer tag index,
+    and ``tail..HEAD`` is walked once. No ref is written, so this works on
+    read-only or shared-object checkouts.
+    """
+    repo = Repository(discover_repository(str(repo_dir)))
+    return _plan_release(
+        repo,
+        bump=bump,
+        range_mode=range_mode,
+        strict_ancestor=strict_ancestor,
+        quiet=quiet,
+        verbose=verbose,
+        sorting=sorting,
+        version_floor_scope=version_floor_scope,
+        paths=paths,
+        cache_dir=cache_dir,
+    )
 
 
 def auto_release(
@@ -29,96 +246,145 @@ def auto_release(
     verbose: bool = False,
     sorting: int | None = None,
     version_floor_scope: str = "global",
+    paths: Sequence[str] | None = None,
+    cache_dir: Path | None = None,
+    stats: bool = False,
+    dry_run: bool = False,
+    tag_message: str = "version",
 ) -> str:
     """Bump version using SemVer and return release notes.
 
     Parameters are similar to the GitHub Actions workflow. ``bump`` can be
-    ``patch``, ``minor`` or ``major``.
+    ``patch``, ``minor``, ``major`` or ``auto``; ``auto`` picks the strongest
+    bump implied by the released commits' gitmoji (``patch`` if none does).
+    ``paths`` limits the notes to commits touching the given path prefixes.
+    ``stats`` writes commit counts and the bump decision to stderr.
+    ``dry_run`` renders the notes for the next tag without creating it.
+    ``tag_message`` is ``version`` (the tag name, default) or ``notes`` to
+    store the rendered release notes in the annotated tag.
     """
-    if bump not in SUPPORTED_BUMPS:
+    if bump not in SUPPORTED_BUMPS and bump != AUTO_BUMP:
         raise ValueError(f"Unsupported bump value: {bump}")
+    if tag_message not in TAG_MESSAGES:
+        raise ValueError(f"Unsupported tag_message: {tag_message}")
 
     if release_date is None:
         release_date = date.today().isoformat()
 
     repo = Repository(discover_repository(str(repo_dir)))
-    # Determine head commit as Commit object
-    head_commit = repo.head.peel(ObjectType.COMMIT)
-
-    # Determine last reachable SemVer tag from HEAD
-    lr = last_reachable_semver_tag(repo, head_commit)
-    if lr is not None:
-        last_reachable_version = lr[1]
-        # Normalize last_tag to have leading 'v'
-        last_tag = f"v{last_reachable_version}"
-    else:
-        last_reachable_version = SemVer(0, 0, 0)
-        last_tag = "v0.0.0"
-
-    # Determine global maximum SemVer tag (for hotpatch floor)
-    gm = global_max_semver_tag(repo)
-    global_max_version = gm[1] if gm is not None else SemVer(0, 0, 0)
-
-    # Compute base for bump
-    if version_floor_scope not in {"global", "reachable"}:
-        raise ValueError(f"Unsupported version_floor_scope: {version_floor_scope}")
-    base_for_bump = (
-        global_max_version
-        if version_floor_scope == "global"
-        and global_max_version > last_reachable_version
-        else last_reachable_version
-    )
 
-    new_version = base_for_bump.bump(bump)
-    new_tag = f"v{new_version}"
-
-    try:
-        sig = repo.default_signature
-    except KeyError:
-        sig = None
-    sig = sig or Signature("girokmoji", "release@girokmoji")
-    try:
-        repo.create_tag(new_tag, repo.head.target, ObjectType.COMMIT, sig, new_tag)
-    except (GitError, ValueError) as e:
-        if on_tag_exists == "skip":
-            # Proceed without creating the tag again
-            pass
-        elif on_tag_exists == "overwrite":
-            # Delete and recreate the tag
-            try:
-                repo.references.delete(f"refs/tags/{new_tag}")
-            except Exception:
-                # If deletion fails, re-raise original error
-                raise e
-            repo.create_tag(new_tag, repo.head.target, ObjectType.COMMIT, sig, new_tag)
-        else:
-            # Default strict behavior
-            raise
-
-    if github_payload:
-        return github_release_payload(
-            project_name=project_name,
-            release_date=release_date,
-            repo_dir=repo_dir,
-            tail_tag=last_tag,
-            head_tag=new_tag,
-            version=new_tag,
-            range_mode=range_mode,
-            strict_ancestor=strict_ancestor,
-            quiet=quiet,
-            verbose=verbose,
-            sorting=sorting,
-        )
-    return change_log(
-        project_name=project_name,
-        release_date=release_date,
-        repo_dir=repo_dir,
-        tail_tag=last_tag,
-        head_tag=new_tag,
-        version=new_tag,
+    # Classify tail..HEAD once; the tag, its message, the markdown and the
+    # payload are all derived from this single walk.
+    plan = _plan_release(
+        repo,
+        bump=bump,
         range_mode=range_mode,
         strict_ancestor=strict_ancestor,
         quiet=quiet,
         verbose=verbose,
         sorting=sorting,
+        version_floor_scope=version_floor_scope,
+        paths=paths,
+        cache_dir=cache_dir,
     )
+    notes = plan.markdown(project_name, release_date)
+    if not dry_run:
+        message = notes if tag_message == "notes" else plan.new_tag
+        _create_tag(repo, plan.new_tag, plan.head_id, on_tag_exists, message)
+    if stats:
+        write_stats(plan.change, plan.inference, chosen_bump=plan.bump)
+    if github_payload:
+        return release_payload(plan.new_tag, plan.new_tag, notes)
+    return notes
+
+
+def release_many(
+    packages: Sequence[PackageSpec | str],
+    repo_dir: Path = Path("."),
+    *,
+    bump: str = "patch",
+    release_date: str | None = None,
+    github_payload: bool = False,
+    on_tag_exists: str = "error",
+    version_floor_scope: str = "global",
+    cache_dir: Path | None = None,
+    stats: bool = False,
+    tag_message: str = "version",
+) -> dict[str, str]:
+    """Release several monorepo packages from a single history walk.
+
+    Each package is a ``PATH=TAG_PREFIX`` mapping (or a PackageSpec). Its tail
+    is the highest SemVer tag with that prefix reachable from HEAD, and its
+    notes cover the commits in ``tail..HEAD`` touching its path. With
+    ``bump="auto"`` every package gets the bump implied by its own commits.
+    Packages without such commits are not tagged. Returns package name -> markdown
+    notes, or GitHub payload JSON when ``github_payload`` is set.
+    """
+    if bump not in SUPPORTED_BUMPS and bump != AUTO_BUMP:
+        raise ValueError(f"Unsupported bump value: {bump}")
+    if tag_message not in TAG_MESSAGES:
+        raise ValueError(f"Unsupported tag_message: {tag_message}")
+
+    specs = [
+        p if isinstance(p, PackageSpec) else PackageSpec.parse(p) for p in packages
+    ]
+    names = [spec.name for spec in specs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate package names: {names}")
+
+    if release_date is None:
+        release_date = date.today().isoformat()
+
+    repo = Repository(discover_repository(str(repo_dir)))
+    head_id = repo.head.peel(Commit).id
+    tag_indexes = build_semver_tag_indexes(repo, [s.tag_prefix for s in specs])
+
+    tails: list[Oid | None] = []
+    bases: list[SemVer] = []
+    for spec in specs:
+        lr, base = _select_base(
+            repo, tag_indexes[spec.tag_prefix], head_id, version_floor_scope
+        )
+        tails.append(lr[2] if lr is not None else None)
+        bases.append(base)
+
+    index = ChangedPathsIndex.load(cache_dir)
+    try:
+        assigned = assign_commits(repo, head_id, specs, tails, index)
+    finally:
+        index.save(cache_dir)
+
+    # Render every package before creating any tag, so that a failure
+    # leaves the repository untouched
+    notes: dict[str, str] = {}
+    tags: list[tuple[str, str]] = []
+    for spec, base, commits in zip(specs, bases, assigned):
+        if not commits:
+            continue
+        inference = BumpInference()
+        change = structured_changelog(commits, bump=inference)
+        chosen = inference.resolve() if bump == AUTO_BUMP else bump
+        new_tag = f"{spec.tag_prefix}{base.bump(chosen)}"
+        markdown = gen_markdown(spec.name, new_tag, release_date, change).strip()
+        tags.append((new_tag, markdown if tag_message == "notes" else new_tag))
+        if stats:
+            sys.stderr.write(f"[girokmoji] stats: package {spec.name} -> {new_tag}\n")
+            write_stats(change, inference, chosen_bump=chosen)
+        notes[spec.name] = (
+            release_payload(new_tag, new_tag, markdown) if github_payload else markdown
+        )
+
+    created: list[str] = []
+    try:
+        for new_tag, message in tags:
+            existed = f"refs/tags/{new_tag}" in repo.references
+            _create_tag(repo, new_tag, head_id, on_tag_exists, message)
+            if not existed:
+                created.append(new_tag)
+    except Exception:
+        # Do not leave the packages tagged before the failure behind
+        for new_tag in created:
+            repo.references.delete(f"refs/tags/{new_tag}")
+        forget_tag_resolver(repo)
+        raise
+    return notes
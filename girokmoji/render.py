@@ -0,0 +1,359 @@
+"""Render grouped changelog entries as markdown.
+
+This module does not depend on pygit2: it renders anything that looks like
+a commit (CommitLike), spilled buckets, and the pre-grouped entries of a
+loaded girokmoji.model, so notes can be re-rendered without a checkout.
+"""
+
+import sys
+from typing import Any, Callable, Iterable, Iterator, Protocol, runtime_checkable
+
+from girokmoji import template
+
+from girokmoji.catgitmoji import any_to_catmoji, by_gitmoji
+from girokmoji.const import CATEGORY, CATEGORY_SUBTEXTS, category_order
+from girokmoji.exception import (
+    MessageDoesNotStartWithGitmojiError,
+    NoSuchGitmojiSupportedError,
+)
+from girokmoji.spill import SpillBucket
+from girokmoji.templatedir import TemplateSet
+from girokmoji.summary import Contributor, ReleaseSummary
+
+
+@runtime_checkable
+class CommitLike(Protocol):
+    @property
+    def message(self) -> str | None: ...
+
+    @property
+    def raw_message(self) -> bytes: ...
+
+    @property
+    def message_encoding(self) -> str: ...
+
+    @property
+    def id(self) -> Any: ...
+
+
+def commit_message(commit: CommitLike) -> str:
+    if isinstance(commit.message, str):
+        return commit.message
+
+    return commit.raw_message.decode(commit.message_encoding)
+
+
+def first_line(msg: str) -> str:
+    """Return the first line of ``msg`` without splitting the whole body."""
+    end = msg.find("\n")
+    return msg if end < 0 else msg[:end]
+
+
+def sep_gitmoji_msg_title(msg: str, *, strict: bool = False) -> tuple[str, str]:
+    """Return gitmoji and message from commit message. Strict mode raises exception MessageDoesNotStartWithGitmojiError"""
+    msg = first_line(msg)
+    for gitmoji in by_gitmoji():
+        if msg.startswith(gitmoji):
+            return gitmoji, msg.removeprefix(gitmoji).strip(" ")
+
+    if not strict:
+        return "", msg
+
+    raise MessageDoesNotStartWithGitmojiError
+
+
+def _entry_group(msg: str) -> tuple[tuple[str, str] | None, str]:
+    """Return the ``(emoji, description)`` group ``msg`` renders under, and
+    its title. The group is None for messages that are not rendered.
+    """
+    gitmoji, title = sep_gitmoji_msg_title(msg)
+    if not gitmoji:
+        # Ignore commits without a recognizable gitmoji
+        return None, title
+    try:
+        catmoji = any_to_catmoji(gitmoji)
+    except NoSuchGitmojiSupportedError:
+        # Skip unsupported gitmoji rather than error out
+        return None, title
+    return (catmoji.emoji, catmoji.description), title
+
+
+class GroupedEntries(list):
+    """One category's entries grouped by gitmoji, groups in first-seen order:
+    ``[((emoji, description), [(title, commit_hash), ...]), ...]``."""
+
+
+def group_change(
+    change: dict[CATEGORY, list[CommitLike]] | dict[CATEGORY, SpillBucket],
+) -> dict[CATEGORY, GroupedEntries] | dict[CATEGORY, SpillBucket]:
+    """Group every category once, so that several renderings share the
+    result. Spilled buckets are grouped already and are returned as is."""
+    grouped: dict = {}
+    for cat in category_order:
+        items = change[cat]
+        if isinstance(items, (GroupedEntries, SpillBucket)):
+            grouped[cat] = items
+        else:
+            grouped[cat] = GroupedEntries(
+                (key, list(entries)) for key, entries in _category_groups(items)
+            )
+    return grouped
+
+
+def _category_groups(
+    items: Iterable[CommitLike],
+) -> Iterable[tuple[tuple[str, str], Iterable[tuple[str, str]]]]:
+    """Yield each gitmoji group of a category with its ``(title, hash)``
+    entries, groups in first-seen order."""
+    if isinstance(items, GroupedEntries):
+        yield from items
+        return
+    if isinstance(items, SpillBucket):
+        # Already grouped while classifying; stream the groups back
+        for key, records in items.groups():
+            if key is not None:
+                yield key, ((_entry_group(r.message)[1], str(r.id)) for r in records)
+        return
+    subcats: dict[tuple[str, str], list[tuple[str, str]]] = {}
+    for commit in items:
+        key, title = _entry_group(commit_message(commit))
+        if key is not None:
+            subcats.setdefault(key, []).append((title, str(commit.id)))
+    yield from subcats.items()
+
+
+# Kinds of the chunks yielded by iter_markdown_parts. The Contributors and
+# Statistics sections come as a category with one header-less group.
+PART_KINDS = ("head", "separator", "category", "group", "entry")
+
+SECTION_SUBTEXTS = {
+    "Contributors": "Thanks to everyone who made this release happen!",
+    "Statistics": "This release in numbers.",
+}
+
+# Template classes looked up when rendering, so rebinding them in
+# girokmoji.template (or, as before rendering moved here, in
+# girokmoji.changelog) takes effect
+_TEMPLATE_NAMES = (
+    "HEAD",
+    "SEPARATOR",
+    "CATEGORY_SECTION",
+    "ENTRY_GROUP_HEADER",
+    "ENTRY_SUBITEM",
+    "CONTRIBUTOR_ITEM",
+    "STATISTIC_ITEM",
+)
+_DEFAULT_TEMPLATES = {name: getattr(template, name) for name in _TEMPLATE_NAMES}
+
+
+def _template_class(name: str) -> Any:
+    cls = getattr(template, name)
+    changelog = sys.modules.get("girokmoji.changelog")
+    override = getattr(changelog, name, cls)
+    return cls if override is _DEFAULT_TEMPLATES[name] else override
+
+
+_HEAD_SUBTEXT = """
+_"Change is always thrilling!"_  
+_(And sometimes a little confusing.)_
+    """
+
+
+def gen_markdown(
+    project_name: str,
+    version: str,
+    release_date: str,
+    change: dict[CATEGORY, list[CommitLike]]
+    | dict[CATEGORY, SpillBucket]
+    | dict[CATEGORY, GroupedEntries],
+    *,
+    templates: TemplateSet | None = None,
+    summary: ReleaseSummary | None = None,
+):
+    return "".join(
+        iter_markdown(
+            project_name,
+            version,
+            release_date,
+            change,
+            templates=templates,
+            summary=summary,
+        )
+    )
+
+
+def iter_markdown(
+    project_name: str,
+    version: str,
+    release_date: str,
+    change: dict[CATEGORY, list[CommitLike]]
+    | dict[CATEGORY, SpillBucket]
+    | dict[CATEGORY, GroupedEntries],
+    *,
+    templates: TemplateSet | None = None,
+    summary: ReleaseSummary | None = None,
+) -> Iterator[str]:
+    """Yield the markdown of gen_markdown in chunks (a header or an entry at
+    a time), so that writers can stream it without holding the whole text."""
+    for _, text in iter_markdown_parts(
+        project_name,
+        version,
+        release_date,
+        change,
+        templates=templates,
+        summary=summary,
+    ):
+        yield text
+
+
+def iter_markdown_parts(
+    project_name: str,
+    version: str,
+    release_date: str,
+    change: dict[CATEGORY, list[CommitLike]]
+    | dict[CATEGORY, SpillBucket]
+    | dict[CATEGORY, GroupedEntries],
+    *,
+    templates: TemplateSet | None = None,
+    summary: ReleaseSummary | None = None,
+) -> Iterator[tuple[str, str]]:
+    """Like iter_markdown, but yield ``(kind, text)`` pairs where kind is one
+    of PART_KINDS, so that callers can cut the notes at section boundaries.
+
+    ``summary`` adds its Contributors and Statistics sections at the end.
+    """
+    if templates is not None:
+        yield from _iter_markdown_compiled(
+            project_name, version, release_date, change, templates
+        )
+        if summary is not None:
+            yield from _summary_parts(
+                summary,
+                templates.separator({}),
+                lambda title: templates.category(
+                    {"category": title, "subtext": SECTION_SUBTEXTS[title]}
+                ),
+                lambda c: templates.contributor(
+                    {"name": c.name, "email": c.email, "commits": str(c.commits)}
+                ),
+                lambda label, value: templates.statistic(
+                    {"label": label, "value": value}
+                ),
+            )
+        return
+
+    HEAD = _template_class("HEAD")
+    SEPARATOR = _template_class("SEPARATOR")
+    CATEGORY_SECTION = _template_class("CATEGORY_SECTION")
+    ENTRY_GROUP_HEADER = _template_class("ENTRY_GROUP_HEADER")
+    ENTRY_SUBITEM = _template_class("ENTRY_SUBITEM")
+    separator = SEPARATOR().markdown
+    yield (
+        "head",
+        HEAD(
+            project_name=project_name,
+            version=version,
+            subtext=_HEAD_SUBTEXT,
+            release_date=release_date,
+        ).markdown,
+    )
+    yield "separator", separator
+
+    # Iterate categories in a deterministic, user-facing priority order
+    for cat in category_order:
+        empty = True
+        for (emoji, description), items in _category_groups(change[cat]):
+            if empty:
+                yield "category", CATEGORY_SECTION(cat, CATEGORY_SUBTEXTS[cat]).markdown
+                empty = False
+            yield (
+                "group",
+                ENTRY_GROUP_HEADER(
+                    emoji=emoji,
+                    gitmoji_description=description,
+                ).markdown,
+            )
+            for title, commit_hash in items:
+                yield (
+                    "entry",
+                    ENTRY_SUBITEM(
+                        commit_description=title,
+                        commit_hash=commit_hash,
+                    ).markdown,
+                )
+        if not empty:
+            yield "separator", separator
+    if summary is not None:
+        CONTRIBUTOR_ITEM = _template_class("CONTRIBUTOR_ITEM")
+        STATISTIC_ITEM = _template_class("STATISTIC_ITEM")
+        yield from _summary_parts(
+            summary,
+            separator,
+            lambda title: CATEGORY_SECTION(title, SECTION_SUBTEXTS[title]).markdown,
+            lambda c: CONTRIBUTOR_ITEM(c.name, c.email, c.commits).markdown,
+            lambda label, value: STATISTIC_ITEM(label, value).markdown,
+        )
+
+
+def _summary_parts(
+    summary: ReleaseSummary,
+    separator: str,
+    section: Callable[[str], str],
+    contributor: Callable[[Contributor], str],
+    statistic: Callable[[str, str], str],
+) -> Iterator[tuple[str, str]]:
+    if summary.contributors:
+        yield "category", section("Contributors")
+        yield "group", ""
+        for c in summary.contributors:
+            yield "entry", contributor(c)
+        yield "separator", separator
+    if summary.statistics:
+        yield "category", section("Statistics")
+        yield "group", ""
+        for label, value in summary.statistics:
+            yield "entry", statistic(label, value)
+        yield "separator", separator
+
+
+def _iter_markdown_compiled(
+    project_name: str,
+    version: str,
+    release_date: str,
+    change,
+    templates: TemplateSet,
+) -> Iterator[tuple[str, str]]:
+    """iter_markdown_parts with compiled templates (see girokmoji.templatedir)."""
+    separator = templates.separator({})
+    yield (
+        "head",
+        templates.head(
+            {
+                "project_name": project_name,
+                "version": version,
+                "subtext": _HEAD_SUBTEXT,
+                "release_date": release_date,
+            }
+        ),
+    )
+    yield "separator", separator
+    group, entry = templates.group, templates.entry
+    for cat in category_order:
+        empty = True
+        for (emoji, description), items in _category_groups(change[cat]):
+            if empty:
+                yield (
+                    "category",
+                    templates.category(
+                        {"category": cat, "subtext": CATEGORY_SUBTEXTS[cat]}
+                    ),
+                )
+                empty = False
+            fields = {"emoji": emoji, "gitmoji_description": description}
+            yield "group", group(fields)
+            for title, commit_hash in items:
+                fields["commit_description"] = title
+                fields["commit_hash"] = commit_hash
+                yield "entry", entry(fields)
+        if not empty:
+            yield "separator", separator
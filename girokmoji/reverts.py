@@ -0,0 +1,55 @@
+"""Drop commits that are reverted inside the same range, with their reverts.
+
+A revert is recognized by the ``This reverts commit <sha>`` line that
+``git revert`` writes. Pairs are found in one pass over the messages, with
+an index of the range's commit ids, so no further git lookups are needed.
+
+When a revert is itself reverted (A, "Revert A", "Revert "Revert A""), the
+newest revert cancels the one it reverts and A stays in the notes, as it is
+in effect again.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Sequence, TypeVar
+
+from girokmoji.render import CommitLike, commit_message
+
+C = TypeVar("C", bound=CommitLike)
+
+_REVERTS = re.compile(r"^This reverts commit ([0-9a-fA-F]{40})\b", re.MULTILINE)
+
+
+def reverted_id(message: str) -> str | None:
+    """Return the id named by the ``This reverts commit`` line of
+    ``message``, or None."""
+    match = _REVERTS.search(message)
+    return match.group(1).lower() if match else None
+
+
+def cancel_revert_pairs(commits: Sequence[C]) -> tuple[list[C], list[str]]:
+    """Return ``commits`` without the revert pairs among them, and the ids of
+    the dropped commits."""
+    position = {str(commit.id): i for i, commit in enumerate(commits)}
+    target: dict[int, int] = {}
+    reverted_by: dict[int, int] = {}
+    for i, commit in enumerate(commits):
+        j = position.get(reverted_id(commit_message(commit)) or "")
+        if j is not None and j != i and j not in reverted_by:
+            target[i] = j
+            reverted_by[j] = i
+
+    dropped: set[int] = set()
+    for tip in target:
+        if tip in reverted_by:
+            # Paired from the newest revert of its chain
+            continue
+        k: int | None = tip
+        while k is not None and k in target and k not in dropped:
+            j = target[k]
+            dropped.update((k, j))
+            k = target.get(j)
+
+    kept = [commit for i, commit in enumerate(commits) if i not in dropped]
+    return kept, [str(commits[i].id) for i in sorted(dropped)]
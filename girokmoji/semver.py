@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterable
 import re
 
-__all__ = ["SemVer"]
+__all__ = ["SemVer", "max_version", "sort_versions"]
 
 # Regular expression from https://semver.org/
 _SEMVER_RE = re.compile(
@@ -12,29 +14,79 @@ _SEMVER_RE = re.compile(
     r"(?:\+([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?$"
 )
 
-@dataclass(frozen=True)
+_PreKey = tuple[tuple[int, int | str], ...]
+_SortKey = tuple[int, int, int, int, _PreKey]
+
+
+def _sort_key(
+    major: int, minor: int, patch: int, prerelease: tuple[str, ...]
+) -> _SortKey:
+    """Return a tuple whose natural order is SemVer precedence.
+
+    A release sorts after all of its prereleases (flag 1 vs 0). Prerelease
+    identifiers become ``(0, int)`` when numeric and ``(1, str)`` otherwise,
+    so numeric identifiers sort first and longer lists win on equal prefixes.
+    Build metadata does not take part in precedence.
+    """
+    if not prerelease:
+        return (major, minor, patch, 1, ())
+    return (
+        major,
+        minor,
+        patch,
+        0,
+        tuple((0, int(p)) if p.isdigit() else (1, p) for p in prerelease),
+    )
+
+
+@dataclass(frozen=True, slots=True)
 class SemVer:
-    """Semantic Version 2.0.0."""
+    """Semantic Version 2.0.0.
+
+    The precedence key is computed once at construction, so comparisons are a
+    single tuple comparison.
+    """
 
     major: int
     minor: int
     patch: int
     prerelease: tuple[str, ...] = ()
     build: tuple[str, ...] = ()
+    _key: _SortKey = field(init=False, repr=False, compare=False, hash=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "_key",
+            _sort_key(self.major, self.minor, self.patch, self.prerelease),
+        )
+
+    @property
+    def sort_key(self) -> _SortKey:
+        """Precedence key; equal keys mean equal precedence."""
+        return self._key
 
     @classmethod
     def parse(cls, text: str) -> "SemVer":
-        match = _SEMVER_RE.fullmatch(text)
-        if not match:
+        ver = cls.try_parse(text)
+        if ver is None:
             raise ValueError(f"Invalid semver string: {text}")
-        major, minor, patch, pre, build = match.groups()
-        return cls(
-            major=int(major),
-            minor=int(minor),
-            patch=int(patch),
-            prerelease=tuple(pre.split(".")) if pre else (),
-            build=tuple(build.split(".")) if build else (),
-        )
+        return ver
+
+    @classmethod
+    def try_parse(cls, text: str) -> "SemVer | None":
+        """Return the parsed version, or None when ``text`` is not SemVer.
+
+        Results are interned: parsing the same string again returns the same
+        (immutable) instance.
+        """
+        # Cheap rejection of most non-release tags (build-123, deploy/...)
+        # before touching the cache, so they never evict real versions.
+        if not text or text[0] not in _DIGITS:
+            return None
+        if cls is not SemVer:
+            return _parse_uncached(cls, text)
+        return _parse_interned(text)
 
     def bump(self, part: str) -> "SemVer":
         if part == "major":
@@ -53,54 +105,83 @@ class SemVer:
             base += "+" + ".".join(self.build)
         return base
 
-    def _compare_pre(self, other: "SemVer") -> int:
-        if not self.prerelease and not other.prerelease:
-            return 0
-        if not self.prerelease:
-            return 1
-        if not other.prerelease:
-            return -1
-        for a, b in zip(self.prerelease, other.prerelease):
-            if a == b:
-                continue
-            a_num = a.isdigit()
-            b_num = b.isdigit()
-            if a_num and b_num:
-                return -1 if int(a) < int(b) else 1
-            if a_num:
-                return -1
-            if b_num:
-                return 1
-            return -1 if a < b else 1
-        if len(self.prerelease) == len(other.prerelease):
-            return 0
-        return -1 if len(self.prerelease) < len(other.prerelease) else 1
-
     def __lt__(self, other: object) -> bool:
         if not isinstance(other, SemVer):
             return NotImplemented
-        if (self.major, self.minor, self.patch) != (
-            other.major,
-            other.minor,
-            other.patch,
-        ):
-            return (self.major, self.minor, self.patch) < (
-                other.major,
-                other.minor,
-                other.patch,
-            )
-        return self._compare_pre(other) < 0
+        return self._key < other._key
+
+    def __le__(self, other: object) -> bool:
+        if not isinstance(other, SemVer):
+            return NotImplemented
+        return self._key <= other._key
+
+    def __gt__(self, other: object) -> bool:
+        if not isinstance(other, SemVer):
+            return NotImplemented
+        return self._key > other._key
+
+    def __ge__(self, other: object) -> bool:
+        if not isinstance(other, SemVer):
+            return NotImplemented
+        return self._key >= other._key
 
     def __eq__(self, other: object) -> bool:  # pragma: no cover - trivial
         if not isinstance(other, SemVer):
             return NotImplemented
-        return (
-            self.major == other.major
-            and self.minor == other.minor
-            and self.patch == other.patch
-            and self.prerelease == other.prerelease
-            and self.build == other.build
-        )
+        return self._key == other._key and self.build == other.build
 
     def __hash__(self) -> int:  # pragma: no cover - trivial
-        return hash((self.major, self.minor, self.patch, self.prerelease, self.build))
+        return hash((self._key, self.build))
+
+
+_DIGITS = frozenset("0123456789")
+
+
+def _parse_uncached(cls: type[SemVer], text: str) -> SemVer | None:
+    if not text or text[0] not in _DIGITS:
+        return None
+    if "-" not in text and "+" not in text and text.isascii():
+        # Plain X.Y.Z: a split and three digit checks, no regex.
+        parts = text.split(".")
+        if len(parts) != 3:
+            return None
+        a, b, c = parts
+        if not (a.isdigit() and b.isdigit() and c.isdigit()):
+            return None
+        if (a[0] == "0" != a) or (b[0] == "0" != b) or (c[0] == "0" != c):
+            return None
+        return cls(int(a), int(b), int(c))
+    match = _SEMVER_RE.fullmatch(text)
+    if not match:
+        return None
+    major, minor, patch, pre, build = match.groups()
+    return cls(
+        int(major),
+        int(minor),
+        int(patch),
+        tuple(pre.split(".")) if pre else (),
+        tuple(build.split(".")) if build else (),
+    )
+
+
+@lru_cache(maxsize=65536)
+def _parse_interned(text: str) -> SemVer | None:
+    return _parse_uncached(SemVer, text)
+
+
+def _key_of(version: SemVer) -> _SortKey:
+    return version._key
+
+
+def sort_versions(versions: Iterable[SemVer], *, reverse: bool = False) -> list[SemVer]:
+    """Return ``versions`` sorted by precedence using the cached keys.
+
+    Sorting is stable, so versions differing only in build metadata keep
+    their input order.
+    """
+    return sorted(versions, key=_key_of, reverse=reverse)
+
+
+def max_version(versions: Iterable[SemVer]) -> SemVer | None:
+    """Return the highest-precedence version, or None for an empty input."""
+    return max(versions, key=_key_of, default=None)
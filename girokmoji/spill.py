@@ -0,0 +1,141 @@
+"""Bounded-memory storage for classified commits.
+
+structured_changelog keeps every commit object of the range in memory. For
+ranges of millions of commits, a SpillStore keeps only ``(id, first line)``
+records and, once more than ``threshold`` of them are buffered, appends them
+to temporary files. Each SpillBucket holds one category and keeps its
+records grouped by a caller-supplied key (the gitmoji group) in first-seen
+order, so rendering can stream every group back without regrouping.
+"""
+
+from __future__ import annotations
+
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+# The (emoji, description) gitmoji group of a record; None if not rendered
+GroupKey = tuple[str, str] | None
+
+
+@dataclass(frozen=True, slots=True)
+class CommitRecord:
+    """The part of a commit needed to render it (satisfies CommitLike)."""
+
+    id: str
+    message: str
+
+    @property
+    def raw_message(self) -> bytes:
+        return self.message.encode("utf-8")
+
+    @property
+    def message_encoding(self) -> str:
+        return "utf-8"
+
+
+class _Group:
+    __slots__ = ("path", "buffer", "spilled")
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.buffer: list[CommitRecord] = []
+        self.spilled = 0
+
+    def flush(self) -> None:
+        if not self.buffer:
+            return
+        with open(self.path, "a", encoding="utf-8", newline="\n") as fp:
+            for record in self.buffer:
+                fp.write(f"{record.id}\t{record.message}\n")
+        self.spilled += len(self.buffer)
+        self.buffer = []
+
+    def __iter__(self) -> Iterator[CommitRecord]:
+        if self.spilled:
+            with open(self.path, encoding="utf-8", newline="\n") as fp:
+                for line in fp:
+                    commit_id, _, message = line[:-1].partition("\t")
+                    yield CommitRecord(commit_id, message)
+        yield from self.buffer
+
+
+class SpillBucket:
+    """Append-only, key-grouped sequence of CommitRecords.
+
+    Iteration yields the records group by group, groups in first-seen order
+    and records in insertion order within a group.
+    """
+
+    def __init__(self, store: "SpillStore", number: int):
+        self._store = store
+        self._number = number
+        self._groups: dict[GroupKey, _Group] = {}
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[CommitRecord]:
+        for _, records in self.groups():
+            yield from records
+
+    def add(self, key: GroupKey, record: CommitRecord) -> None:
+        group = self._groups.get(key)
+        if group is None:
+            path = self._store.directory / f"{self._number}-{len(self._groups)}.tsv"
+            group = self._groups[key] = _Group(path)
+        group.buffer.append(record)
+        self._len += 1
+        self._store._buffered_one()
+
+    def groups(self) -> Iterator[tuple[GroupKey, Iterator[CommitRecord]]]:
+        """Yield ``(key, records)`` in first-seen key order."""
+        for key, group in self._groups.items():
+            yield key, iter(group)
+
+    def _flush(self) -> None:
+        for group in self._groups.values():
+            group.flush()
+
+
+class SpillStore:
+    """Owner of the temporary directory and the in-memory record budget.
+
+    Use as a context manager; the spill files are removed on exit.
+    """
+
+    def __init__(self, threshold: int, directory: Path | None = None):
+        if threshold < 0:
+            raise ValueError(f"Spill threshold must not be negative: {threshold}")
+        self.threshold = threshold
+        self._tmp = tempfile.TemporaryDirectory(
+            prefix="girokmoji-spill-", dir=directory
+        )
+        self.directory = Path(self._tmp.name)
+        self._buckets: list[SpillBucket] = []
+        self._buffered = 0
+        self.spills = 0
+
+    def bucket(self) -> SpillBucket:
+        bucket = SpillBucket(self, len(self._buckets))
+        self._buckets.append(bucket)
+        return bucket
+
+    def _buffered_one(self) -> None:
+        self._buffered += 1
+        if self._buffered > self.threshold:
+            for bucket in self._buckets:
+                bucket._flush()
+            self._buffered = 0
+            self.spills += 1
+
+    def close(self) -> None:
+        self._tmp.cleanup()
+
+    def __enter__(self) -> "SpillStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
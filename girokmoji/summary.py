@@ -0,0 +1,152 @@
+"""Contributors and statistics of a release, for the optional sections of
+gen_markdown.
+
+Both are collected while the commits are classified (see
+changelog.classified_change), so history is not walked a second time as
+with a separate ``git shortlog``. The "diffstat" section adds files changed,
+insertions and deletions to the statistics; those need a diff per commit,
+computed afterwards by girokmoji.diffstat.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping, Sequence
+
+from girokmoji.const import CATEGORY, category_order
+
+SECTIONS = ("contributors", "statistics", "diffstat")
+
+# (name, email) -> canonical (name, email), e.g. through .mailmap
+Resolver = Callable[[str, str], tuple[str, str]]
+
+
+def parse_sections(text: str) -> list[str]:
+    """Parse a comma separated section list such as ``contributors``."""
+    sections = [s.strip().lower() for s in text.split(",") if s.strip()]
+    unknown = [s for s in sections if s not in SECTIONS]
+    if unknown or not sections:
+        raise ValueError(
+            f"Unsupported section(s): {', '.join(unknown) or text!r}; "
+            f"choose from {', '.join(SECTIONS)}"
+        )
+    return list(dict.fromkeys(sections))
+
+
+@dataclass(frozen=True)
+class DiffStat:
+    files: int = 0
+    insertions: int = 0
+    deletions: int = 0
+
+    def __add__(self, other: "DiffStat") -> "DiffStat":
+        return DiffStat(
+            self.files + other.files,
+            self.insertions + other.insertions,
+            self.deletions + other.deletions,
+        )
+
+    def __str__(self) -> str:
+        return f"{self.files} files, +{self.insertions} -{self.deletions}"
+
+
+@dataclass(frozen=True)
+class Contributor:
+    name: str
+    email: str
+    commits: int
+
+
+@dataclass
+class ReleaseSummary:
+    """What the Contributors and Statistics sections render.
+
+    ``statistics`` holds ``(label, value)`` rows in display order.
+    """
+
+    contributors: list[Contributor] | None = None
+    statistics: list[tuple[str, str]] | None = None
+
+
+@dataclass
+class SummaryCollector:
+    """Count commits per (mailmap-resolved) author while classifying.
+
+    With ``diffstat``, the ids of the observed commits are kept per category
+    so that their diffstats can be looked up through ``diffstats`` once the
+    walk is over; merge commits only count with ``diffstat_merges``.
+    """
+
+    resolve: Resolver | None = None
+    diffstat: bool = False
+    diffstat_merges: bool = False
+    authors: dict[tuple[str, str], int] = field(default_factory=dict)
+    commits: int = 0
+    commit_ids: dict[CATEGORY, list[str]] = field(default_factory=dict)
+    diffstats: Callable[[str], DiffStat | None] | None = None
+
+    def observe(self, commit: Any, category: CATEGORY) -> None:
+        self.commits += 1
+        if self.diffstat:
+            self.commit_ids.setdefault(category, []).append(str(commit.id))
+        author = getattr(commit, "author", None)
+        if author is None:
+            return
+        key = (author.name, author.email)
+        if self.resolve is not None:
+            key = self.resolve(*key)
+        self.authors[key] = self.authors.get(key, 0) + 1
+
+    def contributors(self) -> list[Contributor]:
+        """Contributors by number of commits, then by name."""
+        ranked = sorted(
+            self.authors.items(), key=lambda item: (-item[1], item[0][0].lower())
+        )
+        return [Contributor(name, email, n) for (name, email), n in ranked]
+
+    def category_diffstat(self, category: CATEGORY) -> DiffStat:
+        """Sum of the diffstats of ``category``; merges count as nothing."""
+        total = DiffStat()
+        if self.diffstats is None:
+            return total
+        for commit_id in self.commit_ids.get(category, ()):
+            stat = self.diffstats(commit_id)
+            if stat is not None:
+                total += stat
+        return total
+
+    def summary(
+        self,
+        change: Mapping[CATEGORY, Any],
+        sections: Sequence[str],
+    ) -> ReleaseSummary | None:
+        """Return the requested ``sections`` for the classified ``change``.
+
+        "diffstat" implies "statistics".
+        """
+        if not sections:
+            return None
+        result = ReleaseSummary()
+        if "contributors" in sections:
+            result.contributors = self.contributors()
+        with_diffstat = "diffstat" in sections and self.diffstats is not None
+        if "statistics" in sections or "diffstat" in sections:
+            rows = [("Commits", str(self.commits))]
+            rows.append(("Contributors", str(len(self.authors))))
+            per_category = {
+                cat: self.category_diffstat(cat) if with_diffstat else None
+                for cat in category_order
+            }
+            if with_diffstat:
+                total = sum((s for s in per_category.values() if s), DiffStat())
+                rows.append(("Files changed", str(total.files)))
+                rows.append(("Insertions", str(total.insertions)))
+                rows.append(("Deletions", str(total.deletions)))
+            for cat in category_order:
+                if len(change[cat]):
+                    value = str(len(change[cat]))
+                    if per_category[cat] is not None:
+                        value += f" ({per_category[cat]})"
+                    rows.append((cat, value))
+            result.statistics = rows
+        return result
@@ -138,9 +138,47 @@ class DefaultSeparator(Separator):
         return Template(self.markdown_template).substitute()
 
 
+@dataclass
+class ContributorItem(SupportTemplate):
+    name: str
+    email: str
+    commits: int
+
+
+class DefaultContributorItem(ContributorItem):
+    markdown_template: ClassVar[str] = "- **$name** ($commits)\n"
+
+    @property
+    def markdown(self):
+        return Template(self.markdown_template).substitute(
+            name=self.name,
+            email=self.email,
+            commits=self.commits,
+        )
+
+
+@dataclass
+class StatisticItem(SupportTemplate):
+    label: str
+    value: str
+
+
+class DefaultStatisticItem(StatisticItem):
+    markdown_template: ClassVar[str] = "- **$label:** $value\n"
+
+    @property
+    def markdown(self):
+        return Template(self.markdown_template).substitute(
+            label=self.label,
+            value=self.value,
+        )
+
+
 HEAD = DefaultHead
 CATEGORY_SECTION = DefaultCategorySection
 ENTRY = DefaultEntry
 ENTRY_GROUP_HEADER = DefaultEntryGroupHeader
 ENTRY_SUBITEM = DefaultEntrySubItem
 SEPARATOR = DefaultSeparator
+CONTRIBUTOR_ITEM = DefaultContributorItem
+STATISTIC_ITEM = DefaultStatisticItem
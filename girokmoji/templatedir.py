@@ -0,0 +1,221 @@
+"""User supplied markdown templates loaded from a directory.
+
+A template directory may contain any of ``head.md``, ``category.md``,
+``group.md``, ``entry.md``, ``separator.md``, ``contributor.md`` and
+``statistic.md``; missing files fall back to
+the defaults of girokmoji.template. Files use the same ``$name`` placeholders
+as the defaults (``$$`` for a literal dollar sign).
+
+Each template is parsed once and compiled into a function that joins its
+literal chunks and fields, so rendering an entry does no parsing. Compiled
+functions are cached in memory by the SHA-256 of the template text, and the
+parsed form is kept in ``templates.json`` under ``cache_dir``. Parsed forms
+read back from there are checked like fresh ones, and parsed again if they
+do not hold up.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from string import Template
+from typing import Callable, Mapping
+
+from girokmoji.cache import load_cache, save_cache
+from girokmoji.exception import TemplateError
+from girokmoji.template import (
+    DefaultCategorySection,
+    DefaultContributorItem,
+    DefaultEntryGroupHeader,
+    DefaultEntrySubItem,
+    DefaultHead,
+    DefaultSeparator,
+    DefaultStatisticItem,
+)
+
+CACHE_NAME = "templates.json"
+
+RenderFunction = Callable[[Mapping[str, str]], str]
+
+# template name -> (default text, fields it may use)
+TEMPLATE_FIELDS: dict[str, tuple[str, frozenset[str]]] = {
+    "head": (
+        DefaultHead.markdown_template,
+        frozenset({"project_name", "version", "subtext", "release_date"}),
+    ),
+    "category": (
+        DefaultCategorySection.markdown_template,
+        frozenset({"category", "subtext"}),
+    ),
+    "group": (
+        DefaultEntryGroupHeader.markdown_template,
+        frozenset({"emoji", "gitmoji_description"}),
+    ),
+    "entry": (
+        DefaultEntrySubItem.markdown_template,
+        frozenset(
+            {"emoji", "gitmoji_description", "commit_description", "commit_hash"}
+        ),
+    ),
+    "separator": (DefaultSeparator.markdown_template, frozenset()),
+    "contributor": (
+        DefaultContributorItem.markdown_template,
+        frozenset({"name", "email", "commits"}),
+    ),
+    "statistic": (
+        DefaultStatisticItem.markdown_template,
+        frozenset({"label", "value"}),
+    ),
+}
+
+# A part is a literal chunk, or a field name when its flag is set
+Parts = list[tuple[bool, str]]
+
+_COMPILED: dict[str, RenderFunction] = {}
+
+
+def content_hash(name: str, text: str) -> str:
+    """Cache key of template ``name`` (its allowed fields depend on it)."""
+    return hashlib.sha256(f"{name}\0{text}".encode("utf-8")).hexdigest()
+
+
+def parse_template(text: str, fields: frozenset[str], *, name: str = "") -> Parts:
+    """Split ``text`` into literal chunks and field references."""
+    parts: Parts = []
+    literal: list[str] = []
+    pos = 0
+    for match in Template.pattern.finditer(text):
+        literal.append(text[pos : match.start()])
+        pos = match.end()
+        if match.group("escaped") is not None:
+            literal.append("$")
+            continue
+        field = match.group("named") or match.group("braced")
+        if field is None:
+            line = text.count("\n", 0, match.start()) + 1
+            raise TemplateError(f"Invalid placeholder in {name} template, line {line}")
+        if field not in fields:
+            raise TemplateError(
+                f"Unknown field ${field} in {name} template; "
+                f"expected one of {', '.join(sorted(fields)) or 'none'}"
+            )
+        if literal:
+            parts.append((False, "".join(literal)))
+            literal = []
+        parts.append((True, field))
+    literal.append(text[pos:])
+    tail = "".join(literal)
+    if tail:
+        parts.append((False, tail))
+    return parts
+
+
+def compile_parts(parts: Parts) -> RenderFunction:
+    """Return a function rendering ``parts`` from a mapping of fields."""
+    # (literal before the field, field) pairs and the literal after the last
+    pairs: list[tuple[str, str]] = []
+    literal = ""
+    for is_field, text in parts:
+        if is_field:
+            pairs.append((literal, text))
+            literal = ""
+        else:
+            literal += text
+    tail = literal
+    if not pairs:
+        return lambda f: tail
+
+    def render(f: Mapping[str, str]) -> str:
+        return "".join([text + f[field] for text, field in pairs]) + tail
+
+    return render
+
+
+def _cached_parts(value: object, fields: frozenset[str]) -> Parts | None:
+    """Return the parsed form read from the cache, or None unless it is a
+    list of ``[is_field, text]`` pairs whose fields are all in ``fields``."""
+    if not isinstance(value, list):
+        return None
+    parts: Parts = []
+    for part in value:
+        if not (
+            isinstance(part, list)
+            and len(part) == 2
+            and isinstance(part[0], bool)
+            and isinstance(part[1], str)
+        ):
+            return None
+        if part[0] and part[1] not in fields:
+            return None
+        parts.append((part[0], part[1]))
+    return parts
+
+
+@dataclass(frozen=True)
+class TemplateSet:
+    """Compiled render functions for every part of the notes."""
+
+    head: RenderFunction
+    category: RenderFunction
+    group: RenderFunction
+    entry: RenderFunction
+    separator: RenderFunction
+    contributor: RenderFunction
+    statistic: RenderFunction
+
+
+def _compile(
+    name: str, text: str, parsed: dict[str, Parts], cached: Mapping[str, object]
+) -> RenderFunction:
+    key = content_hash(name, text)
+    function = _COMPILED.get(key)
+    if function is not None:
+        return function
+    fields = TEMPLATE_FIELDS[name][1]
+    parts = _cached_parts(cached.get(key), fields)
+    if parts is None:
+        parts = parse_template(text, fields, name=name)
+        parsed[key] = parts
+    function = _COMPILED[key] = compile_parts(parts)
+    return function
+
+
+def load_template_dir(
+    template_dir: Path | None, *, cache_dir: Path | None = None
+) -> TemplateSet:
+    """Load and compile the templates of ``template_dir`` (defaults for the
+    files it lacks, or for every template when it is None)."""
+    if template_dir is not None and not Path(template_dir).is_dir():
+        raise TemplateError(f"Template directory not found: {template_dir}")
+    texts: dict[str, str] = {}
+    for name, (default, _) in TEMPLATE_FIELDS.items():
+        path = None if template_dir is None else Path(template_dir) / f"{name}.md"
+        if path is not None and path.is_file():
+            texts[name] = path.read_text(encoding="utf-8")
+        else:
+            texts[name] = default
+
+    cached: dict[str, object] = {}
+    if cache_dir is not None and any(
+        content_hash(n, t) not in _COMPILED for n, t in texts.items()
+    ):
+        doc = load_cache(cache_dir, CACHE_NAME)
+        if doc is not None and isinstance(doc.get("templates"), dict):
+            cached = doc["templates"]
+    parsed: dict[str, Parts] = {}
+    compiled = {
+        name: _compile(name, text, parsed, cached) for name, text in texts.items()
+    }
+    if parsed and cache_dir is not None:
+        save_cache(
+            cache_dir,
+            CACHE_NAME,
+            {
+                "templates": {
+                    **cached,
+                    **{k: [list(p) for p in v] for k, v in parsed.items()},
+                }
+            },
+        )
+    return TemplateSet(**compiled)
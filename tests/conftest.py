@@ -0,0 +1,32 @@
+from pathlib import Path
+
+import pytest
+from pygit2 import Signature
+
+AUTHOR = Signature("t", "t@example.com")
+
+
+def commit_files(
+    repo, files: dict[str, str], message, parents, *, ref="HEAD", author=AUTHOR
+):
+    """Commit ``files`` (path -> content) on top of the first parent's tree,
+    or on an empty tree for a root commit, and point ``ref`` at it."""
+    if parents:
+        repo.index.read_tree(repo[parents[0]].tree)
+    else:
+        repo.index.clear()
+    for name, content in files.items():
+        path = Path(repo.workdir, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        repo.index.add(name)
+    repo.index.write()
+    return repo.create_commit(
+        ref, author, author, message, repo.index.write_tree(), parents
+    )
+
+
+@pytest.fixture(name="commit_files")
+def commit_files_fixture():
+    """The commit_files builder, for tests that create their own history."""
+    return commit_files
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from pygit2 import Signature, init_repository
+from pygit2.enums import ObjectType
+
+from girokmoji import aio
+from girokmoji.changelog import change_log, github_release_payload
+
+
+def _make_repo(repo_dir: Path):
+    repo = init_repository(repo_dir)
+    person = Signature("t", "t@example.com")
+    parents = []
+    for msg in [":tada: init", ":bug: fix", ":sparkles: feat"]:
+        (repo_dir / "f.txt").write_text(msg)
+        repo.index.add_all()
+        repo.index.write()
+        parents = [
+            repo.create_commit(
+                "HEAD", person, person, msg, repo.index.write_tree(), parents
+            )
+        ]
+        if msg == ":tada: init":
+            repo.create_tag("v1.0.0", parents[0], ObjectType.COMMIT, person, "t")
+    return repo
+
+
+def test_async_counterparts_match_sync(tmp_path):
+    repos = [tmp_path / "a", tmp_path / "b"]
+    for repo_dir in repos:
+        _make_repo(repo_dir)
+
+    async def main():
+        notes = await asyncio.gather(
+            *(
+                aio.async_change_log("proj", "2024-01-01", d, "v1.0.0", "HEAD")
+                for d in repos
+            ),
+            aio.async_github_release_payload(
+                "proj",
+                "2024-01-01",
+                repo_dir=repos[0],
+                tail_tag="v1.0.0",
+                head_tag="HEAD",
+            ),
+        )
+        released = await aio.async_auto_release(
+            "proj", repos[1], bump="minor", release_date="2024-01-01"
+        )
+        return notes, released
+
+    (note_a, note_b, payload), released = asyncio.run(main())
+    expected = change_log("proj", "2024-01-01", repos[0], "v1.0.0", "HEAD")
+    assert note_a == note_b == expected
+    assert payload == github_release_payload(
+        "proj", "2024-01-01", repos[0], "v1.0.0", "HEAD"
+    )
+    assert "v1.1.0" in released
+    assert init_repository(repos[1]).references.get("refs/tags/v1.1.0") is not None
+
+
+def test_same_repository_is_serialized(tmp_path):
+    _make_repo(tmp_path / "a")
+    _make_repo(tmp_path / "b")
+    running: dict[str, int] = {}
+    peak: dict[str, int] = {}
+    guard = threading.Lock()
+
+    def work(name):
+        with guard:
+            running[name] = running.get(name, 0) + 1
+            peak[name] = max(peak.get(name, 0), running[name])
+        time.sleep(0.05)
+        with guard:
+            running[name] -= 1
+        return name
+
+    async def main():
+        return await asyncio.gather(
+            *(
+                aio.run_serialized(tmp_path / name, work, name)
+                for name in ["a", "b", "a", "b", "a"]
+            )
+        )
+
+    assert asyncio.run(main()) == ["a", "b", "a", "b", "a"]
+    assert peak == {"a": 1, "b": 1}
+
+
+def test_cancellation(tmp_path):
+    _make_repo(tmp_path)
+    started = threading.Event()
+    release = threading.Event()
+    ran: list[str] = []
+
+    def blocking(name):
+        ran.append(name)
+        started.set()
+        release.wait(5)
+        return name
+
+    async def main():
+        first = asyncio.create_task(aio.run_serialized(tmp_path, blocking, "first"))
+        queued = asyncio.create_task(aio.run_serialized(tmp_path, blocking, "queued"))
+        await asyncio.to_thread(started.wait, 5)
+        # Cancelling a running call returns at once; the queued one never runs
+        first.cancel()
+        queued.cancel()
+        for task in (first, queued):
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        # The repository stays locked until the running job has ended
+        later = asyncio.create_task(aio.run_serialized(tmp_path, blocking, "later"))
+        await asyncio.sleep(0.05)
+        assert ran == ["first"]
+        release.set()
+        return await later
+
+    assert asyncio.run(main()) == "later"
+    assert ran == ["first", "later"]
+
+
+def test_missing_repo_dir_is_a_type_error():
+    with pytest.raises(TypeError):
+        asyncio.run(aio.async_change_log("proj"))
@@ -130,3 +130,103 @@ def test_github_release_payload_flags(monkeypatch):
     )
     assert payload["draft"] is True
     assert payload["prerelease"] is True
+
+
+def test_structured_changelog_infers_strongest_bump():
+    commits = [
+        FakeCommit(":bug: fix", "c1"),
+        FakeCommit(":sparkles: feat one", "c2"),
+        FakeCommit(":memo: docs", "c3"),
+        FakeCommit(":sparkles: feat two", "c4"),
+    ]
+    inference = changelog.BumpInference()
+    structured = changelog.structured_changelog(commits, bump=inference)
+    assert len(structured["Bug Fixes"]) == 1
+    assert inference.resolve() == "minor"
+    assert inference.deciding == [
+        ("c2", ":sparkles:", "feat one"),
+        ("c4", ":sparkles:", "feat two"),
+    ]
+    changelog.structured_changelog([FakeCommit(":boom: break", "c5")], bump=inference)
+    assert inference.part == "major"
+    assert [d[0] for d in inference.deciding] == ["c5"]
+
+
+def test_bump_inference_defaults_without_semver_gitmoji():
+    inference = changelog.BumpInference()
+    changelog.structured_changelog([FakeCommit(":memo: docs")], bump=inference)
+    assert inference.part is None
+    assert inference.resolve() == "patch"
+
+
+def test_write_stats_reports_deciding_commits(capsys):
+    commits = [FakeCommit(":bug: fix", "c1abc"), FakeCommit("plain", "c2")]
+    inference = changelog.BumpInference()
+    structured = changelog.structured_changelog(commits, bump=inference)
+    changelog.write_stats(structured, inference, chosen_bump="patch")
+    err = capsys.readouterr().err
+    assert "2 commits" in err
+    assert "Bug Fixes: 1" in err
+    assert "Hmm...: 1" in err
+    assert "implied bump: patch (bumping patch)" in err
+    assert "c1abc :bug: fix" in err
+
+
+@pytest.mark.parametrize(
+    ("msg", "expected"),
+    [
+        (":sparkles: feat", False),
+        ("💥 drop python 3.9", True),
+        (":sparkles: new API :boom:", True),
+        (":sparkles: feat\n\nbody\n\nBREAKING CHANGE: config moved\n\n", True),
+        (":sparkles: feat\n\nBREAKING-CHANGE: x\nSigned-off-by: a <a@b>", True),
+        # Only the trailer block counts
+        (":sparkles: feat\n\nBREAKING CHANGE: x\n\nSigned-off-by: a <a@b>", False),
+        (":sparkles: feat\nBREAKING CHANGE: not a trailer", False),
+        (":sparkles: feat\n\nmentions BREAKING CHANGE: inline", False),
+    ],
+)
+def test_is_breaking(msg, expected):
+    assert changelog.is_breaking(msg) is expected
+
+
+def test_breaking_changes_are_promoted():
+    commits = [
+        FakeCommit(":sparkles: feat\n\nBREAKING CHANGE: renamed", "c1"),
+        FakeCommit(":sparkles: plain feat", "c2"),
+        FakeCommit(":ambulance: hotfix\n\nBREAKING CHANGE: api", "c3"),
+    ]
+    bump = changelog.BumpInference()
+    change = changelog.structured_changelog(commits, bump=bump)
+    assert [c.id for c in change["Critical Changes"]] == ["c1", "c3"]
+    assert [c.id for c in change["Feature and Functional Changes"]] == ["c2"]
+    assert bump.part == "major"
+    assert [d[0] for d in bump.deciding] == ["c1", "c3"]
+    # Promoted entries keep their own gitmoji group
+    notes = changelog.gen_markdown("p", "v1", "d", change)
+    critical = notes.split("## Critical Changes")[1].split("---")[0]
+    assert "✨ Introduce new features." in critical and "renamed" not in critical
+
+
+def test_first_line():
+    assert changelog.first_line("title\nbody\nmore") == "title"
+    assert changelog.first_line("title") == "title"
+    assert changelog.first_line("") == ""
+
+
+def test_template_classes_can_be_rebound(monkeypatch):
+    from girokmoji import template
+
+    class LoudHead(template.DefaultHead):
+        markdown_template = "# LOUD $project_name $version\n"
+
+    class Bullet(template.DefaultEntrySubItem):
+        markdown_template = "* $commit_description\n"
+
+    change = changelog.structured_changelog([FakeCommit(":bug: fix")])
+    monkeypatch.setattr(changelog, "HEAD", LoudHead)
+    assert changelog.gen_markdown("p", "v1", "d", change).startswith("# LOUD p v1\n")
+    monkeypatch.setattr(template, "ENTRY_SUBITEM", Bullet)
+    assert "* fix\n" in changelog.gen_markdown("p", "v1", "d", change)
+    monkeypatch.undo()
+    assert "# LOUD" not in changelog.gen_markdown("p", "v1", "d", change)
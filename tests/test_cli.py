@@ -42,3 +42,15 @@ def test_cli_release(monkeypatch):
     )
     giromain.main()
     assert called["args"] == ("proj", Path("."), "minor", True)
+
+
+@pytest.mark.cli
+def test_cli_rejects_negative_clock_skew():
+    result = subprocess.run(
+        [sys.executable, '-m', 'girokmoji', 'generate', 'p', 'd', '.', 'a', 'b',
+         '--since', '2025-08-01', '--clock-skew', '-1'],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 2
+    assert "--clock-skew" in result.stderr
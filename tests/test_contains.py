@@ -0,0 +1,109 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from pygit2 import Signature, init_repository
+from pygit2.enums import ObjectType
+
+from girokmoji.contains import ContainsIndex, contains_index, first_containing_tags
+from girokmoji.exception import NoSuchTagFoundError
+from girokmoji.git import semver_tag_index
+
+
+def _make_history(repo_dir: Path, commit_files):
+    """main: c1(v1.0.0) - c2 - c3(v1.1.0-rc.1) - c4(v1.1.0) - c5
+    hotfix:   c1 - h1(v1.0.1); c2 is cherry-picked nowhere"""
+    repo = init_repository(repo_dir)
+    person = Signature("t", "t@example.com")
+    c1 = commit_files(repo, {"f.txt": "1"}, ":bug: 1", [])
+    repo.create_tag("v1.0.0", c1, ObjectType.COMMIT, person, "t")
+    h1 = commit_files(repo, {"f.txt": "h1"}, ":bug: h1", [c1], ref="refs/heads/hotfix")
+    repo.create_tag("v1.0.1", h1, ObjectType.COMMIT, person, "t")
+    c2 = commit_files(repo, {"f.txt": "2"}, ":bug: 2", [c1])
+    c3 = commit_files(repo, {"f.txt": "3"}, ":bug: 3", [c2])
+    repo.create_tag("v1.1.0-rc.1", c3, ObjectType.COMMIT, person, "t")
+    c4 = commit_files(repo, {"f.txt": "4"}, ":bug: 4", [c3])
+    repo.create_tag("v1.1.0", c4, ObjectType.COMMIT, person, "t")
+    c5 = commit_files(repo, {"f.txt": "5"}, ":bug: 5", [c4])
+    return repo, (c1, h1, c2, c3, c4, c5)
+
+
+def test_first_containing_tags(tmp_path, commit_files):
+    repo, (c1, h1, c2, c3, c4, c5) = _make_history(tmp_path, commit_files)
+    found = first_containing_tags(
+        tmp_path, [str(c1), str(h1), str(c2)[:10], str(c3), str(c5)]
+    )
+    assert found == {
+        str(c1): "v1.0.0",
+        str(h1): "v1.0.1",
+        str(c2)[:10]: "v1.1.0",
+        str(c3): "v1.1.0",
+        str(c5): None,
+    }
+    found = first_containing_tags(tmp_path, [str(c2)], include_prereleases=True)
+    assert found == {str(c2): "v1.1.0-rc.1"}
+    with pytest.raises(NoSuchTagFoundError):
+        first_containing_tags(tmp_path, ["nope"])
+
+
+def test_contains_index_is_cached_per_tag_set(tmp_path, commit_files):
+    repo_dir = tmp_path / "repo"
+    cache_dir = tmp_path / "cache"
+    repo, (c1, h1, c2, c3, c4, c5) = _make_history(repo_dir, commit_files)
+    built = contains_index(repo, cache_dir=cache_dir)
+    assert (cache_dir / "contains.json").exists()
+    assert (cache_dir / "tags.json").exists()
+    loaded = ContainsIndex.load(cache_dir, built.fingerprint)
+    assert loaded is not None
+    assert len(loaded) == len(built) == 5
+    assert loaded.lookup(c2) == "v1.1.0"
+
+    # A new tag changes the fingerprint, so the map is rebuilt
+    repo.create_tag("v1.2.0", c5, ObjectType.COMMIT, Signature("t", "t@e"), "t")
+    rebuilt = contains_index(repo, cache_dir=cache_dir)
+    assert rebuilt.fingerprint != built.fingerprint
+    assert rebuilt.lookup(c5) == "v1.2.0"
+
+
+def test_build_without_tags(tmp_path):
+    repo = init_repository(tmp_path)
+    index = ContainsIndex.build(repo, semver_tag_index(repo))
+    assert len(index) == 0
+    assert index.lookup("0" * 40) is None
+
+
+def test_semver_tag_index_reuses_peeled_cache(tmp_path, commit_files):
+    repo_dir = tmp_path / "repo"
+    cache_dir = tmp_path / "cache"
+    repo, (c1, *_rest) = _make_history(repo_dir, commit_files)
+    first = semver_tag_index(repo, cache_dir)
+    second = semver_tag_index(repo, cache_dir)
+    assert first.entries == second.entries
+    assert first.find(first.entries[0][1])[2] == c1
+
+
+@pytest.mark.cli
+def test_cli_contains(tmp_path, commit_files):
+    repo, (c1, h1, c2, *_rest) = _make_history(tmp_path, commit_files)
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "girokmoji",
+            "contains",
+            str(c2),
+            "HEAD",
+            "HEAD~4",
+            "--repo-dir",
+            str(tmp_path),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines() == [
+        f"{c2}\tv1.1.0",
+        "HEAD\t-",
+        "HEAD~4\tv1.0.0",
+    ]
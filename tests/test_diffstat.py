@@ -0,0 +1,112 @@
+from pygit2 import Signature, init_repository
+from pygit2.enums import ObjectType
+
+from girokmoji import diffstat
+from girokmoji.changelog import change_log, structured_changelog
+from girokmoji.diffstat import DiffStatIndex, compute_diffstat
+from girokmoji.summary import DiffStat, SummaryCollector
+
+
+ALICE = Signature("alice", "alice@example.com", 1_700_000_000, 0)
+
+
+def _merged_repo(tmp_path, commit_files):
+    repo = init_repository(tmp_path)
+    base = commit_files(repo, {"a.txt": "a\n"}, ":tada: init", [], author=ALICE)
+    tagger = Signature("t", "t@example.com")
+    repo.create_tag("v1.0.0", base, ObjectType.COMMIT, tagger, "v1.0.0")
+    fix = commit_files(repo, {"a.txt": "b\nc\n"}, ":bug: fix", [base], author=ALICE)
+    side = commit_files(
+        repo,
+        {"s.txt": "1\n2\n3\n"},
+        ":sparkles: add",
+        [base],
+        ref="refs/heads/side",
+        author=ALICE,
+    )
+    merge = commit_files(
+        repo, {"s.txt": "1\n2\n3\n"}, "Merge side", [fix, side], author=ALICE
+    )
+    return repo, {"base": base, "fix": fix, "side": side, "merge": merge}
+
+
+def test_compute_diffstat(tmp_path, commit_files):
+    repo, ids = _merged_repo(tmp_path, commit_files)
+    assert compute_diffstat(repo[ids["base"]]) == DiffStat(1, 1, 0)
+    assert compute_diffstat(repo[ids["fix"]]) == DiffStat(1, 2, 1)
+    assert compute_diffstat(repo[ids["merge"]]) is None
+    assert compute_diffstat(repo[ids["merge"]], merges=True) == DiffStat(1, 3, 0)
+
+
+def test_diffstats_are_cached_and_computed_in_parallel(
+    tmp_path, monkeypatch, commit_files
+):
+    repo, ids = _merged_repo(tmp_path, commit_files)
+    commit_ids = [str(i) for i in ids.values()]
+    index = DiffStatIndex()
+    index.compute(tmp_path, commit_ids, workers=3)
+    assert index.get(str(ids["side"])) == DiffStat(1, 3, 0)
+    assert index.get(str(ids["merge"])) is None
+    assert index.save(tmp_path / "cache")
+
+    def fail(commit, *, merges=False):
+        raise RuntimeError("diffstat recomputed")
+
+    monkeypatch.setattr(diffstat, "compute_diffstat", fail)
+    cached = DiffStatIndex.load(tmp_path / "cache")
+    assert len(cached) == len(commit_ids)
+    cached.compute(tmp_path, commit_ids)
+    assert cached.get(str(ids["fix"])) == DiffStat(1, 2, 1)
+
+    # Merges skipped before are diffed when they are asked for
+    monkeypatch.undo()
+    cached.compute(tmp_path, commit_ids, merges=True, workers=1)
+    assert cached.get(str(ids["merge"])) is None
+    assert cached.get(str(ids["merge"]), merges=True) == DiffStat(1, 3, 0)
+
+
+def test_ids_that_are_not_commits_are_not_cached(tmp_path, commit_files):
+    repo, ids = _merged_repo(tmp_path, commit_files)
+    tree_id = str(repo[ids["base"]].tree.id)
+    index = DiffStatIndex()
+    index.compute(tmp_path, [tree_id, "0" * 40], workers=2)
+    assert len(index) == 0
+    assert not index.save(tmp_path / "cache")
+    index.compute(tmp_path, [tree_id, str(ids["fix"])], workers=1)
+    assert len(index) == 1
+
+
+def test_diffstat_rows_per_category():
+    class Commit:
+        def __init__(self, message, commit_id):
+            self.message = message
+            self.raw_message = message.encode()
+            self.message_encoding = "utf-8"
+            self.id = commit_id
+
+    stats = {"a": DiffStat(2, 10, 1), "b": DiffStat(1, 1, 1), "c": DiffStat(3, 0, 9)}
+    commits = [Commit(":bug: one", "a"), Commit(":bug: two", "b")]
+    commits.append(Commit(":sparkles: three", "c"))
+    collector = SummaryCollector(diffstat=True)
+    change = structured_changelog(commits, collector=collector)
+    collector.diffstats = stats.get
+    rows = dict(collector.summary(change, ["diffstat"]).statistics)
+    assert rows["Files changed"] == "6"
+    assert rows["Insertions"] == "11"
+    assert rows["Deletions"] == "11"
+    assert rows["Bug Fixes"] == "2 (3 files, +11 -2)"
+    assert rows["Feature and Functional Changes"] == "1 (3 files, +0 -9)"
+    plain = collector.summary(change, ["statistics"]).statistics
+    assert "Files changed" not in dict(plain)
+
+
+def test_diffstat_in_change_log(tmp_path, commit_files):
+    _merged_repo(tmp_path, commit_files)
+    args = ("proj", "2024-01-01", tmp_path, "v1.0.0", "HEAD")
+    notes = change_log(*args, sections=["diffstat"], cache_dir=tmp_path / "cache")
+    assert "- **Files changed:** 2" in notes
+    assert "- **Insertions:** 5" in notes
+    assert (tmp_path / "cache" / diffstat.CACHE_NAME).is_file()
+    merged = change_log(*args, sections=["diffstat"], diffstat_merges=True)
+    assert "- **Insertions:** 8" in merged
+    assert change_log(*args, sections=["diffstat"], spill_threshold=1) == notes
@@ -0,0 +1,114 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from pygit2 import Signature, init_repository
+from pygit2.enums import ObjectType
+
+from girokmoji import changelog
+from girokmoji.formats import change_log_formats, parse_formats, render_html
+
+
+class FakeCommit:
+    def __init__(self, message: str, commit_id: str):
+        self.message = message
+        self.raw_message = message.encode()
+        self.message_encoding = "utf-8"
+        self.id = commit_id
+
+
+COMMITS = [
+    FakeCommit(":sparkles: add <b>bold</b> & more", "c1"),
+    FakeCommit(":bug: fix one", "c2"),
+    FakeCommit(":sparkles: second feature", "c3"),
+    FakeCommit("no gitmoji", "c4"),
+]
+
+
+def test_parse_formats():
+    assert parse_formats("markdown, JSON,html,json") == ["markdown", "json", "html"]
+    with pytest.raises(ValueError):
+        parse_formats("markdown,xml")
+    with pytest.raises(ValueError):
+        parse_formats(" , ")
+
+
+def test_all_formats_from_one_pass(monkeypatch):
+    calls = []
+
+    def fake_get_tag_to_tag_commits(repo_dir, tail_tag, head_tag):
+        calls.append((tail_tag, head_tag))
+        return iter(COMMITS)
+
+    monkeypatch.setattr(
+        changelog, "get_tag_to_tag_commits", fake_get_tag_to_tag_commits
+    )
+    args = ("proj", "2024-01-01", Path("."), "v0", "v1")
+    rendered = change_log_formats(*args)
+    assert calls == [("v0", "v1")]
+    assert list(rendered) == ["markdown", "json", "html"]
+    assert rendered["markdown"] == changelog.change_log(*args)
+
+    doc = json.loads(rendered["json"])
+    assert doc["version"] == "v1"
+    features = doc["categories"][0]
+    assert [e["commit"] for g in features["groups"] for e in g["entries"]] == [
+        "c1",
+        "c3",
+    ]
+    assert doc["categories"][1]["groups"][0]["entries"] == [
+        {"title": "fix one", "commit": "c2"}
+    ]
+    assert "no gitmoji" not in rendered["json"]
+
+    assert "add &lt;b&gt;bold&lt;/b&gt; &amp; more" in rendered["html"]
+    assert '<a href="../../commit/c2">' in rendered["html"]
+
+    spilled = change_log_formats(*args, formats=["json", "html"], spill_threshold=1)
+    assert spilled == {"json": rendered["json"], "html": rendered["html"]}
+
+
+def test_render_html_without_entries():
+    change = changelog.structured_changelog([])
+    html = render_html("p", "v1", "2024-01-01", change)
+    assert html.count("<h2>") == 0
+    assert "Release Changelog v1" in html
+
+
+@pytest.mark.cli
+def test_cli_format_outputs(tmp_path):
+    repo_dir = tmp_path / "repo"
+    repo = init_repository(repo_dir)
+    person = Signature("t", "t@example.com")
+    parents = []
+    for msg in [":tada: init", ":bug: fix", ":sparkles: feat"]:
+        (repo_dir / "f.txt").write_text(msg)
+        repo.index.add_all()
+        repo.index.write()
+        parents = [
+            repo.create_commit(
+                "HEAD", person, person, msg, repo.index.write_tree(), parents
+            )
+        ]
+        if msg == ":tada: init":
+            repo.create_tag("v1.0.0", parents[0], ObjectType.COMMIT, person, "t")
+
+    cmd = [sys.executable, "-m", "girokmoji", "generate", "proj", "2024-01-01"]
+    cmd += [str(repo_dir), "v1.0.0", "HEAD", "--format", "markdown,json,html"]
+    result = subprocess.run(
+        cmd
+        + ["--output-json", str(tmp_path / "n.json")]
+        + ["--output-html", str(tmp_path / "n.html")],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "feat" in result.stdout
+    assert json.loads((tmp_path / "n.json").read_text())["categories"]
+    assert "<h2>" in (tmp_path / "n.html").read_text()
+
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "--output-<format>" in result.stderr
@@ -1,16 +1,24 @@
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import pytest
-from pygit2 import Signature, init_repository
+from pygit2 import Repository, Signature, init_repository
 from pygit2.enums import ObjectType, SortMode
 
 from girokmoji.exception import NoSuchTagFoundError, NotAncestorError
 from girokmoji.git import (
+    SemVerTagIndex,
+    TagResolver,
     _resolve_to_commit,
+    _within_window,
+    forget_tag_resolver,
     get_tag_to_tag_commits,
     iter_semver_tags,
     last_reachable_semver_tag,
     global_max_semver_tag,
+    parse_time_bound,
+    semver_tag_index,
+    tag_resolver,
 )
 from girokmoji.semver import SemVer
 
@@ -65,6 +73,68 @@ def test_resolve_to_commit_missing_ref_prefix(tmp_path):
         _resolve_to_commit(repo, "refs/tags/missing")
 
 
+def test_tag_resolver_uses_packed_peeled_values(tmp_path):
+    repo, person, f, c1 = _make_initial(tmp_path)
+    repo.create_tag("v1.0.0", c1, ObjectType.COMMIT, person, "t")
+    repo.references.compress()
+    resolver = TagResolver(repo)
+    assert resolver.tags["v1.0.0"][1] == c1
+    assert resolver.peeled_id("v1") == c1
+
+    # A loose ref moved after packing shadows the stale packed entry
+    f.write_text("b")
+    repo.index.add_all()
+    c2 = repo.create_commit(
+        "HEAD", person, person, ":art: b", repo.index.write_tree(), [c1]
+    )
+    repo.references.delete("refs/tags/v1")
+    repo.references.create("refs/tags/v1", c2)
+    resolver = TagResolver(repo)
+    assert resolver.tags["v1"] == (c2, None)
+    assert resolver.peeled_id("v1") == c2
+    assert [e[2] for e in semver_tag_index(repo).entries] == [c1]
+
+
+def test_tag_resolver_resolve_many_is_memoized(tmp_path):
+    repo, person, f, c1 = _make_initial(tmp_path)
+    resolver = tag_resolver(repo)
+    assert tag_resolver(repo) is resolver
+    found = resolver.resolve_many(["v1", "refs/tags/v1", "HEAD", str(c1)[:8]])
+    assert {c.id for c in found.values()} == {c1}
+    assert resolver.resolve("v1") is found["v1"]
+    assert _resolve_to_commit(repo, "refs/tags/v1") is found["refs/tags/v1"]
+    with pytest.raises(NoSuchTagFoundError):
+        resolver.resolve_many(["v1", "HEAD~5"])
+
+    # HEAD is not memoized: it follows new commits
+    f.write_text("b")
+    repo.index.add_all()
+    c2 = repo.create_commit(
+        "HEAD", person, person, ":bug: two", repo.index.write_tree(), [c1]
+    )
+    assert _resolve_to_commit(repo, "HEAD").id == c2
+    forget_tag_resolver(repo)
+    assert tag_resolver(repo) is not resolver
+
+
+def test_tag_resolver_is_scoped_to_its_repository(tmp_path):
+    repo, person, f, c1 = _make_initial(tmp_path)
+    assert _resolve_to_commit(repo, "v1").id == c1
+    # Tags moved and created behind girokmoji's back (git tag -f, a fetch)
+    f.write_text("b")
+    repo.index.add_all()
+    c2 = repo.create_commit(
+        "HEAD", person, person, ":bug: two", repo.index.write_tree(), [c1]
+    )
+    repo.references.delete("refs/tags/v1")
+    repo.create_tag("v1", c2, ObjectType.COMMIT, person, "moved")
+    repo.create_tag("v2", c2, ObjectType.COMMIT, person, "t")
+    other = Repository(str(tmp_path))
+    assert tag_resolver(other) is not tag_resolver(repo)
+    assert _resolve_to_commit(other, "v1").id == c2
+    assert _resolve_to_commit(other, "refs/tags/v2").id == c2
+
+
 def test_get_tag_to_tag_commits_success_and_error(tmp_path):
     repo, person, f, c1 = _make_initial(tmp_path)
     f.write_text("b")
@@ -580,3 +650,257 @@ def test_global_max_semver_tag_returns_highest(tmp_path):
         "V2.0.0",
         SemVer.parse("2.0.0"),
     )
+
+
+def _tag_index(*names: str) -> SemVerTagIndex:
+    entries = []
+    for name in names:
+        ver = SemVer.parse(name.removeprefix("v"))
+        entries.append((name, ver, name))
+    return SemVerTagIndex("", entries)
+
+
+def names(entries) -> list[str]:
+    return [e[0] for e in entries]
+
+
+def test_semver_tag_index_range_queries():
+    index = _tag_index(
+        "v3.0.0-rc.1",
+        "v3.0.0",
+        "v3.4.1",
+        "v4.1.0",
+        "v4.2.0-rc.1",
+        "v4.2.0-rc.2",
+        "v4.2.0",
+        "v5.0.0-alpha",
+        "v5.0.0-beta",
+        "v2.9.0",
+    )
+    assert names(index.in_major(3)) == ["v3.0.0-rc.1", "v3.0.0", "v3.4.1"]
+    assert names(index.between(SemVer(3, 0, 0), SemVer(4, 1, 0))) == [
+        "v3.0.0",
+        "v3.4.1",
+    ]
+    assert names(
+        index.between(SemVer(4, 1, 0), SemVer(4, 2, 0), include_high=True)
+    ) == ["v4.1.0", "v4.2.0-rc.1", "v4.2.0-rc.2", "v4.2.0"]
+    assert index.predecessor(SemVer(4, 2, 0))[0] == "v4.2.0-rc.2"
+    assert index.predecessor(SemVer(4, 2, 0), stable_only=True)[0] == "v4.1.0"
+    assert index.predecessor(SemVer(2, 9, 0)) is None
+    assert index.latest_in_major(4)[0] == "v4.2.0"
+    assert index.latest_in_major(5) is None
+    assert index.latest_in_major(5, include_prereleases=True)[0] == "v5.0.0-beta"
+    assert names(index.prereleases_of(SemVer(4, 2, 0))) == [
+        "v4.2.0-rc.1",
+        "v4.2.0-rc.2",
+    ]
+    assert names(index.prereleases_of(SemVer.parse("5.0.0-beta"))) == [
+        "v5.0.0-alpha",
+        "v5.0.0-beta",
+    ]
+    assert index.find(SemVer(3, 4, 1))[0] == "v3.4.1"
+    assert index.find(SemVer(3, 4, 2)) is None
+
+
+def test_get_tag_to_tag_commits_auto_tail(tmp_path):
+    repo, person, f, c1 = _make_initial(tmp_path)
+    repo.create_tag("v1.0.0", c1, ObjectType.COMMIT, person, "t")
+    f.write_text("b")
+    repo.index.add_all()
+    c2 = repo.create_commit(
+        "HEAD", person, person, ":art: two", repo.index.write_tree(), [c1]
+    )
+    repo.create_tag("v1.1.0-rc.1", c2, ObjectType.COMMIT, person, "t")
+    f.write_text("c")
+    repo.index.add_all()
+    c3 = repo.create_commit(
+        "HEAD", person, person, ":bug: three", repo.index.write_tree(), [c2]
+    )
+    repo.create_tag("v1.1.0", c3, ObjectType.COMMIT, person, "t")
+
+    ids = [c.id for c in get_tag_to_tag_commits(tmp_path, "auto", "v1.1.0")]
+    assert ids == [c3, c2]
+    ids = [c.id for c in get_tag_to_tag_commits(tmp_path, "auto", "v1.1.0-rc.1")]
+    assert ids == [c2]
+    # No predecessor: everything reachable from head
+    ids = [c.id for c in get_tag_to_tag_commits(tmp_path, "auto", "v1.0.0")]
+    assert ids == [c1]
+    with pytest.raises(NoSuchTagFoundError):
+        list(get_tag_to_tag_commits(tmp_path, "auto", "v1"))
+
+
+def test_auto_tail_of_prefixed_tag(tmp_path):
+    repo, person, f, c1 = _make_initial(tmp_path)
+    repo.create_tag("pkg-a/v1.0.0", c1, ObjectType.COMMIT, person, "t")
+    ids = [c1]
+    for n in (2, 3):
+        f.write_text(str(n))
+        repo.index.add_all()
+        ids.append(
+            repo.create_commit(
+                "HEAD", person, person, f":bug: {n}", repo.index.write_tree(), ids[-1:]
+            )
+        )
+    # A higher tag of another package in between must not be the tail
+    repo.create_tag("pkg-b/v1.1.0", ids[1], ObjectType.COMMIT, person, "t")
+    repo.create_tag("pkg-a/v1.2.0", ids[2], ObjectType.COMMIT, person, "t")
+    cache_dir = tmp_path / "cache"
+    got = get_tag_to_tag_commits(tmp_path, "auto", "pkg-a/v1.2.0", cache_dir=cache_dir)
+    assert [c.id for c in got] == [ids[2], ids[1]]
+    assert (cache_dir / "tags.json").is_file()
+
+
+def test_auto_tail_of_root_tag_skips_package_tags(tmp_path):
+    repo, person, f, c1 = _make_initial(tmp_path)
+    repo.create_tag("v1.0.0", c1, ObjectType.COMMIT, person, "t")
+    ids = [c1]
+    for n in (2, 3):
+        f.write_text(str(n))
+        repo.index.add_all()
+        ids.append(
+            repo.create_commit(
+                "HEAD", person, person, f":bug: {n}", repo.index.write_tree(), ids[-1:]
+            )
+        )
+    repo.create_tag("pkg-b/v1.5.0", ids[1], ObjectType.COMMIT, person, "t")
+    repo.create_tag("v2.0.0", ids[2], ObjectType.COMMIT, person, "t")
+    got = get_tag_to_tag_commits(tmp_path, "auto", "v2.0.0")
+    assert [c.id for c in got] == [ids[2], ids[1]]
+
+
+def _dated_history(repo_dir: Path, days: list[int]):
+    """Linear history with one commit per entry, committed on 2025-08-<day>."""
+    repo = init_repository(repo_dir)
+    ids = []
+    for day in days:
+        when = int(datetime(2025, 8, day, 12, tzinfo=timezone.utc).timestamp())
+        person = Signature("t", "t@example.com", when, 0)
+        (repo_dir / "f.txt").write_text(str(day))
+        repo.index.add_all()
+        ids.append(
+            repo.create_commit(
+                "HEAD",
+                person,
+                person,
+                f":bug: day {day}",
+                repo.index.write_tree(),
+                ids[-1:],
+            )
+        )
+    return repo, ids
+
+
+def test_parse_time_bound():
+    assert parse_time_bound("2025-08-07") == datetime(2025, 8, 7, tzinfo=timezone.utc)
+    assert parse_time_bound("2025-08-07", end_of_day=True) == datetime(
+        2025, 8, 7, 23, 59, 59, tzinfo=timezone.utc
+    )
+    assert parse_time_bound("2025-08-07T10:00:00Z") == datetime(
+        2025, 8, 7, 10, tzinfo=timezone.utc
+    )
+    assert parse_time_bound("2025-08-07T10:00:00+09:00").utcoffset() == timedelta(
+        hours=9
+    )
+
+
+def test_date_window_with_no_tail(tmp_path):
+    repo, ids = _dated_history(tmp_path, [1, 3, 5, 8, 10])
+    since = parse_time_bound("2025-08-03")
+    until = parse_time_bound("2025-08-08", end_of_day=True)
+    got = [
+        c.id
+        for c in get_tag_to_tag_commits(
+            tmp_path, "none", "HEAD", since=since, until=until
+        )
+    ]
+    assert got == [ids[3], ids[2], ids[1]]
+
+
+def test_date_window_combines_with_tag_range(tmp_path):
+    repo, ids = _dated_history(tmp_path, [1, 3, 5, 8, 10])
+    person = Signature("t", "t@example.com")
+    repo.create_tag("v1.0.0", ids[2], ObjectType.COMMIT, person, "t")
+    got = [
+        c.id
+        for c in get_tag_to_tag_commits(
+            tmp_path, "v1.0.0", "HEAD", since=parse_time_bound("2025-08-09")
+        )
+    ]
+    assert got == [ids[4]]
+
+
+def test_date_window_stops_after_skew_tolerance():
+    class Fake:
+        def __init__(self, day):
+            self.commit_time = int(
+                datetime(2025, 8, day, tzinfo=timezone.utc).timestamp()
+            )
+
+    def commits():
+        yield Fake(10)
+        yield Fake(6)
+        # Older than since, but within the skew tolerance: keep walking
+        yield Fake(4)
+        # Parent dated ahead of its child
+        yield Fake(7)
+        yield Fake(2)
+        raise AssertionError("walked past since - clock_skew")
+
+    since = datetime(2025, 8, 5, tzinfo=timezone.utc)
+    got = list(
+        _within_window(commits(), since, None, timedelta(days=2), stop_early=True)
+    )
+    assert [c.commit_time for c in got] == [
+        Fake(10).commit_time,
+        Fake(6).commit_time,
+        Fake(7).commit_time,
+    ]
+
+
+def test_walk_keeps_the_default_order_without_a_window(tmp_path):
+    # a1 is committed before its parent base (clock skew), so the date order
+    # of the default walk lists base before a1
+    repo = init_repository(tmp_path)
+    tree = repo.TreeBuilder().write()
+
+    def commit(day, parents, ref=None):
+        when = int(datetime(2025, 8, day, 12, tzinfo=timezone.utc).timestamp())
+        person = Signature("t", "t@example.com", when, 0)
+        return repo.create_commit(ref, person, person, f":bug: {day}", tree, parents)
+
+    base = commit(4, [])
+    a1 = commit(2, [base])
+    c1 = commit(5, [base])
+    merge = commit(9, [a1, c1], "HEAD")
+    got = [c.id for c in get_tag_to_tag_commits(tmp_path, "none", "HEAD")]
+    assert got == [c.id for c in repo.walk(merge)]
+    topological = SortMode.TOPOLOGICAL | SortMode.TIME
+    assert got != [c.id for c in repo.walk(merge, topological)]
+    windowed = get_tag_to_tag_commits(
+        tmp_path, "none", "HEAD", since=parse_time_bound("2025-08-01")
+    )
+    assert [c.id for c in windowed] == [c.id for c in repo.walk(merge, SortMode.TIME)]
+
+
+def test_date_window_oldest_first_is_not_cut_short(tmp_path):
+    repo, ids = _dated_history(tmp_path, [1, 3, 5, 8, 10])
+    since = parse_time_bound("2025-08-04")
+    oldest_first = int(SortMode.TIME) | int(SortMode.REVERSE)
+    got = [
+        c.id
+        for c in get_tag_to_tag_commits(
+            tmp_path, "none", "HEAD", sorting=oldest_first, since=since
+        )
+    ]
+    assert got == [ids[2], ids[3], ids[4]]
+    unsorted = get_tag_to_tag_commits(
+        tmp_path, "none", "HEAD", sorting=int(SortMode.NONE), since=since
+    )
+    assert sorted(c.id for c in unsorted) == sorted(ids[2:])
+    with pytest.raises(ValueError):
+        list(
+            get_tag_to_tag_commits(
+                tmp_path, "none", "HEAD", since=since, clock_skew=timedelta(hours=-1)
+            )
+        )
@@ -0,0 +1,85 @@
+from pathlib import Path
+
+from pygit2 import Signature, init_repository
+from pygit2.enums import ObjectType
+
+from girokmoji.git import get_tag_to_tag_commits
+from girokmoji.mergebase import CACHE_NAME, MergeBaseCache, merge_base_cache
+
+
+class CountingRepo:
+    def __init__(self, repo):
+        self.repo = repo
+        self.calls = 0
+
+    def merge_base(self, a, b):
+        self.calls += 1
+        return self.repo.merge_base(a, b)
+
+
+def _make_diverged(repo_dir: Path, commit_files):
+    """base - m1 (v1.1.0) on main, base - h1 (v1.0.1) on hotfix, plus an
+    unrelated orphan root tagged v0.0.1."""
+    repo = init_repository(repo_dir)
+    person = Signature("t", "t@example.com")
+    base = commit_files(repo, {"f.txt": "base"}, ":bug: base", [])
+    repo.create_tag("v1.0.0", base, ObjectType.COMMIT, person, "t")
+    m1 = commit_files(repo, {"f.txt": "m1"}, ":bug: m1", [base])
+    repo.create_tag("v1.1.0", m1, ObjectType.COMMIT, person, "t")
+    h1 = commit_files(
+        repo, {"f.txt": "h1"}, ":bug: h1", [base], ref="refs/heads/hotfix"
+    )
+    repo.create_tag("v1.0.1", h1, ObjectType.COMMIT, person, "t")
+    orphan = commit_files(repo, {"f.txt": "o"}, ":bug: o", [], ref="refs/heads/orphan")
+    repo.create_tag("v0.0.1", orphan, ObjectType.COMMIT, person, "t")
+    return repo, base, m1, h1, orphan
+
+
+def test_merge_base_is_memoized_per_unordered_pair(tmp_path, commit_files):
+    repo, base, m1, h1, orphan = _make_diverged(tmp_path, commit_files)
+    counting = CountingRepo(repo)
+    cache = MergeBaseCache()
+    assert cache.merge_base(counting, m1, h1) == base
+    assert cache.merge_base(counting, h1, m1) == base
+    assert cache.merge_base(counting, m1, orphan) is None
+    assert cache.merge_base(counting, orphan, m1) is None
+    assert counting.calls == 2
+
+    assert cache.is_ancestor(counting, base, m1)
+    assert not cache.is_ancestor(counting, m1, base)
+    assert not cache.is_ancestor(counting, m1, m1)
+    assert not cache.is_ancestor(counting, h1, m1)
+    assert counting.calls == 3
+
+
+def test_cache_is_shared_and_persisted(tmp_path, commit_files):
+    repo_dir = tmp_path / "repo"
+    cache_dir = tmp_path / "cache"
+    repo, base, m1, h1, orphan = _make_diverged(repo_dir, commit_files)
+    ids = [
+        c.id
+        for c in get_tag_to_tag_commits(
+            repo_dir, "v1.1.0", "v1.0.1", quiet=True, cache_dir=cache_dir
+        )
+    ]
+    assert ids == [h1]
+    list(get_tag_to_tag_commits(repo_dir, "v0.0.1", "v1.0.1", quiet=True))
+    # Both range computations went through the same in-memory table
+    assert len(merge_base_cache(repo)) == 2
+    assert (cache_dir / CACHE_NAME).exists()
+
+    fresh = MergeBaseCache()
+    fresh.load(cache_dir)
+    assert len(fresh) == 1
+    counting = CountingRepo(repo)
+    assert fresh.merge_base(counting, h1, m1) == base
+    assert counting.calls == 0
+    # Nothing new was computed, so there is nothing to write back
+    assert fresh.save(cache_dir) is False
+
+
+def test_load_ignores_corrupt_cache(tmp_path):
+    (tmp_path / CACHE_NAME).write_text('{"version": 1, "bases": []}')
+    cache = MergeBaseCache()
+    cache.load(tmp_path)
+    assert len(cache) == 0
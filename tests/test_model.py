@@ -0,0 +1,137 @@
+import json
+import subprocess
+import sys
+import zlib
+
+import pytest
+from pygit2 import Signature, init_repository
+from pygit2.enums import ObjectType
+
+from girokmoji import changelog, model
+from girokmoji.exception import ModelFormatError
+from girokmoji.render import gen_markdown
+
+
+class FakeCommit:
+    def __init__(self, message: str, commit_id: str):
+        self.message = message
+        self.raw_message = message.encode()
+        self.message_encoding = "utf-8"
+        self.id = commit_id
+
+
+COMMITS = [
+    FakeCommit(":sparkles: add feature\n\nbody", "a" * 40),
+    FakeCommit(":bug: fix ünïcode 🐛", "0123456789abcdef" * 2 + "01234567"),
+    FakeCommit(":sparkles: second feature", "short-id"),
+    FakeCommit("no gitmoji", "c4"),
+]
+
+
+def test_json_and_binary_round_trip():
+    change = changelog.structured_changelog(COMMITS)
+    expected = gen_markdown("p", "v1", "2024-01-01", change)
+
+    from_json = model.loads(model.dump_json(change))
+    data = model.dump_binary(change)
+    assert data.startswith(model.BINARY_MAGIC)
+    from_binary = model.loads(data)
+
+    assert from_json == from_binary == model.to_model(change)
+    assert gen_markdown("p", "v1", "2024-01-01", from_binary) == expected
+    # Loaded models can be dumped again unchanged
+    assert model.dump_binary(from_json) == data
+
+    doc = json.loads(model.dump_json(change))
+    assert doc["format"] == "girokmoji-changelog" and doc["version"] == 1
+    assert doc["categories"][0]["groups"][0]["entries"][1] == [
+        "second feature",
+        "short-id",
+    ]
+
+
+def test_binary_is_compact():
+    commits = [FakeCommit(f":bug: fix {i}", f"{i:040x}") for i in range(500)]
+    change = changelog.structured_changelog(commits)
+    assert len(model.dump_binary(change)) < len(model.dump_json(change)) / 2
+
+
+def test_spilled_change_serializes_like_in_memory(tmp_path):
+    change = changelog.structured_changelog(COMMITS)
+    with changelog.SpillStore(1, tmp_path) as store:
+        spilled = changelog.spilling_changelog(COMMITS, store)
+        assert model.dump_binary(spilled) == model.dump_binary(change)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"{}",
+        b'{"format": "girokmoji-changelog", "version": 99, "categories": []}',
+        b'{"format": "girokmoji-changelog", "version": 1, '
+        b'"categories": [{"category": "Nope", "groups": []}]}',
+        model.BINARY_MAGIC + b"\x02",
+        model.BINARY_MAGIC + b"\x01not zlib",
+    ],
+)
+def test_invalid_models_are_rejected(data):
+    with pytest.raises(ModelFormatError):
+        model.loads(data)
+
+
+def test_truncated_binary_is_rejected():
+    data = model.dump_binary(changelog.structured_changelog(COMMITS))
+    payload = zlib.decompress(data[5:])
+    with pytest.raises(ModelFormatError):
+        model.loads(data[:5] + zlib.compress(payload[:-3]))
+
+
+def test_render_without_pygit2(tmp_path):
+    path = tmp_path / "notes.model"
+    model.write_model(path, changelog.structured_changelog(COMMITS), binary=True)
+    script = (
+        "import sys\n"
+        "from girokmoji.model import read_model\n"
+        "from girokmoji.render import gen_markdown\n"
+        f"print(gen_markdown('p', 'v1', 'd', read_model({str(path)!r})))\n"
+        "assert 'pygit2' not in sys.modules, 'pygit2 was imported'\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert "second feature" in result.stdout
+
+
+@pytest.mark.cli
+def test_cli_generate_model_and_render(tmp_path):
+    repo_dir = tmp_path / "repo"
+    repo = init_repository(repo_dir)
+    person = Signature("t", "t@example.com")
+    parents = []
+    for msg in [":tada: init", ":bug: fix", ":sparkles: feat"]:
+        (repo_dir / "f.txt").write_text(msg)
+        repo.index.add_all()
+        repo.index.write()
+        parents = [
+            repo.create_commit(
+                "HEAD", person, person, msg, repo.index.write_tree(), parents
+            )
+        ]
+        if msg == ":tada: init":
+            repo.create_tag("v1.0.0", parents[0], ObjectType.COMMIT, person, "t")
+
+    model_path = tmp_path / "notes.bin"
+    generate = [sys.executable, "-m", "girokmoji", "generate", "proj", "2024-01-01"]
+    generate += [str(repo_dir), "v1.0.0", "HEAD", "--release-version", "v1.1.0"]
+    generate += ["--output-model", str(model_path), "--model-format", "binary"]
+    generated = subprocess.run(generate, capture_output=True, text=True)
+    assert generated.returncode == 0, generated.stderr
+    assert "feat" in generated.stdout
+
+    render = [sys.executable, "-m", "girokmoji", "render", str(model_path)]
+    render += ["proj", "2024-01-01", "v1.1.0"]
+    rendered = subprocess.run(render, capture_output=True, text=True)
+    assert rendered.returncode == 0, rendered.stderr
+    assert rendered.stdout == generated.stdout
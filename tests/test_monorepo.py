@@ -0,0 +1,147 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from pygit2 import GitError, Signature, init_repository
+from pygit2.enums import ObjectType
+
+from girokmoji.git import build_semver_tag_indexes
+from girokmoji.monorepo import PackageSpec, assign_commits
+from girokmoji.pathindex import ChangedPathsIndex
+from girokmoji.release import release_many
+
+
+def _make_monorepo(repo_dir: Path, commit_files):
+    repo = init_repository(repo_dir)
+    person = Signature("t", "t@example.com")
+    c1 = commit_files(
+        repo,
+        {"packages/a/x.txt": "1", "packages/b/y.txt": "1"},
+        ":tada: init",
+        [],
+    )
+    repo.create_tag("pkg-a/v1.0.0", c1, ObjectType.COMMIT, person, "a1")
+    c2 = commit_files(repo, {"packages/b/y.txt": "2"}, ":bug: patch b", [c1])
+    repo.create_tag("pkg-b/v0.3.0", c2, ObjectType.COMMIT, person, "b1")
+    c3 = commit_files(repo, {"packages/a/x.txt": "2"}, ":sparkles: feat a", [c2])
+    c4 = commit_files(
+        repo,
+        {"packages/a/x.txt": "3", "packages/b/y.txt": "3"},
+        ":bug: fix both",
+        [c3],
+    )
+    return repo, (c1, c2, c3, c4)
+
+
+def test_package_spec_parse():
+    spec = PackageSpec.parse("./packages/pkg-a/=pkg-a/v*")
+    assert spec == PackageSpec("packages/pkg-a", "pkg-a/v", "pkg-a")
+    assert PackageSpec.parse("tools/cli=v").name == "cli"
+    with pytest.raises(ValueError):
+        PackageSpec.parse("packages/a")
+
+
+def test_build_semver_tag_indexes_single_pass(tmp_path, commit_files):
+    repo, (c1, c2, *_rest) = _make_monorepo(tmp_path, commit_files)
+    indexes = build_semver_tag_indexes(repo, ["pkg-a/v", "pkg-b/v", "pkg-c/v"])
+    assert indexes["pkg-a/v"].max()[0] == "pkg-a/v1.0.0"
+    assert indexes["pkg-b/v"].entries[0][2] == c2
+    assert len(indexes["pkg-c/v"]) == 0
+    assert indexes["pkg-b/v"].last_reachable(repo, c1) is None
+
+
+def test_assign_commits_uses_per_package_tails(tmp_path, commit_files):
+    repo, (c1, c2, c3, c4) = _make_monorepo(tmp_path, commit_files)
+    specs = [
+        PackageSpec.parse("packages/a=pkg-a/v"),
+        PackageSpec.parse("packages/b=pkg-b/v"),
+    ]
+    assigned = assign_commits(repo, c4, specs, [c1, c2], ChangedPathsIndex())
+    assert [c.id for c in assigned[0]] == [c4, c3]
+    assert [c.id for c in assigned[1]] == [c4]
+
+
+def test_assign_commits_without_tail_walks_full_history(tmp_path, commit_files):
+    repo, (c1, c2, c3, c4) = _make_monorepo(tmp_path, commit_files)
+    specs = [PackageSpec.parse("packages/b=pkg-b/v")]
+    assigned = assign_commits(repo, c4, specs, [None], ChangedPathsIndex())
+    assert [c.id for c in assigned[0]] == [c4, c2, c1]
+
+
+def test_release_many_tags_and_notes(tmp_path, commit_files):
+    repo, _ = _make_monorepo(tmp_path, commit_files)
+    notes = release_many(
+        ["packages/a=pkg-a/v*", "packages/b=pkg-b/v*", "packages/c=pkg-c/v*"],
+        repo_dir=tmp_path,
+        bump="minor",
+        release_date="2024-01-01",
+    )
+    assert set(notes) == {"pkg-a", "pkg-b"}
+    assert "feat a" in notes["pkg-a"] and "patch b" not in notes["pkg-b"]
+    tags = {r for r in repo.references if r.startswith("refs/tags/")}
+    assert "refs/tags/pkg-a/v1.1.0" in tags
+    assert "refs/tags/pkg-b/v0.4.0" in tags
+    assert not any(t.startswith("refs/tags/pkg-c/") for t in tags)
+
+
+def test_release_many_tags_nothing_when_a_tag_exists(tmp_path, commit_files):
+    repo, (c1, *_rest) = _make_monorepo(tmp_path, commit_files)
+    person = Signature("t", "t@example.com")
+    # pkg-b/v0.3.1 already exists off the released branch
+    side = repo.create_commit(
+        None, person, person, ":bug: side", repo[c1].tree.id, [c1]
+    )
+    repo.create_tag("pkg-b/v0.3.1", side, ObjectType.COMMIT, person, "b2")
+    before = set(repo.references)
+    with pytest.raises((ValueError, GitError)):
+        release_many(
+            ["packages/a=pkg-a/v", "packages/b=pkg-b/v"],
+            repo_dir=tmp_path,
+            version_floor_scope="reachable",
+        )
+    assert set(repo.references) == before
+
+
+def test_release_many_payloads_and_duplicates(tmp_path, commit_files):
+    _make_monorepo(tmp_path, commit_files)
+    notes = release_many(["packages/b=pkg-b/v"], repo_dir=tmp_path, github_payload=True)
+    assert json.loads(notes["pkg-b"])["tag_name"] == "pkg-b/v0.3.1"
+    with pytest.raises(ValueError):
+        release_many(["packages/a=x/v", "other/a=x/v"], repo_dir=tmp_path)
+
+
+def test_cli_release_many_output_dir(monkeypatch, tmp_path, commit_files):
+    repo_dir = tmp_path / "repo"
+    _make_monorepo(repo_dir, commit_files)
+    out = tmp_path / "out"
+    import girokmoji.__main__ as giromain
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "girokmoji",
+            "release-many",
+            "--package",
+            "packages/a=pkg-a/v*",
+            "--repo-dir",
+            str(repo_dir),
+            "--output-dir",
+            str(out),
+        ],
+    )
+    giromain.main()
+    assert "feat a" in (out / "pkg-a.md").read_text()
+
+
+def test_release_many_auto_bump_per_package(tmp_path, commit_files):
+    repo, _ = _make_monorepo(tmp_path, commit_files)
+    release_many(
+        ["packages/a=pkg-a/v", "packages/b=pkg-b/v"],
+        repo_dir=tmp_path,
+        bump="auto",
+    )
+    tags = {r for r in repo.references if r.startswith("refs/tags/")}
+    assert "refs/tags/pkg-a/v1.1.0" in tags
+    assert "refs/tags/pkg-b/v0.3.1" in tags
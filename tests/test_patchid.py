@@ -0,0 +1,98 @@
+from pygit2 import Signature, init_repository
+from pygit2.enums import ObjectType
+
+from girokmoji import patchid
+from girokmoji.changelog import change_log, structured_changelog
+from girokmoji.patchid import Deduplicator, PatchIdIndex, compute_patch_id
+
+
+def _cherry_picked_repo(tmp_path, commit_files):
+    """A hotfix cherry-picked onto a release branch that is merged back."""
+    repo = init_repository(tmp_path)
+    alice = Signature("alice", "alice@example.com", 1_700_000_000, 0)
+    bob = Signature("bob", "bob@example.com", 1_700_000_100, 0)
+    base = commit_files(repo, {"a.txt": "a"}, ":tada: init", [], author=alice)
+    repo.create_tag("v1.0.0", base, ObjectType.COMMIT, alice, "v1.0.0")
+    fix = commit_files(repo, {"h.txt": "fix"}, ":bug: fix crash", [base], author=alice)
+    feat = commit_files(repo, {"f.txt": "f"}, ":sparkles: feature", [fix], author=alice)
+    picked = commit_files(
+        repo,
+        {"h.txt": "fix"},
+        ":bug: fix crash (cherry picked)",
+        [base],
+        ref="refs/heads/release",
+        author=bob,
+    )
+    # Same title as the fix, but another author and change
+    again = commit_files(
+        repo,
+        {"r.txt": "r"},
+        ":bug: fix crash",
+        [picked],
+        ref="refs/heads/release",
+        author=bob,
+    )
+    merge = commit_files(
+        repo, {"r.txt": "r"}, "Merge release", [feat, again], author=alice
+    )
+    return repo, {"fix": fix, "picked": picked, "again": again, "merge": merge}
+
+
+def test_patch_ids(tmp_path, commit_files):
+    repo, ids = _cherry_picked_repo(tmp_path, commit_files)
+    assert compute_patch_id(repo[ids["fix"]]) == compute_patch_id(repo[ids["picked"]])
+    assert compute_patch_id(repo[ids["fix"]]) != compute_patch_id(repo[ids["again"]])
+    assert compute_patch_id(repo[ids["merge"]]) is None
+
+
+def test_dedup_collapses_cherry_picks(tmp_path, commit_files):
+    _, ids = _cherry_picked_repo(tmp_path, commit_files)
+    args = ("proj", "2024-01-01", tmp_path, "v1.0.0", "HEAD")
+    plain = change_log(*args)
+    deduped = change_log(*args, dedup=True, cache_dir=tmp_path / "cache")
+    assert plain.count("fix crash") == 3
+    assert deduped.count("fix crash") == 2
+    assert (str(ids["fix"]) in deduped) != (str(ids["picked"]) in deduped)
+    assert str(ids["again"]) in deduped and "feature" in deduped
+    assert change_log(*args, dedup=True, spill_threshold=1) == deduped
+
+
+def test_patch_ids_are_cached_and_computed_in_parallel(
+    tmp_path, monkeypatch, commit_files
+):
+    repo, ids = _cherry_picked_repo(tmp_path, commit_files)
+    commit_ids = [str(i) for i in ids.values()]
+    index = PatchIdIndex()
+    index.compute(tmp_path, commit_ids, workers=3)
+    assert index.get(str(ids["fix"])) == index.get(str(ids["picked"]))
+    assert index.get(str(ids["merge"])) is None
+    assert index.save(tmp_path / "cache")
+
+    def fail(commit):
+        raise AssertionError("patch-id recomputed")
+
+    monkeypatch.setattr(patchid, "compute_patch_id", fail)
+    loaded = PatchIdIndex.load(tmp_path / "cache")
+    loaded.compute(tmp_path, commit_ids)
+    assert len(loaded) == len(commit_ids)
+    assert not loaded.save(tmp_path / "cache")
+
+
+class FakeCommit:
+    def __init__(self, message: str, commit_id: str):
+        self.message = message
+        self.raw_message = message.encode()
+        self.message_encoding = "utf-8"
+        self.id = commit_id
+
+
+def test_dedup_by_key_without_a_repository():
+    commits = [
+        FakeCommit(":bug: fix one", "c1"),
+        FakeCommit(":bug: fix one\n\nbody differs", "c2"),
+        FakeCommit(":bug: fix two", "c3"),
+    ]
+    dedup = Deduplicator()
+    change = structured_changelog(commits, dedup=dedup)
+    assert [c.id for c in change["Bug Fixes"]] == ["c1", "c3"]
+    assert dedup.dropped == ["c2"]
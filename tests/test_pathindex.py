@@ -0,0 +1,108 @@
+from pathlib import Path
+
+from pygit2 import Signature, init_repository
+from pygit2.enums import ObjectType
+
+from girokmoji.changelog import change_log
+from girokmoji.git import get_tag_to_tag_commits
+from girokmoji.pathindex import (
+    ChangedPathsIndex,
+    compute_changed_paths,
+    normalize_prefix,
+    touches,
+)
+
+
+def _make_monorepo(repo_dir: Path, commit_files):
+    repo = init_repository(repo_dir)
+    person = Signature("t", "t@example.com")
+    c1 = commit_files(
+        repo,
+        {"packages/a/x.txt": "1", "packages/ab/y.txt": "1", "README": "r"},
+        ":tada: init",
+        [],
+    )
+    repo.create_tag("v1.0.0", c1, ObjectType.COMMIT, person, "t1")
+    c2 = commit_files(repo, {"packages/a/x.txt": "2"}, ":bug: fix a", [c1])
+    c3 = commit_files(repo, {"packages/ab/y.txt": "2"}, ":sparkles: feat ab", [c2])
+    c4 = commit_files(repo, {"README": "r2"}, ":memo: docs", [c3])
+    repo.create_tag("v1.1.0", c4, ObjectType.COMMIT, person, "t2")
+    return repo, (c1, c2, c3, c4)
+
+
+def test_normalize_prefix():
+    assert normalize_prefix("./packages/a/") == "packages/a"
+    assert normalize_prefix("packages\\a") == "packages/a"
+    assert normalize_prefix("/") == ""
+
+
+def test_touches_respects_directory_boundary():
+    paths = ("packages/a-b/z", "packages/ab/y.txt", "packages/a/x.txt")
+    paths = tuple(sorted(paths))
+    assert touches(paths, "packages/a")
+    assert touches(paths, "packages/ab/y.txt")
+    assert not touches(paths, "packages/abc")
+    assert not touches(("packages/ab/y.txt",), "packages/a")
+    assert touches(paths, "")
+    assert not touches((), "")
+
+
+def test_compute_changed_paths_root_and_child(tmp_path, commit_files):
+    repo, (c1, c2, *_rest) = _make_monorepo(tmp_path, commit_files)
+    assert compute_changed_paths(repo[c1]) == (
+        "README",
+        "packages/a/x.txt",
+        "packages/ab/y.txt",
+    )
+    assert compute_changed_paths(repo[c2]) == ("packages/a/x.txt",)
+
+
+def test_get_tag_to_tag_commits_path_filter(tmp_path, commit_files):
+    repo, (c1, c2, c3, c4) = _make_monorepo(tmp_path, commit_files)
+    ids = [
+        c.id
+        for c in get_tag_to_tag_commits(
+            tmp_path, "v1.0.0", "v1.1.0", paths=["packages/a"]
+        )
+    ]
+    assert ids == [c2]
+    ids = [
+        c.id
+        for c in get_tag_to_tag_commits(
+            tmp_path, "v1.0.0", "v1.1.0", paths=["./packages/ab/", "README"]
+        )
+    ]
+    assert ids == [c4, c3]
+
+
+def test_index_persists_in_cache_dir(tmp_path, commit_files):
+    repo_dir = tmp_path / "repo"
+    cache_dir = tmp_path / "cache"
+    repo, (c1, c2, c3, c4) = _make_monorepo(repo_dir, commit_files)
+    list(
+        get_tag_to_tag_commits(
+            repo_dir, "v1.0.0", "v1.1.0", paths=["packages/a"], cache_dir=cache_dir
+        )
+    )
+    index = ChangedPathsIndex.load(cache_dir)
+    assert len(index) == 3
+    assert index.matching_prefixes(repo[c3], ["packages/a", "packages/ab"]) == [
+        "packages/ab"
+    ]
+    # Nothing new was computed, so there is nothing to write back.
+    assert index.save(cache_dir) is False
+
+
+def test_load_ignores_corrupt_cache(tmp_path):
+    (tmp_path / "changed-paths.json").write_text("{not json")
+    assert len(ChangedPathsIndex.load(tmp_path)) == 0
+
+
+def test_change_log_path_filter(tmp_path, commit_files):
+    _make_monorepo(tmp_path, commit_files)
+    md = change_log(
+        "proj", "2024-01-01", tmp_path, "v1.0.0", "v1.1.0", paths=["packages/a"]
+    )
+    assert "fix a" in md
+    assert "feat ab" not in md
+    assert "docs" not in md
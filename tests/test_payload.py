@@ -0,0 +1,220 @@
+import io
+import random
+import subprocess
+import sys
+
+import pytest
+
+from pygit2 import Signature, init_repository
+from pygit2.enums import ObjectType
+
+from girokmoji import changelog
+from girokmoji.changelog import (
+    fitted_github_release_payload,
+    github_release_payload,
+    release_payload,
+    write_github_release_payload,
+)
+from girokmoji.payload import fit_bodies, iter_release_payload, strip_chunks
+from girokmoji.render import gen_markdown, iter_markdown_parts
+from girokmoji.templatedir import load_template_dir
+
+TRICKY = ["", " ", "\n\n", "a", ' "q" ', "\\", "\t\x00\x1f", "✨🐛", " ", "é\r\n"]
+
+
+def test_strip_chunks_matches_str_strip():
+    rng = random.Random(7)
+    for _ in range(500):
+        chunks = [rng.choice(TRICKY) for _ in range(rng.randrange(8))]
+        assert "".join(strip_chunks(chunks)) == "".join(chunks).strip()
+
+
+def test_payload_is_byte_identical_to_json_dumps():
+    rng = random.Random(3)
+    for flags in [(False, False), (True, False), (False, True)]:
+        chunks = [rng.choice(TRICKY) for _ in range(50)]
+        streamed = "".join(
+            iter_release_payload(
+                'v1 "x"', "ná\\me", chunks, draft=flags[0], prerelease=flags[1]
+            )
+        )
+        assert streamed == release_payload(
+            'v1 "x"', "ná\\me", "".join(chunks), draft=flags[0], prerelease=flags[1]
+        )
+
+
+class FakeCommit:
+    def __init__(self, message: str, commit_id: str):
+        self.message = message
+        self.raw_message = message.encode()
+        self.message_encoding = "utf-8"
+        self.id = commit_id
+
+
+def _change(count, kinds=(":sparkles: feature", ":bug: fix", ":memo: docs")):
+    commits = [
+        FakeCommit(f"{kinds[i % len(kinds)]} number {i}", f"{i:040x}")
+        for i in range(count)
+    ]
+    return changelog.structured_changelog(commits)
+
+
+def _fit(change, mode, limit):
+    parts = iter_markdown_parts("p", "v1", "d", change)
+    return list(fit_bodies(parts, mode=mode, title="p v1", limit=limit))
+
+
+def _entries(text):
+    return [line for line in text.splitlines() if line.startswith("  - ")]
+
+
+def test_notes_that_fit_are_unchanged():
+    change = _change(30)
+    whole = gen_markdown("p", "v1", "d", change).strip()
+    for mode in ("split", "truncate"):
+        assert _fit(change, mode, 125_000) == [whole]
+        # Within the limit, but past the footer reserve
+        assert _fit(change, mode, len(whole)) == [whole]
+
+
+def test_split_at_group_boundaries():
+    change = _change(300)
+    whole = gen_markdown("p", "v1", "d", change).strip()
+    bodies = _fit(change, "split", 3000)
+    assert len(bodies) > 3
+    assert all(len(body) <= 3000 for body in bodies)
+    assert _entries("".join(bodies)) == _entries(whole)
+    for number, body in enumerate(bodies[1:], start=2):
+        assert body.startswith(f"# p v1 (continued, part {number})\n")
+        assert bodies[number - 2].endswith(f"_Continued in part {number}._")
+        # Continuations open with a category and a group header
+        assert body.split("\n")[3].startswith("## ")
+        assert "- **" in body.split("\n\n")[3]
+
+
+def test_split_keeps_every_entry_within_the_limit():
+    rng = random.Random(11)
+    for _ in range(40):
+        change = _change(rng.randrange(1, 200))
+        whole = gen_markdown("p", "v1", "d", change).strip()
+        limit = rng.randrange(450, 6000)
+        bodies = _fit(change, "split", limit)
+        assert all(len(body) <= limit for body in bodies)
+        assert _entries("".join(bodies)) == _entries(whole)
+        assert (len(bodies) == 1) == (bodies[0] == whole)
+
+
+def test_split_keeps_bodies_finished_while_closing():
+    # Groups held back until the end can still finish bodies of their own
+    rng = random.Random(10)
+    for _ in range(200):
+        change = _change(rng.randrange(1, 60))
+        whole = gen_markdown("p", "v1", "d", change).strip()
+        bodies = _fit(change, "split", rng.randrange(1000, 3000))
+        assert _entries("".join(bodies)) == _entries(whole)
+        for number, body in enumerate(bodies[1:], start=2):
+            assert body.startswith(f"# p v1 (continued, part {number})\n")
+
+
+def test_notes_within_the_limit_keep_their_trailer():
+    for count in range(1, 40):
+        change = _change(count)
+        whole = gen_markdown("p", "v1", "d", change).strip()
+        for limit in range(max(len(whole), 401), len(whole) + 220, 7):
+            assert _fit(change, "split", limit) == [whole]
+            assert _fit(change, "truncate", limit) == [whole]
+
+
+def _categories(text):
+    # entry line -> the ``## `` category header it is listed under
+    category, found = None, {}
+    for line in text.splitlines():
+        if line.startswith("## "):
+            category = line
+        elif line.startswith("  - "):
+            found[line] = category
+    return found
+
+
+def test_split_keeps_entries_under_their_category():
+    kinds = (":art: style", ":sparkles: feature", ":bug: fix", ":memo: docs")
+    kinds += (":see_no_evil: ignore", ":green_heart: ci", ":recycle: refactor")
+    rng = random.Random(5)
+    for _ in range(60):
+        picked = tuple(rng.sample(kinds, rng.randrange(2, len(kinds) + 1)))
+        change = _change(rng.randrange(20, 200), kinds=picked)
+        whole = _categories(gen_markdown("p", "v1", "d", change))
+        bodies = _fit(change, "split", rng.randrange(900, 4000))
+        for body in bodies:
+            for entry, category in _categories(body).items():
+                assert category == whole[entry]
+
+
+def test_oversized_group_is_cut_between_entries():
+    change = _change(200, kinds=(":bug: fix",))
+    bodies = _fit(change, "split", 1500)
+    assert all(len(body) <= 1500 for body in bodies)
+    whole = gen_markdown("p", "v1", "d", change)
+    assert _entries("".join(bodies)) == _entries(whole)
+    assert all("- **🐛 Fix a bug.**" in body for body in bodies)
+
+
+def test_truncate_summarizes_omitted_entries():
+    change = _change(300)
+    (body,) = _fit(change, "truncate", 3000)
+    assert len(body) <= 3000
+    kept = len(_entries(body))
+    assert 0 < kept < 300
+    assert body.endswith("release body limit._")
+    assert f"_… {300 - kept} more entries omitted" in body
+
+
+def test_fit_bodies_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        _fit(_change(1), "drop", 125_000)
+    with pytest.raises(ValueError):
+        _fit(_change(1), "split", 100)
+
+
+def test_write_github_release_payload(tmp_path, monkeypatch, capsys):
+    repo = init_repository(tmp_path)
+    person = Signature("t", "t@example.com")
+    parents = []
+    for msg in [":tada: init", ':bug: fix "quoted" \\ path', ":sparkles: feat ✨"]:
+        (tmp_path / "f.txt").write_text(msg)
+        repo.index.add_all()
+        repo.index.write()
+        parents = [
+            repo.create_commit(
+                "HEAD", person, person, msg, repo.index.write_tree(), parents
+            )
+        ]
+        if msg == ":tada: init":
+            repo.create_tag("v1.0.0", parents[0], ObjectType.COMMIT, person, "t")
+
+    args = ("proj", "2024-01-01", tmp_path, "v1.0.0", "HEAD", "v1.1.0")
+    for kwargs in [
+        {},
+        {"draft": True, "spill_threshold": 1},
+        {"templates": load_template_dir(None)},
+    ]:
+        out = io.StringIO()
+        write_github_release_payload(out, *args, **kwargs)
+        assert out.getvalue() == github_release_payload(*args, **kwargs)
+
+    assert fitted_github_release_payload(*args) == (
+        github_release_payload(*args),
+        [],
+    )
+    monkeypatch.setattr(changelog, "GITHUB_BODY_LIMIT", 10)
+    write_github_release_payload(io.StringIO(), *args)
+    assert "over GitHub's limit of 10" in capsys.readouterr().err
+
+
+@pytest.mark.cli
+def test_cli_overflow_requires_a_continuation_dir(tmp_path):
+    cmd = [sys.executable, "-m", "girokmoji", "generate", "proj", "2024-01-01"]
+    cmd += [str(tmp_path), "v1", "v2", "--github-payload", "--overflow", "split"]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "--continuation-dir" in result.stderr
@@ -0,0 +1,77 @@
+import threading
+from pathlib import Path
+
+import pytest
+from pygit2 import Signature, init_repository
+from pygit2.enums import ObjectType
+
+from girokmoji.changelog import change_log, github_release_payload
+from girokmoji.pipeline import prefetch
+
+
+def test_prefetch_preserves_order_across_batches():
+    assert list(prefetch(range(1000), str, maxsize=2, batch=7)) == [
+        str(i) for i in range(1000)
+    ]
+    assert list(prefetch([], str)) == []
+
+
+def test_prefetch_reraises_worker_errors():
+    def source():
+        yield 1
+        raise KeyError("boom")
+
+    got = []
+    with pytest.raises(KeyError):
+        for item in prefetch(source(), lambda x: x, batch=1):
+            got.append(item)
+    assert got == [1]
+
+
+def test_closing_early_stops_the_worker():
+    closed = threading.Event()
+
+    def source():
+        try:
+            for i in range(10**9):
+                yield i
+        finally:
+            closed.set()
+
+    it = prefetch(source(), lambda x: x, maxsize=1, batch=1)
+    assert next(it) == 0
+    it.close()
+    assert closed.is_set()
+
+
+def test_pipelined_change_log_is_identical(tmp_path):
+    repo = init_repository(tmp_path)
+    person = Signature("t", "t@example.com")
+    f = Path(tmp_path) / "f.txt"
+
+    def commit(msg, ref, parents):
+        f.write_text(msg)
+        repo.index.add_all()
+        repo.index.write()
+        return repo.create_commit(
+            ref, person, person, msg, repo.index.write_tree(), parents
+        )
+
+    base = commit(":tada: init", "HEAD", [])
+    repo.create_tag("v1.0.0", base, ObjectType.COMMIT, person, "t")
+    side = commit(":bug: side fix", "refs/heads/side", [base])
+    main = base
+    for i in range(40):
+        main = commit(
+            [":sparkles: f", ":bug: b", "plain", ":zap: z"][i % 4] + str(i),
+            "HEAD",
+            [main],
+        )
+    merge = commit(":twisted_rightwards_arrows: merge", "HEAD", [main, side])
+    repo.create_tag("v1.1.0", merge, ObjectType.COMMIT, person, "t")
+
+    args = ("proj", "2024-01-01", tmp_path, "v1.0.0", "v1.1.0")
+    assert change_log(*args, pipelined=True) == change_log(*args)
+    assert github_release_payload(*args, pipelined=True) == github_release_payload(
+        *args
+    )
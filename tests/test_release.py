@@ -1,10 +1,11 @@
+import json
 from pathlib import Path
 
 import pytest
 from pygit2 import Signature, init_repository
 from pygit2.enums import ObjectType
 
-from girokmoji.release import auto_release
+from girokmoji.release import auto_release, plan_release
 
 
 def _setup_repo(tmp_path: Path):
@@ -160,3 +161,141 @@ def test_auto_release_uses_global_max(tmp_path: Path):
     )
     note = auto_release("proj", repo_dir=tmp_path, bump="patch")
     assert "v0.2.1" in note
+
+
+def test_auto_bump_infers_from_gitmoji(tmp_path: Path, capsys):
+    repo, sig, f, commit = _setup_repo(tmp_path)
+    f.write_text("b")
+    repo.index.add_all()
+    c2 = repo.create_commit(
+        "HEAD",
+        sig,
+        sig,
+        ":sparkles: new feature",
+        repo.index.write_tree(),
+        [commit],
+    )
+    f.write_text("c")
+    repo.index.add_all()
+    repo.create_commit(
+        "HEAD",
+        sig,
+        sig,
+        ":bug: fix",
+        repo.index.write_tree(),
+        [c2],
+    )
+    note = auto_release("proj", repo_dir=tmp_path, bump="auto", stats=True)
+    assert "v0.2.0" in note
+    assert "new feature" in note and "fix" in note
+    assert "refs/tags/v0.2.0" in list(repo.references)
+    err = capsys.readouterr().err
+    assert "implied bump: minor (bumping minor)" in err
+    assert f"{str(c2)[:12]} :sparkles: new feature" in err
+
+
+def test_auto_bump_github_payload_defaults_to_patch(tmp_path: Path):
+    repo, sig, f, commit = _setup_repo(tmp_path)
+    f.write_text("b")
+    repo.index.add_all()
+    repo.create_commit(
+        "HEAD",
+        sig,
+        sig,
+        ":memo: docs",
+        repo.index.write_tree(),
+        [commit],
+    )
+    payload = auto_release("proj", repo_dir=tmp_path, bump="auto", github_payload=True)
+    assert '"tag_name": "v0.1.1"' in payload
+
+
+def test_plan_release_writes_no_refs(tmp_path: Path):
+    repo, sig, f, commit = _setup_repo(tmp_path)
+    f.write_text("b")
+    repo.index.add_all()
+    head = repo.create_commit(
+        "HEAD",
+        sig,
+        sig,
+        ":sparkles: feat",
+        repo.index.write_tree(),
+        [commit],
+    )
+    before = sorted(repo.references)
+    plan = plan_release(tmp_path, bump="auto")
+    assert sorted(repo.references) == before
+    assert plan.tail_tag == "v0.1.0"
+    assert plan.tail_id == commit
+    assert plan.head_id == head
+    assert plan.bump == "minor"
+    assert plan.new_tag == "v0.2.0"
+    assert [c.id for c in plan.change["Feature and Functional Changes"]] == [head]
+    assert "v0.2.0" in plan.markdown("proj", "2024-01-01")
+    assert '"tag_name": "v0.2.0"' in plan.github_payload("proj", "2024-01-01")
+
+
+def test_plan_release_without_previous_tag(tmp_path: Path):
+    repo = init_repository(tmp_path)
+    sig = Signature("t", "t@example.com")
+    (tmp_path / "f.txt").write_text("a")
+    repo.index.add_all()
+    repo.create_commit("HEAD", sig, sig, ":tada: init", repo.index.write_tree(), [])
+    plan = plan_release(tmp_path, bump="minor")
+    assert plan.tail_tag is None
+    assert plan.new_tag == "v0.1.0"
+    assert sum(len(v) for v in plan.change.values()) == 1
+
+
+def test_auto_release_dry_run_matches_real_release(tmp_path: Path):
+    repo, sig, f, commit = _setup_repo(tmp_path)
+    f.write_text("b")
+    repo.index.add_all()
+    repo.create_commit(
+        "HEAD",
+        sig,
+        sig,
+        ":bug: fix",
+        repo.index.write_tree(),
+        [commit],
+    )
+    preview = auto_release(
+        "proj", repo_dir=tmp_path, release_date="2000-01-01", dry_run=True
+    )
+    assert "refs/tags/v0.1.1" not in list(repo.references)
+    note = auto_release("proj", repo_dir=tmp_path, release_date="2000-01-01")
+    assert "refs/tags/v0.1.1" in list(repo.references)
+    assert preview == note
+
+
+def test_tag_message_notes_reuses_rendered_notes(tmp_path: Path):
+    repo, sig, f, commit = _setup_repo(tmp_path)
+    f.write_text("b")
+    repo.index.add_all()
+    repo.create_commit(
+        "HEAD",
+        sig,
+        sig,
+        ":bug: fix",
+        repo.index.write_tree(),
+        [commit],
+    )
+    payload = auto_release(
+        "proj",
+        repo_dir=tmp_path,
+        release_date="2000-01-01",
+        github_payload=True,
+        tag_message="notes",
+    )
+    tag = repo[repo.lookup_reference("refs/tags/v0.1.1").target]
+    assert tag.message == json.loads(payload)["body"]
+    assert "fix" in tag.message
+
+
+def test_default_tag_message_is_version(tmp_path: Path):
+    repo, sig, f, commit = _setup_repo(tmp_path)
+    auto_release("proj", repo_dir=tmp_path, bump="minor")
+    tag = repo[repo.lookup_reference("refs/tags/v0.2.0").target]
+    assert tag.message == "v0.2.0"
+    with pytest.raises(ValueError):
+        auto_release("proj", repo_dir=tmp_path, tag_message="bogus")
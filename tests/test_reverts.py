@@ -0,0 +1,89 @@
+from pathlib import Path
+
+from pygit2 import Signature, init_repository
+from pygit2.enums import ObjectType
+
+from girokmoji.changelog import change_log
+from girokmoji.reverts import cancel_revert_pairs, reverted_id
+
+
+class FakeCommit:
+    def __init__(self, message: str, commit_id: str):
+        self.message = message
+        self.raw_message = message.encode()
+        self.message_encoding = "utf-8"
+        self.id = commit_id
+
+
+def _sha(n: int) -> str:
+    return f"{n:040x}"
+
+
+def _revert(n: int, target: int) -> FakeCommit:
+    return FakeCommit(
+        f':rewind: Revert "{target}"\n\nThis reverts commit {_sha(target).upper()}.',
+        _sha(n),
+    )
+
+
+def _ids(commits):
+    return [int(str(c.id), 16) for c in commits]
+
+
+def test_reverted_id():
+    assert reverted_id("x\n\nThis reverts commit " + "A" * 40 + ".") == "a" * 40
+    assert reverted_id("mentions This reverts commit " + "a" * 40) is None
+    assert reverted_id("This reverts commit abc1234.") is None
+
+
+def test_pairs_inside_the_range_cancel():
+    commits = [
+        _revert(4, 2),
+        FakeCommit(":sparkles: keep", _sha(3)),
+        FakeCommit(":bug: reverted", _sha(2)),
+        _revert(1, 99),  # reverts a commit outside the range
+    ]
+    kept, dropped = cancel_revert_pairs(commits)
+    assert _ids(kept) == [3, 1]
+    assert dropped == [_sha(4), _sha(2)]
+
+
+def test_revert_chains():
+    # 1 <- 2 reverts 1 <- 3 reverts 2: the change of 1 is in effect again
+    chain = [_revert(3, 2), _revert(2, 1), FakeCommit(":bug: one", _sha(1))]
+    assert _ids(cancel_revert_pairs(chain)[0]) == [1]
+    # A fourth revert takes it out again
+    assert _ids(cancel_revert_pairs([_revert(4, 3), *chain])[0]) == []
+    # Order of the walk does not matter
+    assert _ids(cancel_revert_pairs(chain[::-1])[0]) == [1]
+
+
+def test_forged_cycle_terminates():
+    commits = [_revert(1, 2), _revert(2, 1)]
+    assert _ids(cancel_revert_pairs(commits)[0]) == [1, 2]
+
+
+def test_cancel_reverts_in_change_log(tmp_path):
+    repo = init_repository(tmp_path)
+    person = Signature("t", "t@example.com")
+    f = Path(tmp_path) / "f.txt"
+
+    def commit(msg):
+        f.write_text(msg)
+        repo.index.add_all()
+        repo.index.write()
+        parents = [] if repo.head_is_unborn else [repo.head.target]
+        return repo.create_commit(
+            "HEAD", person, person, msg, repo.index.write_tree(), parents
+        )
+
+    repo.create_tag("v1", commit(":tada: init"), ObjectType.COMMIT, person, "v1")
+    bad = commit(":sparkles: risky feature")
+    commit(":bug: unrelated fix")
+    commit(f':rewind: Revert "risky feature"\n\nThis reverts commit {bad}.')
+    args = ("proj", "2024-01-01", tmp_path, "v1", "HEAD")
+    assert "risky feature" in change_log(*args)
+    notes = change_log(*args, cancel_reverts=True)
+    assert "risky feature" not in notes
+    assert "unrelated fix" in notes
+    assert change_log(*args, cancel_reverts=True, spill_threshold=1) == notes
@@ -4,7 +4,7 @@ import pytest
 from pygit2 import init_repository, Signature
 from pygit2.enums import ObjectType
 
-from girokmoji.semver import SemVer
+from girokmoji.semver import SemVer, max_version, sort_versions
 from girokmoji.release import auto_release
 
 
@@ -113,3 +113,67 @@ def test_auto_release_without_user_config(tmp_path: Path):
     tags = [r for r in repo.references if r.startswith("refs/tags/")]
     assert "refs/tags/v1.0.1" in tags
     assert "proj" in note
+
+
+def test_rich_comparisons_use_precedence():
+    a = SemVer.parse("1.0.0-rc.1")
+    b = SemVer.parse("1.0.0")
+    assert a < b and a <= b and b > a and b >= a
+    assert SemVer.parse("1.0.0+build.1") <= b
+    assert SemVer.parse("1.0.0+build.1") >= b
+    assert SemVer.parse("1.0.0+build.1") != b
+    assert SemVer.parse("1.0.0-alpha.10") > SemVer.parse("1.0.0-alpha.9")
+    with pytest.raises(TypeError):
+        _ = a < "1.0.0"
+
+
+def test_semver_is_slotted_and_hashable():
+    v = SemVer.parse("2.3.4-beta.2+exp")
+    assert not hasattr(v, "__dict__")
+    assert v.sort_key == (2, 3, 4, 0, ((1, "beta"), (0, 2)))
+    assert {v, SemVer.parse("2.3.4-beta.2+exp")} == {v}
+
+
+def test_sort_versions_and_max_version():
+    texts = ["1.0.0", "1.0.0-beta.11", "0.9.9", "1.0.0-beta.2", "1.0.0-alpha"]
+    versions = [SemVer.parse(t) for t in texts]
+    assert [str(v) for v in sort_versions(versions)] == [
+        "0.9.9",
+        "1.0.0-alpha",
+        "1.0.0-beta.2",
+        "1.0.0-beta.11",
+        "1.0.0",
+    ]
+    assert sort_versions(versions, reverse=True)[0] == SemVer(1, 0, 0)
+    assert max_version(versions) == SemVer(1, 0, 0)
+    assert max_version([]) is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "0.0.0",
+        "10.20.30",
+        "01.0.0",
+        "1.00.0",
+        "1.0",
+        "1.0.0.0",
+        "1..0",
+        "build-123",
+        "deploy/prod/1",
+        "",
+        "1.2.3-rc.1+build.5",
+        "1.2.3-01",
+        "1.2.3+",
+    ],
+)
+def test_try_parse_matches_strict_regex(text):
+    from girokmoji.semver import _SEMVER_RE
+
+    expected = _SEMVER_RE.fullmatch(text) is not None
+    assert (SemVer.try_parse(text) is not None) is expected
+
+
+def test_parse_interns_repeated_strings():
+    assert SemVer.parse("4.5.6") is SemVer.parse("4.5.6")
+    assert SemVer.try_parse("4.5.6-rc.1") is SemVer.try_parse("4.5.6-rc.1")
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pytest
+from pygit2 import Signature, init_repository
+
+from girokmoji import changelog
+from girokmoji.spill import CommitRecord, SpillStore
+
+
+class FakeCommit:
+    def __init__(self, message: str, commit_id: str):
+        self.message = message
+        self.raw_message = message.encode()
+        self.message_encoding = "utf-8"
+        self.id = commit_id
+
+
+COMMITS = [
+    FakeCommit(":sparkles: feat one\n\nbody", "c1"),
+    FakeCommit(":bug: fix one", "c2"),
+    FakeCommit("no gitmoji at all", "c3"),
+    FakeCommit(":sparkles: feat\ttwo\rstill title", "c4"),
+    FakeCommit(":zap: speed", "c5"),
+    FakeCommit(":bug: fix two", "c6"),
+    FakeCommit(":sparkles: feat three", "c7"),
+]
+
+
+def test_bucket_groups_in_first_seen_order_across_spills(tmp_path):
+    with SpillStore(2, tmp_path) as store:
+        bucket = store.bucket()
+        for i, key in enumerate("abacbca"):
+            bucket.add(key, CommitRecord(f"id{i}", f"msg\t{i}"))
+        assert store.spills == 2
+        assert any(store.directory.iterdir())
+        assert len(bucket) == 7
+        assert [(k, [r.id for r in rs]) for k, rs in bucket.groups()] == [
+            ("a", ["id0", "id2", "id6"]),
+            ("b", ["id1", "id4"]),
+            ("c", ["id3", "id5"]),
+        ]
+        assert [r.message for r in bucket][:2] == ["msg\t0", "msg\t2"]
+        directory = store.directory
+    assert not directory.exists()
+
+
+def test_negative_threshold_is_rejected():
+    with pytest.raises(ValueError):
+        SpillStore(-1)
+
+
+@pytest.mark.parametrize("threshold", [0, 1, 3, 100])
+def test_spilled_markdown_matches_in_memory(threshold):
+    expected = changelog.gen_markdown(
+        "proj", "v1", "2024-01-01", changelog.structured_changelog(COMMITS)
+    )
+    inference = changelog.BumpInference()
+    with SpillStore(threshold) as store:
+        spilled = changelog.spilling_changelog(COMMITS, store, bump=inference)
+        assert len(spilled["Hmm..."]) == 1
+        md = changelog.gen_markdown("proj", "v1", "2024-01-01", spilled)
+    assert md == expected
+    assert "feat\ttwo\rstill title" in md
+    assert inference.resolve() == "minor"
+
+
+def test_change_log_spill_threshold(tmp_path, capsys):
+    repo = init_repository(tmp_path)
+    person = Signature("t", "t@example.com")
+    parents = []
+    for msg in [":tada: init", ":bug: a", ":sparkles: b", ":bug: c", "plain"]:
+        (Path(tmp_path) / "f.txt").write_text(msg)
+        repo.index.add_all()
+        parents = [
+            repo.create_commit(
+                "HEAD", person, person, msg, repo.index.write_tree(), parents
+            )
+        ]
+    args = ("proj", "2024-01-01", tmp_path, "none", "HEAD")
+    expected = changelog.change_log(*args)
+    assert changelog.change_log(*args, spill_threshold=1, stats=True) == expected
+    assert "[girokmoji] stats: spilled" in capsys.readouterr().err
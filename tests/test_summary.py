@@ -0,0 +1,168 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from pygit2 import Signature, init_repository
+from pygit2.enums import ObjectType
+
+from girokmoji.changelog import change_log, gen_markdown, structured_changelog
+from girokmoji.summary import (
+    Contributor,
+    ReleaseSummary,
+    SummaryCollector,
+    parse_sections,
+)
+from girokmoji.templatedir import load_template_dir
+
+
+class FakeAuthor:
+    def __init__(self, name: str, email: str):
+        self.name = name
+        self.email = email
+
+
+class FakeCommit:
+    def __init__(self, message: str, commit_id: str, author: FakeAuthor):
+        self.message = message
+        self.raw_message = message.encode()
+        self.message_encoding = "utf-8"
+        self.id = commit_id
+        self.author = author
+
+
+ALICE = FakeAuthor("Alice", "alice@example.com")
+BOB = FakeAuthor("Bob", "bob@example.com")
+
+
+def test_parse_sections():
+    assert parse_sections("Statistics, contributors,statistics") == [
+        "statistics",
+        "contributors",
+    ]
+    with pytest.raises(ValueError):
+        parse_sections("shortlog")
+    with pytest.raises(ValueError):
+        parse_sections(" , ")
+
+
+def test_collected_while_classifying():
+    commits = [
+        FakeCommit(":sparkles: one", "a" * 40, BOB),
+        FakeCommit(":bug: two", "b" * 40, ALICE),
+        FakeCommit(":bug: three", "c" * 40, ALICE),
+        FakeCommit("no gitmoji", "d" * 40, BOB),
+        FakeCommit(":bug: four", "e" * 40, FakeAuthor("Al", "alice@example.com")),
+    ]
+    collector = SummaryCollector(
+        lambda name, email: ("Alice", email) if email == ALICE.email else (name, email)
+    )
+    change = structured_changelog(commits, collector=collector)
+    summary = collector.summary(change, ["contributors", "statistics"])
+    assert summary.contributors == [
+        Contributor("Alice", "alice@example.com", 3),
+        Contributor("Bob", "bob@example.com", 2),
+    ]
+    assert summary.statistics == [
+        ("Commits", "5"),
+        ("Contributors", "2"),
+        ("Feature and Functional Changes", "1"),
+        ("Bug Fixes", "3"),
+        ("Hmm...", "1"),
+    ]
+    assert collector.summary(change, ["statistics"]).contributors is None
+    assert collector.summary(change, []) is None
+
+
+def test_sections_rendered_last():
+    change = structured_changelog([FakeCommit(":bug: fix", "a" * 40, BOB)])
+    summary = ReleaseSummary(
+        contributors=[Contributor("Bob", "bob@example.com", 1)],
+        statistics=[("Commits", "1")],
+    )
+    plain = gen_markdown("proj", "v1", "2024-01-01", change)
+    notes = gen_markdown("proj", "v1", "2024-01-01", change, summary=summary)
+    assert notes.startswith(plain)
+    rest = notes[len(plain) :]
+    assert rest.index("## Contributors") < rest.index("- **Bob** (1)")
+    assert rest.index("- **Bob** (1)") < rest.index("## Statistics")
+    assert "- **Commits:** 1" in rest
+    # Default templates loaded from no directory render the same text
+    templates = load_template_dir(None)
+    assert notes == gen_markdown(
+        "proj", "v1", "2024-01-01", change, templates=templates, summary=summary
+    )
+
+
+def test_sections_in_change_log_use_mailmap(tmp_path):
+    repo = init_repository(tmp_path)
+    f = Path(tmp_path) / "f.txt"
+    (Path(tmp_path) / ".mailmap").write_text(
+        "Alice Doe <alice@example.com> <alice@old.example.com>\n"
+    )
+
+    def commit(msg, name, email):
+        person = Signature(name, email)
+        f.write_text(msg)
+        repo.index.add_all()
+        repo.index.write()
+        parents = [] if repo.head_is_unborn else [repo.head.target]
+        return repo.create_commit(
+            "HEAD", person, person, msg, repo.index.write_tree(), parents
+        )
+
+    person = Signature("t", "t@example.com")
+    first = commit(":tada: init", "t", "t@example.com")
+    repo.create_tag("v1", first, ObjectType.COMMIT, person, "v1")
+    commit(":sparkles: feature", "alice", "alice@old.example.com")
+    commit(":bug: fix", "Alice Doe", "alice@example.com")
+    commit(":memo: docs", "Bob", "bob@example.com")
+    args = ("proj", "2024-01-01", tmp_path, "v1", "HEAD")
+    plain = change_log(*args)
+    assert "Contributors" not in plain
+    notes = change_log(*args, sections=["contributors", "statistics"])
+    assert "- **Alice Doe** (2)\n- **Bob** (1)" in notes
+    assert "alice**" not in notes
+    assert "- **Commits:** 3" in notes
+    assert "- **Contributors:** 2" in notes
+    assert change_log(*args, sections=["contributors"], spill_threshold=1) == (
+        change_log(*args, sections=["contributors"])
+    )
+
+    # The mailmap is read per run, so edits show up in the same process
+    (Path(tmp_path) / ".mailmap").write_text("Robert <bob@example.com>\n")
+    notes = change_log(*args, sections=["contributors"])
+    assert "- **Robert** (1)" in notes
+    assert "- **alice** (1)" in notes
+
+
+@pytest.mark.cli
+def test_cli_sections(tmp_path):
+    repo = init_repository(tmp_path)
+    person = Signature("t", "t@example.com")
+    parents = []
+    for msg in [":tada: init", ":bug: fix"]:
+        (tmp_path / "f.txt").write_text(msg)
+        repo.index.add_all()
+        repo.index.write()
+        parents = [
+            repo.create_commit(
+                "HEAD", person, person, msg, repo.index.write_tree(), parents
+            )
+        ]
+        if msg == ":tada: init":
+            repo.create_tag("v1.0.0", parents[0], ObjectType.COMMIT, person, "t")
+
+    cmd = [sys.executable, "-m", "girokmoji", "generate", "proj", "2024-01-01"]
+    cmd += [str(tmp_path), "v1.0.0", "HEAD", "--sections", "statistics"]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert "- **Bug Fixes:** 1" in result.stdout
+    assert "Contributors\n" not in result.stdout
+
+    result = subprocess.run(
+        cmd + ["--output-model", str(tmp_path / "m.json")],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode != 0
@@ -0,0 +1,143 @@
+import json
+import subprocess
+import sys
+
+import pytest
+from pygit2 import Signature, init_repository
+from pygit2.enums import ObjectType
+
+from girokmoji import changelog, templatedir
+from girokmoji.exception import TemplateError
+from girokmoji.templatedir import compile_parts, load_template_dir, parse_template
+
+
+class FakeCommit:
+    def __init__(self, message: str, commit_id: str):
+        self.message = message
+        self.raw_message = message.encode()
+        self.message_encoding = "utf-8"
+        self.id = commit_id
+
+
+COMMITS = [
+    FakeCommit(":sparkles: add feature", "c1"),
+    FakeCommit(":bug: fix {it}", "c2"),
+    FakeCommit(":sparkles: second feature", "c3"),
+]
+
+
+def test_default_templates_match_builtin_rendering():
+    change = changelog.structured_changelog(COMMITS)
+    assert changelog.gen_markdown(
+        "p", "v1", "2024-01-01", change, templates=load_template_dir(None)
+    ) == changelog.gen_markdown("p", "v1", "2024-01-01", change)
+
+
+def test_parse_and_compile():
+    fields = frozenset({"a", "b"})
+    parts = parse_template("x $a-${b} costs $$5 $a", fields)
+    assert parts == [
+        (False, "x "),
+        (True, "a"),
+        (False, "-"),
+        (True, "b"),
+        (False, " costs $5 "),
+        (True, "a"),
+    ]
+    render = compile_parts(parts)
+    assert render({"a": "A", "b": "{b}"}) == "x A-{b} costs $5 A"
+    assert compile_parts([])({}) == ""
+    assert compile_parts(parse_template("'''\\", fields))({}) == "'''\\"
+
+    with pytest.raises(TemplateError, match=r"\$c"):
+        parse_template("$c", fields, name="entry")
+    with pytest.raises(TemplateError, match="line 2"):
+        parse_template("ok\n$ 1", fields)
+
+
+def test_template_dir_is_cached_by_content(tmp_path, monkeypatch):
+    tdir = tmp_path / "templates"
+    tdir.mkdir()
+    (tdir / "entry.md").write_text("* $commit_description ($emoji, $commit_hash)\n")
+    (tdir / "group.md").write_text("")
+    cache = tmp_path / "cache"
+
+    templatedir._COMPILED.clear()
+    templates = load_template_dir(tdir, cache_dir=cache)
+    notes = changelog.gen_markdown(
+        "p", "v1", "d", changelog.structured_changelog(COMMITS), templates=templates
+    )
+    assert "* add feature (✨, c1)\n* second feature (✨, c3)\n" in notes
+    assert "* fix {it} (🐛, c2)\n" in notes
+    assert (cache / "templates.json").exists()
+
+    # The same content is compiled once per process
+    assert load_template_dir(tdir).entry is templates.entry
+
+    # A fresh process reuses the parsed form from disk instead of parsing
+    templatedir._COMPILED.clear()
+
+    def parse_again(*args, **kwargs):
+        raise RuntimeError("template parsed again")
+
+    monkeypatch.setattr(templatedir, "parse_template", parse_again)
+    again = load_template_dir(tdir, cache_dir=cache)
+    assert again.entry({"commit_description": "t", "emoji": "e", "commit_hash": "h"})
+    assert again.entry is not templates.entry
+
+    # Cached parts naming fields the template may not use are parsed again
+    templatedir._COMPILED.clear()
+    monkeypatch.undo()
+    doc = json.loads((cache / "templates.json").read_text())
+    for key, parts in doc["templates"].items():
+        doc["templates"][key] = [[True, "__class__"]] + parts
+    (cache / "templates.json").write_text(json.dumps(doc))
+    checked = load_template_dir(tdir, cache_dir=cache)
+    notes = changelog.gen_markdown(
+        "p", "v1", "d", changelog.structured_changelog(COMMITS), templates=checked
+    )
+    assert "* add feature (✨, c1)\n" in notes
+    monkeypatch.setattr(templatedir, "parse_template", parse_again)
+
+    # Edited templates get a new key
+    (tdir / "entry.md").write_text("- $commit_hash\n")
+    with pytest.raises(RuntimeError):
+        load_template_dir(tdir, cache_dir=cache)
+
+
+def test_missing_template_dir(tmp_path):
+    with pytest.raises(TemplateError):
+        load_template_dir(tmp_path / "nope")
+
+
+@pytest.mark.cli
+def test_cli_template_dir(tmp_path):
+    repo_dir = tmp_path / "repo"
+    repo = init_repository(repo_dir)
+    person = Signature("t", "t@example.com")
+    parents = []
+    for msg in [":tada: init", ":bug: fix", ":sparkles: feat"]:
+        (repo_dir / "f.txt").write_text(msg)
+        repo.index.add_all()
+        repo.index.write()
+        parents = [
+            repo.create_commit(
+                "HEAD", person, person, msg, repo.index.write_tree(), parents
+            )
+        ]
+        if msg == ":tada: init":
+            repo.create_tag("v1.0.0", parents[0], ObjectType.COMMIT, person, "t")
+
+    tdir = tmp_path / "templates"
+    tdir.mkdir()
+    (tdir / "head.md").write_text("# $project_name $version\n")
+    cmd = [sys.executable, "-m", "girokmoji", "generate", "proj", "2024-01-01"]
+    cmd += [str(repo_dir), "v1.0.0", "HEAD", "--template-dir", str(tdir)]
+    result = subprocess.run(cmd + ["--github-payload"], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout)["body"].startswith("# proj HEAD\n")
+
+    (tdir / "head.md").write_text("# $nope\n")
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    assert result.returncode != 0
+    assert "$nope" in result.stderr